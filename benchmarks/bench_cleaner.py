@@ -0,0 +1,159 @@
+"""
+Benchmark: one-walk content cleaning vs. a find_all pass per removal rule.
+
+Article pages are captured from a run against newswatch.stubserver (or from
+replaying a cassette recorded from the real sites with `--record`). For
+every scraper with an extraction spec, its content field is then extracted
+from each page twice: with newswatch.extract.Cleaner, which applies all the
+field's removal rules while it collects the text, and the way fields were
+cleaned before it, deleting the matches of each rule in its own pass and
+calling get_text at the end. Both must give the same text. Only the
+extraction is timed, on pages parsed beforehand.
+
+Stub article bodies are a few paragraphs; real ones carry related-article
+boxes, ads and scripts between them. `--padding N` adds N such blocks to
+every stub article body.
+
+    python benchmarks/bench_cleaner.py --articles 200 --padding 10
+    python benchmarks/bench_cleaner.py --cassette run.jsonl.gz --keywords ekonomi --sites detik,kompas
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_html_parsers import STUB_SITES  # noqa: E402
+from bench_metadata import article_pages, capture_article_pages  # noqa: E402
+
+from newswatch.extract import FieldExtractor  # noqa: E402
+from newswatch.main import get_available_scrapers  # noqa: E402
+from newswatch.scrapers.basescraper import parse_markup, resolve_html_parser  # noqa: E402
+
+BOILERPLATE = (
+    '<div class="baca-juga related inject-baca-juga-1"><p>Baca juga: '
+    '<a href="/berita/1">Berita terkait lainnya</a></p></div>'
+    '<div class="ads banner-1"><script>window.ads=window.ads||[];</script>'
+    '<iframe src="/ads"></iframe><span class="text-muted">ADVERTISEMENT</span></div>'
+    "<p>Baca Juga: <strong>Judul artikel lain yang sedang ramai</strong></p>"
+)
+
+
+class MultiPassField(FieldExtractor):
+    """A field cleaned as before Cleaner: one pass per rule, then get_text."""
+
+    def _text(self, element):
+        rules = self.cleaner
+        if rules.remove is not None:
+            for tag in rules.remove.pattern.select(element):
+                tag.extract()
+        if rules.paragraphs is not None:
+            texts = []
+            for paragraph in rules.paragraphs.pattern.select(element):
+                text = paragraph.get_text(strip=True)
+                if text and not (rules.drop_phrases and rules.drop_phrases.search(text)):
+                    texts.append(text)
+            return " ".join(texts)
+        if rules.phrase_tags:
+            for tag in element.find_all(list(rules.phrase_tags)):
+                if rules.drop_phrases.search(tag.get_text()):
+                    tag.extract()
+        elif rules.drop_phrases is not None:
+            for string in element.find_all(string=rules.drop_phrases):
+                if string.parent is not None:
+                    string.parent.extract()
+        if self.attr is not None and element.get(self.attr):
+            return element[self.attr]
+        return element.get_text(separator=self.separator, strip=self.strip)
+
+
+def padded(page, blocks):
+    # before the first paragraph, which is inside the article body
+    if isinstance(page, bytes):
+        return page.replace(b"<p>", (BOILERPLATE * blocks).encode() + b"<p>", 1)
+    return page.replace("<p>", BOILERPLATE * blocks + "<p>", 1)
+
+
+def timed(field, soups):
+    values = []
+    started_at = time.perf_counter()
+    for soup in soups:
+        try:
+            values.append(field.extract(soup))
+        except Exception as e:
+            values.append(repr(e))
+    return time.perf_counter() - started_at, values
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cassette", help="Cassette recorded with --record")
+    parser.add_argument("--sites", default=",".join(STUB_SITES), help="Comma-separated scrapers")
+    parser.add_argument("--keywords", default="ekonomi")
+    parser.add_argument("--start_date", default=(datetime.now() - timedelta(days=365)).strftime("%Y-%m-%d"))
+    parser.add_argument("--articles", type=int, default=100, help="Stub articles per keyword")
+    parser.add_argument("--padding", type=int, default=0, help="Boilerplate blocks per article body")
+    parser.add_argument("--parser", default="auto", help="HTML parser backend")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    args.sites = [site.strip() for site in args.sites.split(",")]
+    args.no_metadata = True
+
+    scraper_classes, linux_excluded_scrapers = get_available_scrapers()
+    scraper_classes.update(linux_excluded_scrapers)
+    capture_article_pages(args)
+
+    html_parser = resolve_html_parser(args.parser)
+    print(f"{html_parser}: ms per article body")
+    print(f"{'site':16} {'pages':>5} {'passes':>8} {'one walk':>9}")
+    total_passes = total_walk = 0.0
+    for name in args.sites:
+        scraper_class = scraper_classes[name]["class"]
+        pages = article_pages[scraper_class]
+        if scraper_class.extractor is None:
+            print(f"{name:16} no extraction spec")
+            continue
+        if not pages:
+            print(f"{name:16} no article pages captured")
+            continue
+        if args.padding and not args.cassette:
+            pages = [(padded(body, args.padding), charset, link) for body, charset, link in pages]
+
+        field = next(field for field in scraper_class.extractor.fields if field.name == "content")
+        multi_pass = MultiPassField.__new__(MultiPassField)
+        multi_pass.__dict__.update(field.__dict__)
+
+        passes_time = walk_time = float("inf")
+        for _ in range(args.repeat):
+            # the multi-pass cleaning deletes elements, so each round gets fresh trees
+            soups = [parse_markup(body, charset, html_parser) for body, charset, _ in pages]
+            elapsed, passes_values = timed(multi_pass, soups)
+            passes_time = min(passes_time, elapsed)
+            soups = [parse_markup(body, charset, html_parser) for body, charset, _ in pages]
+            elapsed, walk_values = timed(field, soups)
+            walk_time = min(walk_time, elapsed)
+
+        total_passes += passes_time
+        total_walk += walk_time
+        row = (
+            f"{name:16} {len(pages):5} {passes_time * 1000 / len(pages):8.3f} "
+            f"{walk_time * 1000 / len(pages):9.3f}"
+        )
+        if passes_time:
+            row += f"  {(passes_time - walk_time) / passes_time:+.0%}"
+        if passes_values != walk_values:
+            row += "  <- texts differ"
+        print(row)
+    if total_passes:
+        print(
+            f"total: {total_passes * 1000:.1f} ms with a pass per rule, "
+            f"{total_walk * 1000:.1f} ms in one walk"
+        )
+
+
+if __name__ == "__main__":
+    main()
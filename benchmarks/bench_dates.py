@@ -0,0 +1,146 @@
+"""
+Benchmark: publish-date parsing with learned formats vs. dateparser alone.
+
+Parses the date strings of every source twice: with dateparser.parse, as
+every article did before, and with newswatch.dates.DateParser, starting
+with nothing learned. It reports the time per date, the fast-path hit rate
+and any date where the two disagree, per source.
+
+The built-in strings follow the format each of the 20 sites prints, after
+the scraper's own cleanup and with the locales its scraper passes. They
+cover two years of publish times. One more source, "numeric, no locale",
+prints dd/mm/yyyy without a locale: dateparser reads those month-first
+where it can, and DateParser must agree while never learning the shape.
+`--cassette` takes the strings that the scrapers actually extract from a
+recorded run instead.
+
+    python benchmarks/bench_dates.py
+    python benchmarks/bench_dates.py --cassette run.jsonl.gz --keywords ekonomi
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dateparser  # noqa: E402
+
+from newswatch.dates import DateParser  # noqa: E402
+from newswatch.stats import stats_scope  # noqa: E402
+
+DAYS = ["Senin", "Selasa", "Rabu", "Kamis", "Jumat", "Sabtu", "Minggu"]
+MONTHS = [
+    "Januari", "Februari", "Maret", "April", "Mei", "Juni",
+    "Juli", "Agustus", "September", "Oktober", "November", "Desember",
+]
+SHORT_MONTHS = ["Jan", "Feb", "Mar", "Apr", "Mei", "Jun", "Jul", "Agt", "Sep", "Okt", "Nov", "Des"]
+ID = {"locales": ["id"]}
+
+
+def day(m):
+    return DAYS[m.weekday()]
+
+
+def month(m):
+    return MONTHS[m.month - 1]
+
+
+# source: (format, parse_date keyword arguments)
+SOURCES = {
+    "antaranews": (lambda m: f"{day(m)}, {m.day} {month(m)} {m.year} {m:%H:%M} WIB", ID),
+    "kepriantaranews": (lambda m: f"{day(m)}, {m.day} {month(m)} {m.year} {m:%H:%M} WIB", ID),
+    "alurnews": (lambda m: f"{m:%Y-%m-%dT%H:%M:%S}+07:00", {}),
+    "batampos": (lambda m: f"{m:%Y-%m-%dT%H:%M:%S}+07:00", {}),
+    "hariankepri": (lambda m: f"{m:%Y-%m-%dT%H:%M:%S}+07:00", {}),
+    "ulasan": (lambda m: f"{m:%Y-%m-%dT%H:%M:%S}+07:00", {}),
+    "tempo": (lambda m: f"{m:%Y-%m-%dT%H:%M:%S}+07:00", {}),
+    "bisnis": (lambda m: f"{day(m)}, {m.day} {month(m)} {m.year} | {m:%H:%M}", {}),
+    "bloombergtechnoz": (lambda m: f"{m.day} {month(m)} {m.year} {m:%H:%M}", {}),
+    "cnbcindonesia": (lambda m: f"{day(m)}, {m:%d/%m/%Y %H:%M} WIB", ID),
+    "detik": (lambda m: f"{day(m)}, {m:%d} {SHORT_MONTHS[m.month - 1]} {m.year} {m:%H:%M} WIB", {}),
+    "kompas": (lambda m: f"{m:%d/%m/%Y, %H:%M} WIB", ID),
+    "keprinews": (lambda m: f"{m.day} {month(m)} {m.year}", {}),
+    "metrotvnews": (lambda m: f"{day(m)}, {m:%d} {month(m)} {m.year} {m:%H:%M}", {}),
+    "okezone": (lambda m: f"{day(m)} {m:%d} {month(m)} {m.year} {m:%H:%M} WIB", ID),
+    "viva": (lambda m: f"{day(m)}, {m.day} {month(m)} {m.year} - {m:%H:%M}", {}),
+    "mediaindonesia": (lambda m: f"{m:%d/%m/%Y, %H:%M}", ID),
+    "katadata": (lambda m: f"{m.day} {month(m)} {m.year}, {m:%H.%M}", ID),
+    "jawapos": (lambda m: f"{day(m)}, {m.day} {month(m)} {m.year}, {m:%H:%M} WIB", {}),
+    "kontan": (lambda m: f"{day(m)}, {m:%d} {month(m)} {m.year} / {m:%H:%M} WIB", {}),
+    "numeric, no locale": (lambda m: f"{m:%d/%m/%Y %H:%M}", {}),
+}
+
+
+def builtin_dates(count):
+    dates = {}
+    start = datetime(2024, 1, 1, 6, 0)
+    for source, (format_date, kwargs) in SOURCES.items():
+        moments = [start + timedelta(hours=17 * i, minutes=7 * i) for i in range(count)]
+        dates[source] = [(format_date(moment), kwargs) for moment in moments]
+    return dates
+
+
+def captured_dates(args):
+    from newswatch.api import scrape
+    from newswatch.scrapers.basescraper import BaseScraper
+
+    dates = defaultdict(list)
+    parse_date = BaseScraper.parse_date.__func__
+
+    def capturing(cls, date_string, **kwargs):
+        dates[cls.__name__].append((date_string, kwargs))
+        return parse_date(cls, date_string, **kwargs)
+
+    BaseScraper.parse_date = classmethod(capturing)
+    scrape(args.keywords, args.start_date, scrapers=args.sites, replay=args.cassette)
+    BaseScraper.parse_date = classmethod(parse_date)
+    return dates
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cassette", help="Cassette recorded with --record")
+    parser.add_argument("--sites", default="all", help="With --cassette, comma-separated scrapers")
+    parser.add_argument("--keywords", default="ekonomi")
+    parser.add_argument("--start_date", default=(datetime.now() - timedelta(days=365)).strftime("%Y-%m-%d"))
+    parser.add_argument("--dates", type=int, default=200, help="Built-in dates per source")
+    args = parser.parse_args()
+
+    dates = captured_dates(args) if args.cassette else builtin_dates(args.dates)
+
+    print(f"{'source':20} {'dates':>5} {'dateparser':>11} {'learned':>9} {'hit rate':>9}")
+    total_slow = total_fast = 0.0
+    for source, samples in dates.items():
+        started_at = time.perf_counter()
+        expected = [dateparser.parse(text, **kwargs) for text, kwargs in samples]
+        slow = time.perf_counter() - started_at
+
+        date_parser = DateParser()
+        with stats_scope() as run_stats:
+            started_at = time.perf_counter()
+            parsed = [date_parser.parse(text, source, **kwargs) for text, kwargs in samples]
+            fast = time.perf_counter() - started_at
+
+        total_slow += slow
+        total_fast += fast
+        mismatches = sum(
+            1
+            for want, got in zip(expected, parsed)
+            if (want.replace(tzinfo=None) if want else None) != got
+        )
+        row = (
+            f"{source:20} {len(samples):5} {slow * 1e6 / len(samples):8.0f} us "
+            f"{fast * 1e6 / len(samples):6.0f} us {run_stats.dates.stats()[source]['hit_rate']:9.1%}"
+        )
+        if mismatches:
+            row += f"  <- {mismatches} dates differ"
+        print(row)
+    print(f"total: {total_slow:.2f}s with dateparser, {total_fast:.2f}s with learned formats")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark: fallback chains in declared order vs. most frequent winner first.
+
+kepriantaranews declares several selectors per field and nine for its
+search results, for the page layouts the site has used. This generates
+article and search pages in one of the later layouts (`--layout`) and
+extracts them twice: trying every chain in declared order, and with
+newswatch.fallbacks learning the order. It reports the time per page, the
+selectors tried and whether both give the same articles and links.
+
+Real pages carry navigation, ads and scripts around the article, and a
+selector that misses is matched against all of it; `--padding KB` adds that
+much such markup to every page.
+
+    python benchmarks/bench_fallbacks.py --pages 50 --padding 100
+    python benchmarks/bench_fallbacks.py --layout generic
+"""
+
+import argparse
+import html
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_search_strainer import padded  # noqa: E402
+
+from newswatch.fallbacks import selector_cache  # noqa: E402
+from newswatch.scrapers.basescraper import parse_markup, resolve_html_parser  # noqa: E402
+from newswatch.scrapers.kepriantaranews import KepriAntaranewsScraper  # noqa: E402
+from newswatch.stats import stats_scope  # noqa: E402
+
+WORDS = "pemerintah pasar saham bank rupiah investor ekonomi kebijakan harga industri".split()
+
+# the markup of each layout: the classes its article and search pages use
+LAYOUTS = {
+    "post": {
+        "title": "post-title", "author": "post-author", "date": "post-date",
+        "crumb": "breadcrumb-item", "content": "post-content", "item": "post-item",
+    },
+    "article": {
+        "title": "article-title", "author": "by-author", "date": "publish-date",
+        "crumb": "category", "content": "article-content", "item": "news-item",
+    },
+    "generic": {
+        "title": "headline", "author": "byline", "date": "stamp",
+        "crumb": "section", "content": "content", "item": "teaser",
+    },
+}
+
+
+def article_page(rng, layout, index):
+    classes = LAYOUTS[layout]
+    paragraphs = "".join(
+        f"<p>{' '.join(rng.choices(WORDS, k=40))}.</p>" for _ in range(rng.randint(4, 8))
+    )
+    return (
+        f'<html><body><nav><a class="{classes["crumb"]}" href="/">Beranda</a>'
+        f'<a class="{classes["crumb"]}" href="/ekonomi">Ekonomi</a></nav>'
+        f'<h1 class="{classes["title"]}">{html.escape(" ".join(rng.choices(WORDS, k=6)))} {index}</h1>'
+        f'<div class="{classes["author"]}">Andi Pratama</div>'
+        f'<span class="{classes["date"]}">Senin, 12 Agustus 2024 {index % 24:02d}:30 WIB</span>'
+        f'<div class="{classes["content"]}">{paragraphs}'
+        f'<p class="baca-juga">Baca juga: berita lain</p></div></body></html>'
+    )
+
+
+def search_page(layout, page):
+    item = LAYOUTS[layout]["item"]
+    links = "".join(
+        f'<div class="{item}"><a href="/berita/{page * 20 + i}/judul-{i}">Judul {i}</a></div>'
+        for i in range(20)
+    )
+    return f"<html><body>{links}</body></html>"
+
+
+def run(adaptive, scraper, soups, search_pages):
+    selector_cache.adaptive = adaptive
+    selector_cache.orders.clear()
+    selector_cache.wins.clear()
+    source = KepriAntaranewsScraper.__name__
+
+    with stats_scope() as run_stats:
+        started_at = time.perf_counter()
+        articles = [KepriAntaranewsScraper.extractor.extract(soup, source=source) for soup in soups]
+        fields_time = time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        links = [sorted(scraper.parse_article_links(page) or []) for page in search_pages]
+        links_time = time.perf_counter() - started_at
+    return fields_time, links_time, articles, links, run_stats.selectors.stats()[source]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--layout", default="article", choices=sorted(LAYOUTS))
+    parser.add_argument("--pages", type=int, default=200, help="Article and search pages")
+    parser.add_argument("--padding", type=int, default=0, help="KB of page chrome added to each page")
+    parser.add_argument("--parser", default="auto", help="HTML parser backend")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    html_parser = resolve_html_parser(args.parser)
+    pages = [padded(article_page(rng, args.layout, i), args.padding) for i in range(args.pages)]
+    soups = [parse_markup(page, html_parser=html_parser) for page in pages]
+    search_pages = [padded(search_page(args.layout, i), args.padding) for i in range(args.pages)]
+    scraper = KepriAntaranewsScraper("ekonomi")
+    scraper.html_parser = html_parser
+
+    declared = run(False, scraper, soups, search_pages)
+    adaptive = run(True, scraper, soups, search_pages)
+
+    print(f"{html_parser}, layout {args.layout!r}: ms per page")
+    print(f"{'order':10} {'fields':>8} {'links':>8} {'selectors tried':>16} {'first-try hits':>15}")
+    for name, (fields_time, links_time, _, _, stats) in (("declared", declared), ("adaptive", adaptive)):
+        print(
+            f"{name:10} {fields_time * 1000 / args.pages:8.3f} {links_time * 1000 / args.pages:8.3f} "
+            f"{stats['tried']:16} {stats['hit_rate']:15.1%}"
+        )
+    if declared[2] != adaptive[2] or declared[3] != adaptive[3]:
+        print("articles or links differ between the two orders")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark: parsing pages from str (fetch) vs. from bytes (fetch_bytes).
+
+The str path decodes every body and hands the text to BeautifulSoup; the
+bytes path passes the undecoded body and its charset to BaseScraper.parse_html.
+Pages come from a cassette recorded with `--record`, or, without one, from
+the synthetic article pages of newswatch.stubserver.
+
+    python benchmarks/bench_fetch_bytes.py --cassette run.jsonl.gz
+    python benchmarks/bench_fetch_bytes.py --pages 500
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from newswatch.stubserver import StubNewsServer, default_sites  # noqa: E402
+from newswatch.transport import Cassette, HttpResponse  # noqa: E402
+from multidict import CIMultiDict  # noqa: E402
+
+
+def recorded_pages(path):
+    return [
+        response
+        for response in Cassette.load(path).responses()
+        if response.status == 200
+        and response.body
+        and response.content_type in ("text/html", "application/xhtml+xml")
+    ]
+
+
+def synthetic_pages(count):
+    server = StubNewsServer()
+    sites = default_sites()
+    headers = CIMultiDict({"Content-Type": "text/html; charset=utf-8"})
+    pages = []
+    for index in range(count):
+        site = sites[index % len(sites)]
+        article = server.article("ekonomi", index)
+        body = site.article_page(article).encode("utf-8")
+        pages.append(HttpResponse(url=site.article_url(article), status=200, headers=headers, body=body))
+    return pages
+
+
+def parse_text(pages, parser):
+    for page in pages:
+        BeautifulSoup(page.body.decode(page.encoding(), errors="replace"), parser)
+
+
+def parse_bytes(pages, parser):
+    for page in pages:
+        BeautifulSoup(page.body, parser, from_encoding=page.encoding())
+
+
+def best_of(repeat, func, *args):
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - started_at)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cassette", help="Cassette recorded with --record")
+    parser.add_argument("--pages", type=int, default=300, help="Synthetic pages without a cassette")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    pages = recorded_pages(args.cassette) if args.cassette else synthetic_pages(args.pages)
+    if not pages:
+        sys.exit("No HTML pages to parse")
+    size = sum(len(page.body) for page in pages)
+    print(f"{len(pages)} pages, {size / 1e6:.1f} MB")
+
+    parsers = ["html.parser"]
+    if importlib.util.find_spec("lxml") is not None:
+        parsers.append("lxml")
+
+    for tree_builder in parsers:
+        text_time = best_of(args.repeat, parse_text, pages, tree_builder)
+        bytes_time = best_of(args.repeat, parse_bytes, pages, tree_builder)
+        print(
+            f"{tree_builder:12} str: {text_time * 1000 / len(pages):6.2f} ms/page   "
+            f"bytes: {bytes_time * 1000 / len(pages):6.2f} ms/page   "
+            f"({(text_time - bytes_time) / text_time:+.0%})"
+        )
+
+
+if __name__ == "__main__":
+    main()
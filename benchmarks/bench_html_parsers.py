@@ -0,0 +1,132 @@
+"""
+Benchmark: articles/sec per HTML parser backend, for each site.
+
+Records one run against newswatch.stubserver (or takes a cassette recorded
+from the real sites with `--record`), then replays it once per site and
+parser backend. Replayed runs do no network I/O, so the time is what the
+scrapers spend parsing search and article pages and extracting the fields
+(date parsing included); the time spent inside BaseScraper.parse_html is
+reported separately, per article. The article counts of every backend
+should match; a mismatch means a site's selectors depend on how a backend
+repairs broken markup.
+
+Stub pages are a few KB; real article pages are 100 KB or more, where the
+difference between backends is larger.
+
+    python benchmarks/bench_html_parsers.py --articles 200
+    python benchmarks/bench_html_parsers.py --cassette run.jsonl.gz --keywords ekonomi --sites detik,kompas
+"""
+
+import argparse
+import importlib.util
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_http_backends import free_port, wait_for_port  # noqa: E402
+
+from newswatch.api import scrape  # noqa: E402
+from newswatch.scrapers.basescraper import BaseScraper  # noqa: E402
+
+# scrapers whose sites newswatch.stubserver serves (it also serves jawapos,
+# katadata and kontan, which the api leaves out on Linux)
+STUB_SITES = (
+    "detik", "kompas", "tempo", "cnbcindonesia", "antaranews", "mediaindonesia",
+    "keprinews", "batampos", "hariankepri", "alurnews", "ulasan",
+    "kepriantaranews", "bisnis", "okezone", "viva", "metrotvnews", "bloombergtechnoz",
+)
+
+
+parse_seconds = 0.0
+
+
+def timed_parse_html(parse_html):
+    def wrapper(self, *args, **kwargs):
+        global parse_seconds
+        started_at = time.perf_counter()
+        try:
+            return parse_html(self, *args, **kwargs)
+        finally:
+            parse_seconds += time.perf_counter() - started_at
+
+    return wrapper
+
+
+def record_stub_run(path, args):
+    port = free_port()
+    command = [
+        sys.executable, "-m", "newswatch.stubserver",
+        "--port", str(port),
+        "--articles", str(args.articles),
+    ]
+    server = subprocess.Popen(command, cwd=ROOT, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_port(port)
+        results = scrape(
+            args.keywords, args.start_date, scrapers=",".join(args.sites),
+            record=path, base_url=f"http://127.0.0.1:{port}",
+        )
+    finally:
+        server.terminate()
+        server.wait()
+    print(f"Recorded {len(results)} articles from the stub server")
+
+
+def replay(cassette, site, parser, args):
+    global parse_seconds
+    parse_seconds = 0.0
+    started_at = time.perf_counter()
+    results = scrape(
+        args.keywords, args.start_date, scrapers=site, replay=cassette, parser=parser
+    )
+    return time.perf_counter() - started_at, parse_seconds, len(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cassette", help="Cassette recorded with --record")
+    parser.add_argument("--sites", default=",".join(STUB_SITES), help="Comma-separated scrapers")
+    parser.add_argument("--keywords", default="ekonomi")
+    parser.add_argument("--start_date", default=(datetime.now() - timedelta(days=365)).strftime("%Y-%m-%d"))
+    parser.add_argument("--articles", type=int, default=100, help="Stub articles per keyword")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    args.sites = [site.strip() for site in args.sites.split(",")]
+
+    backends = ["html.parser"]
+    if importlib.util.find_spec("lxml") is not None:
+        backends.append("lxml")
+
+    BaseScraper.parse_html = timed_parse_html(BaseScraper.parse_html)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cassette = args.cassette
+        if cassette is None:
+            cassette = os.path.join(tmp, "stub.jsonl.gz")
+            record_stub_run(cassette, args)
+
+        print(f"{'site':16}" + "".join(f"{backend:>34}" for backend in backends))
+        for site in args.sites:
+            row = f"{site:16}"
+            counts = set()
+            for backend in backends:
+                elapsed, parsing, count = min(
+                    replay(cassette, site, backend, args) for _ in range(args.repeat)
+                )
+                counts.add(count)
+                rate = count / elapsed if elapsed else 0.0
+                parse_ms = parsing * 1000 / count if count else 0.0
+                row += f"{rate:8.0f} art/s {parse_ms:6.2f} ms parse ({count:3})"
+            if len(counts) > 1:
+                row += "  <- article counts differ"
+            print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Benchmark: article fetch throughput of the HTTP client backends.
+
+Starts newswatch.stubserver in a subprocess (HTTP/1.1 and, when h2 is
+installed, cleartext HTTP/2) and fetches the same article pages through:
+
+- aiohttp over HTTP/1.1 (the default backend, via SessionManager)
+- httpx over HTTP/1.1
+- httpx over HTTP/2, multiplexed on one connection (h2c, prior knowledge)
+
+    python benchmarks/bench_http_backends.py --requests 2000 --concurrency 16,64 --latency 0.05
+
+Real hosts negotiate HTTP/2 over TLS (ALPN); the "http2" backend selected in
+get_available_scrapers() does that automatically.
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import os
+import socket
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from newswatch.session import SessionManager  # noqa: E402
+from newswatch.stubserver import DetikSite, StubNewsServer  # noqa: E402
+from newswatch.transport import BaseURLOverrideTransport, HttpxTransport  # noqa: E402
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"stub server did not start on port {port}")
+
+
+async def fetch_all(transport, urls, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    failures = 0
+
+    async def fetch(url):
+        nonlocal failures
+        async with semaphore:
+            try:
+                response = await transport.request("GET", url, timeout=30)
+                if response.status != 200:
+                    failures += 1
+            except Exception:
+                failures += 1
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(fetch(url) for url in urls))
+    return time.perf_counter() - started_at, failures
+
+
+async def run_backend(name, urls, concurrency, http1_url, http2_url):
+    if name == "aiohttp":
+        async with SessionManager(base_url_override=http1_url) as manager:
+            elapsed, failures = await fetch_all(manager.transport_for("aiohttp"), urls, concurrency)
+            connections = manager.connections_opened
+    else:
+        http2 = name == "httpx-h2c"
+        backend = HttpxTransport(http1=not http2, http2=http2)
+        transport = BaseURLOverrideTransport(backend, http2_url if http2 else http1_url)
+        try:
+            elapsed, failures = await fetch_all(transport, urls, concurrency)
+        finally:
+            await transport.close()
+        connections = backend.connections_opened
+    return elapsed, failures, connections
+
+
+async def run(args, http1_url, http2_url):
+    site = DetikSite()
+    stub = StubNewsServer(articles=args.requests)
+    urls = [site.article_url(stub.article("ekonomi", index)) for index in range(args.requests)]
+
+    backends = ["aiohttp"]
+    if importlib.util.find_spec("httpx") is not None:
+        backends.append("httpx-h1")
+        if http2_url:
+            backends.append("httpx-h2c")
+
+    for concurrency in args.concurrency:
+        for name in backends:
+            elapsed, failures, connections = await run_backend(
+                name, urls, concurrency, http1_url, http2_url
+            )
+            print(
+                f"concurrency {concurrency:4}  {name:10} {len(urls) / elapsed:8.0f} req/s  "
+                f"{elapsed:6.2f}s  failures {failures}  connections {connections}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", default="16,64", help="Comma-separated levels")
+    parser.add_argument("--latency", type=float, default=0.02, help="Stub server delay per response")
+    args = parser.parse_args()
+    args.concurrency = [int(level) for level in args.concurrency.split(",")]
+
+    http1_port = free_port()
+    command = [
+        sys.executable, "-m", "newswatch.stubserver",
+        "--port", str(http1_port),
+        "--articles", str(args.requests),
+        "--latency", str(args.latency),
+    ]
+    http2_port = None
+    if importlib.util.find_spec("h2") is not None:
+        http2_port = free_port()
+        command += ["--http2_port", str(http2_port)]
+
+    server = subprocess.Popen(command, cwd=ROOT, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_port(http1_port)
+        if http2_port:
+            wait_for_port(http2_port)
+        asyncio.run(
+            run(
+                args,
+                f"http://127.0.0.1:{http1_port}",
+                f"http://127.0.0.1:{http2_port}" if http2_port else None,
+            )
+        )
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark: keyword relevance matching, one pass vs. a substring test per keyword.
+
+Articles are generated as newswatch.stubserver does (a few hundred words,
+the keyword they were found for somewhere in them). For growing keyword
+sets, every article's title and content are matched three ways: with the
+loop kepriantaranews used before newswatch.keywords, a `keyword in text`
+test (and a count for the hits) per keyword, and with both of
+KeywordMatcher's searches, a str.find per keyword and the one pass that
+finds all keywords at once. It reports the time per article, which search
+KeywordMatcher picks for the size (SUBSTRING_SEARCH_LIMIT), and whether
+all three find the same keywords.
+
+    python benchmarks/bench_keywords.py --articles 5000 --sizes 3,30,300,3000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from newswatch.keywords import SUBSTRING_SEARCH_LIMIT, KeywordMatcher  # noqa: E402
+from newswatch.stubserver import WORDS, StubNewsServer  # noqa: E402
+
+# keywords the generated articles are about
+TOPICS = ["inflasi", "harga cabai", "bps", "suku bunga", "ekspor batu bara"]
+
+
+def keyword_set(size, rng):
+    keywords = list(TOPICS[:size])
+    while len(keywords) < size:
+        keywords.append(f"{' '.join(rng.choices(WORDS, k=2))} {len(keywords)}")
+    return keywords
+
+
+def substring_loop(keywords, title, content):
+    text = f"{title} {content}".lower()
+    return {keyword: text.count(keyword) for keyword in keywords if keyword in text}
+
+
+def timed(match, articles):
+    started_at = time.perf_counter()
+    results = [match(article.title, "\n".join(article.paragraphs)) for article in articles]
+    return time.perf_counter() - started_at, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--articles", type=int, default=2000)
+    parser.add_argument("--sizes", default="3,30,300,3000", help="Comma-separated keyword set sizes")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    server = StubNewsServer()
+    articles = [server.article(rng.choice(TOPICS), i) for i in range(args.articles)]
+
+    print(f"{args.articles} articles: ms per article")
+    print(f"{'keywords':>8} {'substring loop':>15} {'str.find':>9} {'one pass':>9} {'build':>8}  picked")
+    for size in map(int, args.sizes.split(",")):
+        keywords = keyword_set(size, rng)
+        started_at = time.perf_counter()
+        matcher = KeywordMatcher(keywords)
+        build_time = time.perf_counter() - started_at
+        loop_time, loop_results = timed(lambda title, content: substring_loop(keywords, title, content), articles)
+        matcher.substring_search = True
+        find_time, find_results = timed(matcher.matches, articles)
+        matcher.substring_search = False
+        pass_time, pass_results = timed(matcher.matches, articles)
+        row = (
+            f"{size:8} {loop_time * 1000 / len(articles):15.3f} "
+            f"{find_time * 1000 / len(articles):9.3f} {pass_time * 1000 / len(articles):9.3f} "
+            f"{build_time * 1000:6.1f}ms  {'str.find' if size < SUBSTRING_SEARCH_LIMIT else 'one pass'}"
+        )
+        if any(set(a) != set(b) for a, b in zip(loop_results, pass_results)):
+            row += "  <- keywords found differ"
+        elif find_results != pass_results:
+            row += "  <- hits differ"
+        print(row)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark: article fetches with and without the search-listing date prefilter.
+
+Runs the scrapers against newswatch.stubserver twice with the same start
+date: once with every search result fetched and checked in queue_article,
+as before newswatch.listings, and once with the results listed before the
+start date dropped unfetched. It reports, per site, the article pages
+fetched and the time taken both ways, and whether both runs return the same
+articles.
+
+The stub publishes an article every `--interval` minutes going back from
+its start, and `--days` puts the start date that many days back, so the
+cut-off falls inside the result pages. Only the page where it falls fetches
+less: either way a result older than the start date ends the pagination.
+
+    python benchmarks/bench_listing_dates.py --articles 200 --interval 360 --days 20
+    python benchmarks/bench_listing_dates.py --page_size 50 --latency 0.05 --sites detik,tempo
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_html_parsers import STUB_SITES  # noqa: E402
+from bench_http_backends import free_port, wait_for_port  # noqa: E402
+
+from newswatch.api import get_last_run_stats, scrape  # noqa: E402
+from newswatch.main import get_available_scrapers  # noqa: E402
+from newswatch.scrapers import basescraper  # noqa: E402
+
+
+def keep_every_result(links, start_date, source=None, slack=None):
+    return [link[0] if isinstance(link, tuple) else link for link in links], False
+
+
+def run(args, port, site, prefilter):
+    prefilter_links = basescraper.prefilter_links
+    if not prefilter:
+        basescraper.prefilter_links = keep_every_result
+    try:
+        started_at = time.perf_counter()
+        articles = scrape(
+            args.keywords, args.start_date, scrapers=site, base_url=f"http://127.0.0.1:{port}"
+        )
+        elapsed = time.perf_counter() - started_at
+    finally:
+        basescraper.prefilter_links = prefilter_links
+    stats = get_last_run_stats()
+    fetched = sum(host["page_types"].get("article", 0) for host in stats["timings"].values())
+    skipped = sum(source["skipped"] for source in stats["listings"].values())
+    links = sorted((article["keyword"], article["link"]) for article in articles)
+    return fetched, skipped, elapsed, links
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sites", default=",".join(STUB_SITES), help="Comma-separated scrapers")
+    parser.add_argument("--keywords", default="ekonomi")
+    parser.add_argument("--articles", type=int, default=200, help="Stub articles per keyword")
+    parser.add_argument("--page_size", type=int, default=20, help="Stub results per search page")
+    parser.add_argument("--interval", type=float, default=360, help="Minutes between stub articles")
+    parser.add_argument("--days", type=int, default=20, help="Start date this many days back")
+    parser.add_argument("--latency", type=float, default=0.0, help="Mean stub response delay in seconds")
+    args = parser.parse_args()
+    args.sites = [site.strip() for site in args.sites.split(",")]
+    args.start_date = (datetime.now() - timedelta(days=args.days)).strftime("%Y-%m-%d")
+
+    scraper_classes, linux_excluded_scrapers = get_available_scrapers()
+    scraper_classes.update(linux_excluded_scrapers)
+
+    port = free_port()
+    command = [
+        sys.executable, "-m", "newswatch.stubserver",
+        "--port", str(port),
+        "--articles", str(args.articles),
+        "--page_size", str(args.page_size),
+        "--interval", str(args.interval),
+        "--latency", str(args.latency),
+    ]
+    server = subprocess.Popen(command, cwd=ROOT, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_port(port)
+        print(f"start date {args.start_date}: article pages fetched, seconds")
+        print(f"{'site':16} {'articles':>8} {'all results':>12} {'prefiltered':>12} {'avoided':>8}")
+        total_before = total_after = 0
+        for site in args.sites:
+            if site not in scraper_classes:
+                print(f"{site:16} unknown scraper")
+                continue
+            before, _, before_time, before_links = run(args, port, site, prefilter=False)
+            after, skipped, after_time, after_links = run(args, port, site, prefilter=True)
+            total_before += before
+            total_after += after
+            row = (
+                f"{site:16} {len(after_links):8} {before:5} {before_time:6.2f} "
+                f"{after:5} {after_time:6.2f} {skipped:8}"
+            )
+            if before_links != after_links:
+                row += "  <- articles differ"
+            print(row)
+        if total_before:
+            print(
+                f"total: {total_before} article pages with every result fetched, {total_after} "
+                f"with the prefilter ({(total_before - total_after) / total_before:.0%} fewer)"
+            )
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
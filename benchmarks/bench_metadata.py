@@ -0,0 +1,166 @@
+"""
+Benchmark: article extraction with and without the metadata fast path.
+
+Article pages are captured from a run against newswatch.stubserver (or from
+replaying a cassette recorded from the real sites with `--record`); each
+scraper's pages are then extracted twice, with the JSON-LD / OpenGraph fast
+path and with the DOM selectors alone. It reports, per source, how many
+pages the metadata covered completely (no DOM parse) or partly, the CPU
+time per page both ways, and the fields where the two disagree.
+
+The stub serves JSON-LD and OpenGraph tags on every site's article pages
+(`--metadata`, on by default here); `--no_metadata` keeps them to tempo's.
+
+    python benchmarks/bench_metadata.py --articles 200
+    python benchmarks/bench_metadata.py --cassette run.jsonl.gz --keywords ekonomi --sites detik,kompas
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_html_parsers import STUB_SITES  # noqa: E402
+from bench_http_backends import free_port, wait_for_port  # noqa: E402
+
+from newswatch.api import scrape  # noqa: E402
+from newswatch.extract import FIELDS  # noqa: E402
+from newswatch.main import get_available_scrapers  # noqa: E402
+from newswatch.scrapers.basescraper import BaseScraper, resolve_html_parser  # noqa: E402
+from newswatch.stats import stats_scope  # noqa: E402
+
+article_pages = defaultdict(list)
+
+
+def capture_article_pages(args):
+    parse_page = BaseScraper._parse_page.__func__
+
+    def capturing(cls, body, charset, link, html_parser, method):
+        if method == "parse_article":
+            article_pages[cls].append((body, charset, link))
+        return parse_page(cls, body, charset, link, html_parser, method)
+
+    BaseScraper._parse_page = classmethod(capturing)
+    try:
+        run_scrapers(args)
+    finally:
+        BaseScraper._parse_page = classmethod(parse_page)
+
+
+def run_scrapers(args):
+    if args.cassette:
+        scrape(args.keywords, args.start_date, scrapers=",".join(args.sites), replay=args.cassette)
+        return
+
+    port = free_port()
+    command = [
+        sys.executable, "-m", "newswatch.stubserver",
+        "--port", str(port),
+        "--articles", str(args.articles),
+    ]
+    if not args.no_metadata:
+        command.append("--metadata")
+    server = subprocess.Popen(command, cwd=ROOT, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_port(port)
+        scrape(
+            args.keywords, args.start_date, scrapers=",".join(args.sites),
+            base_url=f"http://127.0.0.1:{port}",
+        )
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def extract_all(scraper_class, pages, html_parser, repeat):
+    timings = []
+    for _ in range(repeat):
+        articles = []
+        started_at = time.process_time()
+        for body, charset, link in pages:
+            try:
+                articles.append(
+                    scraper_class._parse_page(body, charset, link, html_parser, "parse_article")
+                )
+            except Exception:
+                articles.append(None)
+        timings.append(time.process_time() - started_at)
+    return min(timings), articles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cassette", help="Cassette recorded with --record")
+    parser.add_argument("--sites", default=",".join(STUB_SITES), help="Comma-separated scrapers")
+    parser.add_argument("--keywords", default="ekonomi")
+    parser.add_argument("--start_date", default=(datetime.now() - timedelta(days=365)).strftime("%Y-%m-%d"))
+    parser.add_argument("--articles", type=int, default=100, help="Stub articles per keyword")
+    parser.add_argument("--no_metadata", action="store_true", help="Stub metadata on tempo only")
+    parser.add_argument("--parser", default="auto", help="HTML parser backend")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    args.sites = [site.strip() for site in args.sites.split(",")]
+
+    scraper_classes, linux_excluded_scrapers = get_available_scrapers()
+    scraper_classes.update(linux_excluded_scrapers)
+    capture_article_pages(args)
+
+    html_parser = resolve_html_parser(args.parser)
+    print(f"{html_parser}: CPU ms per article page")
+    print(f"{'site':16} {'pages':>5} {'full':>6} {'partial':>7} {'DOM only':>9} {'fast path':>10}")
+    total_dom = total_fast = 0.0
+    for name in args.sites:
+        scraper_class = scraper_classes[name]["class"]
+        pages = article_pages[scraper_class]
+        if not pages:
+            print(f"{name:16} no article pages captured")
+            continue
+
+        metadata_fields = scraper_class.__dict__.get("metadata_fields")
+        try:
+            scraper_class.metadata_fields = ()
+            dom_time, dom_articles = extract_all(scraper_class, pages, html_parser, args.repeat)
+            scraper_class.metadata_fields = FIELDS
+            # count the fast path's coverage on its own
+            with stats_scope() as run_stats:
+                fast_time, fast_articles = extract_all(scraper_class, pages, html_parser, args.repeat)
+        finally:
+            if metadata_fields is None:
+                del scraper_class.metadata_fields
+            else:
+                scraper_class.metadata_fields = metadata_fields
+
+        total_dom += dom_time
+        total_fast += fast_time
+        coverage = run_stats.metadata.stats().get(scraper_class.__name__, {})
+        full = coverage.get("full", 0) / args.repeat
+        partial = coverage.get("partial", 0) / args.repeat
+        row = (
+            f"{name:16} {len(pages):5} {full / len(pages):6.0%} {partial / len(pages):7.0%} "
+            f"{dom_time * 1000 / len(pages):9.2f} {fast_time * 1000 / len(pages):10.2f}"
+        )
+        if dom_time:
+            row += f"  {(dom_time - fast_time) / dom_time:+.0%}"
+        differing = defaultdict(int)
+        for dom_article, fast_article in zip(dom_articles, fast_articles):
+            for field in FIELDS:
+                if (dom_article or {}).get(field) != (fast_article or {}).get(field):
+                    differing[field] += 1
+        if differing:
+            row += "  <- differs: " + ", ".join(f"{field} {n}" for field, n in differing.items())
+        print(row)
+    if total_dom:
+        print(
+            f"total: {total_dom:.2f}s DOM only, {total_fast:.2f}s with the fast path "
+            f"({(total_dom - total_fast) / total_dom:.0%} CPU saved)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark: event-loop lag and articles/sec with and without the parse pool.
+
+Runs the stub-server scrape once inline and once per worker count given
+with --workers. A monitor task sleeps for --interval on the same event loop
+as the scrapers and records how late it wakes up each time; that lag is how
+long any response, timer or other scraper waited for the loop. Parsing
+inline shows up as lag of one article's parse time or more; with the pool
+the loop only moves bytes and results.
+
+The gain in throughput depends on spare cores: on a single core the
+workers compete with the loop for the same CPU and only the lag improves.
+
+    python benchmarks/bench_parse_pool.py --workers 2,4 --articles 200
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_http_backends import free_port, wait_for_port  # noqa: E402
+
+from newswatch.api import _async_scrape_to_list  # noqa: E402
+from newswatch.timing import percentile  # noqa: E402
+
+# scrapers whose sites newswatch.stubserver serves (it also serves jawapos,
+# katadata and kontan, which the api leaves out on Linux)
+STUB_SITES = (
+    "detik", "kompas", "tempo", "cnbcindonesia", "antaranews", "mediaindonesia",
+    "keprinews", "batampos", "hariankepri", "alurnews", "ulasan",
+    "kepriantaranews", "bisnis", "okezone", "viva", "metrotvnews", "bloombergtechnoz",
+)
+
+
+async def monitor_lag(interval, lags):
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, loop.time() - expected))
+
+
+async def run(workers, base_url, args):
+    lags = []
+    monitor = asyncio.create_task(monitor_lag(args.interval, lags))
+    started_at = time.perf_counter()
+    try:
+        results = await _async_scrape_to_list(
+            args.keywords, args.start_date, scrapers=",".join(args.sites),
+            base_url=base_url, parse_workers=workers,
+        )
+    finally:
+        monitor.cancel()
+    return time.perf_counter() - started_at, len(results), lags
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", default="2", help="Comma-separated pool sizes to compare with inline")
+    parser.add_argument("--sites", default=",".join(STUB_SITES), help="Comma-separated scrapers")
+    parser.add_argument("--keywords", default="ekonomi,bank indonesia")
+    parser.add_argument("--start_date", default=(datetime.now() - timedelta(days=365)).strftime("%Y-%m-%d"))
+    parser.add_argument("--articles", type=int, default=100, help="Stub articles per keyword")
+    parser.add_argument("--interval", type=float, default=0.01, help="Lag monitor period in seconds")
+    args = parser.parse_args()
+    args.sites = [site.strip() for site in args.sites.split(",")]
+    pool_sizes = [0] + [int(n) for n in args.workers.split(",")]
+
+    port = free_port()
+    command = [
+        sys.executable, "-m", "newswatch.stubserver",
+        "--port", str(port),
+        "--articles", str(args.articles),
+    ]
+    server = subprocess.Popen(command, cwd=ROOT, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_port(port)
+        print(f"{os.cpu_count()} CPUs")
+        print(f"{'workers':>8} {'articles':>9} {'art/s':>8} {'lag p50':>10} {'lag p99':>10} {'lag max':>10}")
+        for workers in pool_sizes:
+            elapsed, count, lags = asyncio.run(run(workers, f"http://127.0.0.1:{port}", args))
+            lags_ms = sorted(lag * 1000 for lag in lags) or [0.0]
+            print(
+                f"{workers or 'inline':>8} {count:9} {count / elapsed:8.1f} "
+                f"{percentile(lags_ms, 50):7.1f} ms {percentile(lags_ms, 99):7.1f} ms "
+                f"{lags_ms[-1]:7.1f} ms"
+            )
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
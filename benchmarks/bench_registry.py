@@ -0,0 +1,147 @@
+"""
+Benchmark: fetching an article once per keyword vs. once per run.
+
+Runs the scrapers against newswatch.stubserver with several keywords whose
+searches share a fraction of their articles (`--overlap`), three ways:
+fetching and parsing every search result for every keyword that lists it,
+as before newswatch.registry; with the registry, one row per article and
+keyword, as by default; and with the registry, one row per article
+(`merge_keywords`). It reports, per site, the article pages fetched and
+parsed, the time taken and the rows returned, and checks that the
+registry's rows match the per-keyword run's and that the merged rows cover
+the same articles and keywords. Concurrent requests for the same URL already share one
+response (newswatch.singleflight), so without the registry fewer pages are
+fetched than parsed.
+
+    python benchmarks/bench_registry.py --keywords "bps,inflasi,harga cabai" --overlap 0.5
+    python benchmarks/bench_registry.py --overlap 0.9 --latency 0.05 --sites detik,tempo
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_html_parsers import STUB_SITES  # noqa: E402
+from bench_http_backends import free_port, wait_for_port  # noqa: E402
+
+from newswatch.api import get_last_run_stats, scrape  # noqa: E402
+from newswatch.main import get_available_scrapers  # noqa: E402
+from newswatch.scrapers.basescraper import BaseScraper  # noqa: E402
+
+extract_article = BaseScraper.extract_article
+# article pages parsed in the current run
+parses = 0
+
+
+async def get_article_every_time(self, link, keyword):
+    return await self.get_article(link, keyword)
+
+
+async def counting_extract_article(self, response, link, method="parse_article"):
+    global parses
+    parses += 1
+    return await extract_article(self, response, link, method)
+
+
+def run(args, port, site, registry=True, merge=False):
+    global parses
+    parses = 0
+    get_article_once = BaseScraper.get_article_once
+    if not registry:
+        BaseScraper.get_article_once = get_article_every_time
+    BaseScraper.extract_article = counting_extract_article
+    try:
+        started_at = time.perf_counter()
+        rows = scrape(
+            args.keywords, args.start_date, scrapers=site,
+            base_url=f"http://127.0.0.1:{port}", merge_keywords=merge,
+        )
+        elapsed = time.perf_counter() - started_at
+    finally:
+        BaseScraper.get_article_once = get_article_once
+        BaseScraper.extract_article = extract_article
+    stats = get_last_run_stats()
+    fetched = sum(host["page_types"].get("article", 0) for host in stats["timings"].values())
+    pairs = sorted(
+        (row["link"], keyword)
+        for row in rows
+        for keyword in (row["keyword"] if merge else [row["keyword"]])
+    )
+    return fetched, parses, elapsed, len(rows), pairs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sites", default=",".join(STUB_SITES), help="Comma-separated scrapers")
+    parser.add_argument("--keywords", default="bps,inflasi,harga cabai")
+    parser.add_argument("--articles", type=int, default=100, help="Stub articles per keyword")
+    parser.add_argument("--overlap", type=float, default=0.5, help="Fraction of articles the keywords share")
+    parser.add_argument("--latency", type=float, default=0.0, help="Mean stub response delay in seconds")
+    args = parser.parse_args()
+    args.sites = [site.strip() for site in args.sites.split(",")]
+    args.start_date = (datetime.now() - timedelta(days=365)).strftime("%Y-%m-%d")
+
+    scraper_classes, linux_excluded_scrapers = get_available_scrapers()
+    scraper_classes.update(linux_excluded_scrapers)
+
+    port = free_port()
+    command = [
+        sys.executable, "-m", "newswatch.stubserver",
+        "--port", str(port),
+        "--articles", str(args.articles),
+        "--latency", str(args.latency),
+        "--shared_keywords", args.keywords,
+        "--overlap", str(args.overlap),
+    ]
+    server = subprocess.Popen(command, cwd=ROOT, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_port(port)
+        print(
+            f"keywords {args.keywords!r}, overlap {args.overlap:.0%}: "
+            f"article pages fetched and parsed, seconds, rows"
+        )
+        print(f"{'site':16} {'per keyword':>24} {'registry':>24} {'merged':>7}")
+        total_before = total_after = 0
+        parses_before = parses_after = 0
+        for site in args.sites:
+            if site not in scraper_classes:
+                print(f"{site:16} unknown scraper")
+                continue
+            before, before_parses, before_time, before_rows, before_pairs = run(
+                args, port, site, registry=False
+            )
+            after, after_parses, after_time, after_rows, after_pairs = run(args, port, site)
+            _, _, _, merged_rows, merged_pairs = run(args, port, site, merge=True)
+            total_before += before
+            total_after += after
+            parses_before += before_parses
+            parses_after += after_parses
+            row = (
+                f"{site:16} {before:5} {before_parses:5} {before_time:6.2f} {before_rows:5} "
+                f"{after:5} {after_parses:5} {after_time:6.2f} {after_rows:5} {merged_rows:7}"
+            )
+            if after_pairs != before_pairs:
+                row += "  <- rows differ"
+            elif merged_pairs != before_pairs:
+                row += "  <- merged rows differ"
+            print(row)
+        if total_before:
+            print(
+                f"total: {total_before} fetched and {parses_before} parsed per keyword, "
+                f"{total_after} and {parses_after} with the registry "
+                f"({(total_before - total_after) / total_before:.0%} fewer fetches, "
+                f"{(parses_before - parses_after) / max(parses_before, 1):.0%} fewer parses)"
+            )
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
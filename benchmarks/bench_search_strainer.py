@@ -0,0 +1,159 @@
+"""
+Benchmark: full vs. restricted parsing of search-result pages, per scraper.
+
+Search pages are captured from a run against newswatch.stubserver (or from
+replaying a cassette recorded from the real sites with `--record`); each
+scraper's parse_article_links is then timed on its own pages twice: building
+the whole page, and building only what the scraper's search_strainer
+matches. Both must return the same links; a mismatch means a link selector
+reaches outside the strainer.
+
+Stub search pages carry little besides the result list; real ones have
+navigation, ads and scripts around it, where the restricted parse saves more.
+`--padding KB` adds that much such markup to every stub page.
+
+    python benchmarks/bench_search_strainer.py --articles 200 --padding 150
+    python benchmarks/bench_search_strainer.py --cassette run.jsonl.gz --keywords ekonomi --sites detik,kompas
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_html_parsers import STUB_SITES  # noqa: E402
+from bench_http_backends import free_port, wait_for_port  # noqa: E402
+
+from newswatch.api import scrape  # noqa: E402
+from newswatch.main import get_available_scrapers  # noqa: E402
+from newswatch.scrapers.basescraper import resolve_html_parser  # noqa: E402
+
+search_pages = defaultdict(list)
+
+
+def capturing(name, parse_article_links):
+    def wrapper(self, response_text):
+        search_pages[name].append(response_text)
+        return parse_article_links(self, response_text)
+
+    return wrapper
+
+
+def run_scrapers(args):
+    if args.cassette:
+        scrape(args.keywords, args.start_date, scrapers=",".join(args.sites), replay=args.cassette)
+        return
+
+    port = free_port()
+    command = [
+        sys.executable, "-m", "newswatch.stubserver",
+        "--port", str(port),
+        "--articles", str(args.articles),
+    ]
+    server = subprocess.Popen(command, cwd=ROOT, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_port(port)
+        scrape(
+            args.keywords, args.start_date, scrapers=",".join(args.sites),
+            base_url=f"http://127.0.0.1:{port}",
+        )
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def capture_search_pages(scraper_classes, args):
+    originals = {}
+    for name in args.sites:
+        scraper_class = scraper_classes[name]["class"]
+        originals[name] = scraper_class.parse_article_links
+        scraper_class.parse_article_links = capturing(name, originals[name])
+    try:
+        run_scrapers(args)
+    finally:
+        for name, parse_article_links in originals.items():
+            scraper_classes[name]["class"].parse_article_links = parse_article_links
+
+
+def padded(page, kilobytes):
+    if not page.lstrip().startswith("<"):
+        return page  # JSON search APIs
+    block = (
+        '<nav class="menu"><ul>'
+        + "".join(f'<li class="menu-item"><a href="/kanal/{i}">Kanal {i}</a></li>' for i in range(20))
+        + '</ul></nav><div class="ads"><script>window.ads=window.ads||[];</script></div>'
+    )
+    filler = block * max(1, kilobytes * 1024 // len(block))
+    if "<body>" in page:
+        return page.replace("<body>", f"<body>{filler}", 1)
+    return filler + page
+
+
+def best_of(repeat, scraper, pages):
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        links = [scraper.parse_article_links(page) for page in pages]
+        timings.append(time.perf_counter() - started_at)
+    return min(timings), links
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cassette", help="Cassette recorded with --record")
+    parser.add_argument("--sites", default=",".join(STUB_SITES), help="Comma-separated scrapers")
+    parser.add_argument("--keywords", default="ekonomi")
+    parser.add_argument("--start_date", default=(datetime.now() - timedelta(days=365)).strftime("%Y-%m-%d"))
+    parser.add_argument("--articles", type=int, default=100, help="Stub articles per keyword")
+    parser.add_argument("--parser", default="auto", help="HTML parser backend")
+    parser.add_argument("--padding", type=int, default=0, help="KB of page chrome added to each page")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    args.sites = [site.strip() for site in args.sites.split(",")]
+
+    scraper_classes, linux_excluded_scrapers = get_available_scrapers()
+    scraper_classes.update(linux_excluded_scrapers)
+    capture_search_pages(scraper_classes, args)
+
+    html_parser = resolve_html_parser(args.parser)
+    print(f"{html_parser}: ms per search page")
+    print(f"{'site':16} {'pages':>5} {'KB/page':>8} {'full':>8} {'strained':>9}")
+    for name in args.sites:
+        pages = search_pages[name]
+        if args.padding and not args.cassette:
+            pages = [padded(page, args.padding) for page in pages]
+        if not pages:
+            print(f"{name:16} no search pages captured")
+            continue
+        info = scraper_classes[name]
+        scraper = info["class"](args.keywords, start_date=datetime.now(), **info["params"])
+        scraper.html_parser = html_parser
+        strainer = scraper.search_strainer
+
+        scraper.search_strainer = None
+        full_time, full_links = best_of(args.repeat, scraper, pages)
+        scraper.search_strainer = strainer
+        strained_time, strained_links = best_of(args.repeat, scraper, pages)
+
+        size = sum(len(page) for page in pages) / len(pages) / 1024
+        row = (
+            f"{name:16} {len(pages):5} {size:8.1f} "
+            f"{full_time * 1000 / len(pages):8.2f} {strained_time * 1000 / len(pages):9.2f}"
+        )
+        if strainer is None:
+            row += "  (no strainer)"
+        elif full_time:
+            row += f"  {(full_time - strained_time) / full_time:+.0%}"
+        if full_links != strained_links:
+            row += "  <- links differ"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,4 +8,5 @@ from .api import (
     list_scrapers,
     quick_scrape,
     scrape_ihsg_news,
+    get_last_run_stats,
 )
@@ -16,8 +16,17 @@ from typing import Dict, List, Optional, Union
 
 import pandas as pd
 
+from .cache import ResponseCache
+from .deadline import deadline_scope
 from .exceptions import NewsWatchError, ValidationError
-from .main import get_available_scrapers, main as async_main
+from .main import JSON_COLUMNS, get_available_scrapers, json_cell, main as async_main
+from .parsepool import ParsePool
+from .scrapers.basescraper import DEFAULT_HTML_PARSER, HTML_PARSERS, resolve_html_parser
+from .session import SessionManager, preferred_http_backend
+from .stats import stats_scope
+
+# HTTP statistics of the most recent scrape, see get_last_run_stats()
+_last_run_stats: Dict = {}
 
 
 class MockArgs:
@@ -88,7 +97,14 @@ async def _collect_queue_results(queue: asyncio.Queue, scrapers_done_event: asyn
 
 
 async def _async_scrape_to_list(keywords: str, start_date: str, scrapers: str = "auto", 
-                               verbose: bool = False, timeout: int = 300) -> List[Dict]:
+                               verbose: bool = False, timeout: int = 300,
+                               cache: bool = False, record: Optional[str] = None,
+                               replay: Optional[str] = None,
+                               replay_latency: bool = False,
+                               base_url: Optional[str] = None,
+                               parser: str = DEFAULT_HTML_PARSER,
+                               parse_workers: int = 0,
+                               merge_keywords: bool = False) -> List[Dict]:
     """
     Internal async function to scrape and return results as list.
     
@@ -110,6 +126,12 @@ async def _async_scrape_to_list(keywords: str, start_date: str, scrapers: str =
     
     if not keywords.strip():
         raise ValidationError("Keywords cannot be empty.")
+
+    if parser not in HTML_PARSERS:
+        raise ValidationError(f"Invalid parser: {parser}. Use one of {', '.join(HTML_PARSERS)}.")
+
+    if parse_workers < 0:
+        raise ValidationError(f"Invalid parse_workers: {parse_workers}. Use 0 or more.")
     
     # get available scrapers and validate selection
     scraper_classes, linux_excluded_scrapers = get_available_scrapers()
@@ -145,6 +167,7 @@ async def _async_scrape_to_list(keywords: str, start_date: str, scrapers: str =
         ]
     
     # instantiate scrapers
+    html_parser = resolve_html_parser(parser)
     scraper_instances = []
     for scraper_name in scrapers_to_run:
         scraper_info = scraper_classes.get(scraper_name)
@@ -154,6 +177,12 @@ async def _async_scrape_to_list(keywords: str, start_date: str, scrapers: str =
             scraper_instance = scraper_class(
                 keywords, start_date=start_date_obj, queue_=queue, **scraper_params
             )
+            scraper_instance.rate_limit = scraper_info.get("rate_limit")
+            scraper_instance.http_backend = preferred_http_backend(
+                scraper_info.get("http_backend")
+            )
+            scraper_instance.html_parser = html_parser
+            scraper_instance.merge_keywords = merge_keywords
             scraper_instances.append(scraper_instance)
         else:
             logging.warning(f"scraper '{scraper_name}' is not recognized.")
@@ -172,17 +201,43 @@ async def _async_scrape_to_list(keywords: str, start_date: str, scrapers: str =
     total_scrapers = len(scraper_instances)
     logging.debug(f"Starting {total_scrapers} scrapers: {[type(s).__name__ for s in scraper_instances]}")
     
-    # run all scrapers concurrently with timeout
+    parse_pool = None
+    # run all scrapers concurrently with timeout, sharing one connection pool
+    session_manager = SessionManager(
+        cache=ResponseCache() if cache else None,
+        record_to=record,
+        replay_from=replay,
+        replay_latency=replay_latency,
+        base_url_override=base_url,
+    )
+    deadline = None
+    run_stats = None
     scraper_tasks = []
     try:
-        scraper_tasks = [asyncio.create_task(scraper.scrape()) for scraper in scraper_instances]
-        # set overall timeout to 3 minutes for all scrapers
-        await asyncio.wait_for(asyncio.gather(*scraper_tasks), timeout=180)
-        logging.debug(f"All {total_scrapers} scrapers completed successfully")
-    except asyncio.TimeoutError:
-        logging.warning(f"Scraping took too long and was stopped after 3 minutes. {total_scrapers} scrapers were running.")
-    except Exception as e:
-        logging.error(f"Error during scraping: {e}")
+        # fork the parse workers before the session opens connections; both
+        # are started in here so the finally below closes them if either fails
+        if parse_workers > 0:
+            parse_pool = ParsePool(parse_workers)
+            await parse_pool.start()
+            for scraper in scraper_instances:
+                scraper.parse_pool = parse_pool
+
+        await session_manager.start()
+        for scraper in scraper_instances:
+            scraper.session_manager = session_manager
+
+        # fetches wind down at the run deadline, shortly before the timeout
+        # cancels whatever is left; articles already collected are kept. The
+        # tasks count into the run's own stats (see newswatch.stats)
+        with deadline_scope(timeout) as deadline, stats_scope() as run_stats:
+            scraper_tasks = [asyncio.create_task(scraper.scrape()) for scraper in scraper_instances]
+        try:
+            await asyncio.wait_for(asyncio.gather(*scraper_tasks), timeout=timeout)
+            logging.debug(f"All {total_scrapers} scrapers completed successfully")
+        except asyncio.TimeoutError:
+            logging.warning(f"Scraping took too long and was stopped after {timeout}s. {total_scrapers} scrapers were running.")
+        except Exception as e:
+            logging.error(f"Error during scraping: {e}")
     finally:
         # cancel any remaining scraper tasks
         cancelled_count = 0
@@ -201,6 +256,23 @@ async def _async_scrape_to_list(keywords: str, start_date: str, scrapers: str =
             except Exception:
                 pass
         
+        session_manager.log_summary()
+        if deadline is not None:
+            deadline.log_summary()
+        if run_stats is not None:
+            run_stats.log_summary()
+        await session_manager.close()
+        _last_run_stats.clear()
+        _last_run_stats.update(session_manager.stats())
+        if deadline is not None:
+            _last_run_stats["deadline"] = deadline.stats()
+        if run_stats is not None:
+            _last_run_stats.update(run_stats.stats())
+        if parse_pool is not None:
+            parse_pool.log_summary()
+            await parse_pool.close()
+            _last_run_stats["parse_pool"] = parse_pool.stats()
+
         # important: signal that all scrapers are done BEFORE sending sentinel
         scrapers_done_event.set()
         logging.debug("Scrapers completion event set")
@@ -223,7 +295,11 @@ async def _async_scrape_to_list(keywords: str, start_date: str, scrapers: str =
 
 
 def scrape(keywords: str, start_date: str, scrapers: str = "auto", 
-          verbose: bool = False, timeout: int = 300, **kwargs) -> List[Dict]:
+          verbose: bool = False, timeout: int = 300, cache: bool = False,
+          record: Optional[str] = None, replay: Optional[str] = None,
+          replay_latency: bool = False, base_url: Optional[str] = None,
+          parser: str = DEFAULT_HTML_PARSER, parse_workers: int = 0,
+          merge_keywords: bool = False, **kwargs) -> List[Dict]:
     """
     Scrape news articles and return as list of dictionaries.
     
@@ -233,6 +309,20 @@ def scrape(keywords: str, start_date: str, scrapers: str = "auto",
         scrapers (str): Scrapers to use - "auto", "all", or comma-separated list
         verbose (bool): Enable verbose logging
         timeout (int): Maximum time in seconds for scraping operation
+        cache (bool): Cache responses on disk and revalidate them on later runs
+        record (str, optional): Record every response to this cassette file
+        replay (str, optional): Serve the run from this cassette file instead
+            of the network
+        replay_latency (bool): With `replay`, wait as long as each recorded
+            request took
+        base_url (str, optional): Send every request to this server instead
+            of the news sites (e.g. a local newswatch.stubserver)
+        parser (str): HTML parser backend for all scrapers - "auto" (lxml
+            when installed), "lxml" or "html.parser"
+        parse_workers (int): Parse article pages in this many worker
+            processes instead of on the event loop; 0 parses inline
+        merge_keywords (bool): Return one dictionary per article, with the
+            keywords it was found for, instead of one per article and keyword
         **kwargs: Additional parameters (for future compatibility)
     
     Returns:
@@ -241,17 +331,24 @@ def scrape(keywords: str, start_date: str, scrapers: str = "auto",
             - publish_date: Publication date as string
             - author: Article author
             - content: Article content
-            - keyword: Matched keyword
+            - keyword: Keyword the article was found for (with
+              merge_keywords, the list of them)
             - category: Article category
             - source: News source
             - link: Article URL
+            - matched_keywords: Every keyword of the run the article
+              mentions -> hits
     
     Raises:
         ValidationError: For invalid input parameters
         NewsWatchError: For other newswatch-related errors
     """
     try:
-        return asyncio.run(_async_scrape_to_list(keywords, start_date, scrapers, verbose, timeout))
+        return asyncio.run(_async_scrape_to_list(
+            keywords, start_date, scrapers, verbose, timeout, cache,
+            record, replay, replay_latency, base_url, parser, parse_workers,
+            merge_keywords,
+        ))
     except KeyboardInterrupt:
         logging.info("Scraping interrupted by user")
         return []
@@ -288,7 +385,7 @@ def scrape_to_dataframe(keywords: str, start_date: str, scrapers: str = "auto",
         # define column order
         columns = [
             "title", "publish_date", "author", "content", 
-            "keyword", "category", "source", "link"
+            "keyword", "category", "source", "link", "matched_keywords"
         ]
         
         if not results:
@@ -347,6 +444,10 @@ def scrape_to_file(keywords: str, start_date: str, output_path: Union[str, Path]
         if df.empty:
             logging.warning("No articles found. Creating empty file.")
         
+        # lists and dicts as JSON, as the CLI writes them
+        for name in JSON_COLUMNS:
+            df[name] = df[name].map(json_cell)
+
         # save to file
         if output_format.lower() == "xlsx":
             df.to_excel(output_path, index=False)
@@ -361,6 +462,40 @@ def scrape_to_file(keywords: str, start_date: str, output_path: Union[str, Path]
         raise NewsWatchError(f"Error saving to file: {e}") from e
 
 
+def get_last_run_stats() -> Dict:
+    """
+    Get statistics of the most recent scrape in this process.
+    
+    Returns:
+        Dict: The run's statistics, by key:
+            - connections_opened, connections_reused, requests_served:
+              HTTP connection reuse
+            - rate_limits, circuits: Per-host rate limiting and circuit
+              breaker state
+            - cache: Disk cache hits, misses, revalidated and stored
+              responses (None without cache)
+            - coalesced: Duplicate in-flight requests served by one call
+            - transports: Per HTTP backend transport statistics
+            - bodies: Bytes read, bodies truncated at their size cap and
+              responses rejected by content type
+            - timings: Per-host request timings, by page type
+            - deadline: The run's time budget and the requests it skipped
+              or cut short
+            - dates: Per-source dates parsed with a learned format or by
+              dateparser, and formats learned
+            - metadata: Per-source coverage of the JSON-LD / OpenGraph fast path
+            - selectors: Per-source fallback chains resolved by the first
+              selector tried, and selectors tried
+            - listings: Per-source search results dropped by their listing date
+            - keywords: Per-source articles checked and dropped as not
+              mentioning their keyword
+            - registry: Per-source article pages fetched, reused for another
+              keyword and rows emitted
+            - parse_pool: Parse pool jobs and timings (only with parse_workers)
+    """
+    return dict(_last_run_stats)
+
+
 def list_scrapers() -> List[str]:
     """
     Get list of available scrapers.
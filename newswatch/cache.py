@@ -0,0 +1,157 @@
+"""
+Persistent on-disk HTTP response cache for newswatch.
+
+Responses are stored undecoded per request (method + URL + body) together
+with their charset and ETag / Last-Modified validators. A fresh entry is
+served without touching the network; a stale one is revalidated with
+If-None-Match / If-Modified-Since so an unchanged page costs a 304 instead of
+a full download. Freshness depends
+on the page type: search result pages change constantly, article pages
+rarely do.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import os
+import time
+from urllib.parse import urlencode
+
+from .paths import get_cache_dir
+
+# seconds a cached page is served without revalidation; None = never stale
+DEFAULT_TTLS = {
+    "search": 15 * 60,
+    "article": 7 * 24 * 60 * 60,
+}
+
+
+def request_key(method, url, data=None):
+    """Identify a request by method, URL and body."""
+    if isinstance(data, dict):
+        body = urlencode(sorted(data.items()))
+    elif isinstance(data, bytes):
+        body = data.decode("utf-8", "replace")
+    else:
+        body = data or ""
+    return hashlib.sha256(f"{method}\n{url}\n{body}".encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """File-per-entry response cache with conditional revalidation."""
+
+    def __init__(self, directory=None, ttls=None):
+        """
+        Initialize ResponseCache.
+
+        Args:
+            directory (str or Path, optional): Where entries are stored;
+                defaults to <cache dir>/http
+            ttls (dict, optional): page type -> freshness lifetime in seconds
+                (None for pages that never go stale)
+        """
+        self.directory = directory or get_cache_dir() / "http"
+        os.makedirs(self.directory, exist_ok=True)
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.stored = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def _read(self, key):
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logging.debug(f"Ignoring unreadable cache entry {key}: {e}")
+            return None
+        if "charset" not in entry:
+            # written by an older version that stored decoded text
+            return None
+        # bodies are kept undecoded, as base64
+        try:
+            entry["body"] = base64.b64decode(entry["body"])
+        except (TypeError, ValueError) as e:
+            logging.debug(f"Ignoring unreadable cache entry {key}: {e}")
+            return None
+        return entry
+
+    def _write(self, key, entry):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({**entry, "body": base64.b64encode(entry["body"]).decode("ascii")}, f)
+        os.replace(tmp_path, path)
+
+    async def get(self, key):
+        return await asyncio.to_thread(self._read, key)
+
+    def is_fresh(self, entry, page_type):
+        ttl = self.ttls.get(page_type, self.ttls["article"])
+        if ttl is None:
+            return True
+        return time.time() - entry["stored_at"] < ttl
+
+    @staticmethod
+    def conditional_headers(entry, headers=None):
+        """Add validators from a stale entry to the request headers."""
+        headers = dict(headers or {})
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    async def store(self, key, url, body, charset, response_headers):
+        if "no-store" in response_headers.get("Cache-Control", ""):
+            return
+        entry = {
+            "url": url,
+            "stored_at": time.time(),
+            "etag": response_headers.get("ETag"),
+            "last_modified": response_headers.get("Last-Modified"),
+            "body": body,
+            "charset": charset,
+        }
+        try:
+            await asyncio.to_thread(self._write, key, entry)
+            self.stored += 1
+        except OSError as e:
+            logging.warning(f"Could not write cache entry for {url}: {e}")
+
+    async def refresh(self, key, entry):
+        """Mark a revalidated (304) entry as fresh again."""
+        entry["stored_at"] = time.time()
+        try:
+            await asyncio.to_thread(self._write, key, entry)
+        except OSError as e:
+            logging.warning(f"Could not refresh cache entry for {entry['url']}: {e}")
+
+    def stats(self):
+        """
+        Get cache statistics for the run.
+
+        Returns:
+            dict: Hits served from disk, misses, revalidated (304) and stored
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+            "stored": self.stored,
+        }
+
+    def log_summary(self):
+        stats = self.stats()
+        logging.info(
+            f"HTTP cache: {stats['hits']} hits, {stats['revalidated']} revalidated, "
+            f"{stats['misses']} misses, {stats['stored']} stored"
+        )
@@ -0,0 +1,146 @@
+"""
+Per-host circuit breakers for newswatch.
+
+After a run of consecutive failures against a host its breaker opens and
+requests to that host fail fast instead of each going through retries and
+timeouts. While open, a single probe request is let through once the reset
+timeout has passed; the breaker closes again if the probe succeeds.
+"""
+
+import logging
+import time
+from enum import Enum
+from urllib.parse import urlparse
+
+
+class CircuitState(Enum):
+    """Enumeration for circuit breaker states"""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one host."""
+
+    def __init__(self, failure_threshold=5, reset_timeout=15.0, max_reset_timeout=120.0):
+        """
+        Initialize CircuitBreaker.
+
+        Args:
+            failure_threshold (int): Consecutive failures that open the circuit
+            reset_timeout (float): Seconds before the first half-open probe
+            max_reset_timeout (float): Upper bound for the probe interval, which
+                doubles each time a probe fails
+        """
+        self.failure_threshold = failure_threshold
+        self.base_reset_timeout = reset_timeout
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.last_failure = None
+        self.opened_at = None
+        self.times_opened = 0
+        self.short_circuited = 0
+        self._probe_in_flight = False
+
+    def allow(self):
+        """
+        Check whether a request may be sent.
+
+        Returns:
+            bool: False if the request should be short-circuited
+        """
+        if self.state is CircuitState.CLOSED:
+            return True
+
+        if self.state is CircuitState.OPEN:
+            if time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = CircuitState.HALF_OPEN
+            else:
+                self.short_circuited += 1
+                return False
+
+        # half-open: exactly one probe at a time
+        if self._probe_in_flight:
+            self.short_circuited += 1
+            return False
+        self._probe_in_flight = True
+        return True
+
+    def record_success(self):
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.reset_timeout = self.base_reset_timeout
+        self._probe_in_flight = False
+
+    def record_failure(self, reason):
+        self.consecutive_failures += 1
+        self.last_failure = reason
+
+        if self.state is CircuitState.HALF_OPEN:
+            # failed probe: stay open and wait longer before the next one
+            self.reset_timeout = min(self.max_reset_timeout, self.reset_timeout * 2)
+            self._open()
+        elif (
+            self.state is CircuitState.CLOSED
+            and self.consecutive_failures >= self.failure_threshold
+        ):
+            self._open()
+
+    def release_probe(self):
+        """Forget a probe that ended without a verdict (e.g. a 404)."""
+        self._probe_in_flight = False
+
+    def _open(self):
+        self.state = CircuitState.OPEN
+        self.opened_at = time.monotonic()
+        self.times_opened += 1
+        self._probe_in_flight = False
+
+
+class CircuitBreakerRegistry:
+    """Circuit breakers keyed by host name, shared by all scrapers in a run."""
+
+    def __init__(self, failure_threshold=5, reset_timeout=15.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.breakers = {}
+
+    def breaker_for(self, url):
+        host = urlparse(url).hostname or ""
+        breaker = self.breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            self.breakers[host] = breaker
+        return breaker
+
+    def stats(self):
+        """
+        Get the state of every breaker that has seen a failure.
+
+        Returns:
+            dict: host -> state, times opened, requests skipped and last failure
+        """
+        return {
+            host: {
+                "state": breaker.state.value,
+                "times_opened": breaker.times_opened,
+                "short_circuited": breaker.short_circuited,
+                "consecutive_failures": breaker.consecutive_failures,
+                "last_failure": breaker.last_failure,
+            }
+            for host, breaker in self.breakers.items()
+            if breaker.last_failure is not None
+        }
+
+    def log_summary(self):
+        for host, stats in sorted(self.stats().items()):
+            if not stats["times_opened"]:
+                continue
+            logging.warning(
+                f"Circuit {host}: {stats['state']}, opened {stats['times_opened']}x, "
+                f"{stats['short_circuited']} requests skipped "
+                f"(last failure: {stats['last_failure']})"
+            )
@@ -6,6 +6,7 @@ from datetime import datetime
 
 from .main import get_available_scrapers
 from .main import main as run_main
+from .scrapers.basescraper import DEFAULT_HTML_PARSER, HTML_PARSERS
 
 
 def cli():
@@ -52,6 +53,52 @@ def cli():
         type=str,
         help="Output file format. Options are csv or xlsx. Default is csv.",
     )
+    parser.add_argument(
+        "--merge_keywords",
+        action="store_true",
+        help="Write one row per article, listing the keywords it was found for, "
+        "instead of one row per article and keyword.",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Cache responses on disk and revalidate them on later runs.",
+    )
+    cassette = parser.add_mutually_exclusive_group()
+    cassette.add_argument(
+        "--record",
+        metavar="CASSETTE",
+        help="Record every response of this run to a cassette file.",
+    )
+    cassette.add_argument(
+        "--replay",
+        metavar="CASSETTE",
+        help="Serve this run from a recorded cassette instead of the network.",
+    )
+    parser.add_argument(
+        "--replay_latency",
+        action="store_true",
+        help="With --replay, wait as long as each recorded request took.",
+    )
+    parser.add_argument(
+        "--base_url",
+        help="Send every request to this server instead of the news sites "
+        "(e.g. a local newswatch.stubserver).",
+    )
+    parser.add_argument(
+        "--parser",
+        choices=HTML_PARSERS,
+        default=DEFAULT_HTML_PARSER,
+        help="HTML parser backend for all scrapers. 'auto' uses lxml when it is "
+        "installed, html.parser otherwise.",
+    )
+    parser.add_argument(
+        "--parse_workers",
+        type=int,
+        default=0,
+        help="Parse article pages in this many worker processes instead of "
+        "on the event loop (0 parses inline).",
+    )
     parser.add_argument(
         "--verbose",
         "-v",
@@ -0,0 +1,182 @@
+"""
+Adaptive concurrency control for newswatch scrapers.
+
+AdaptiveLimiter replaces a fixed asyncio.Semaphore with an AIMD
+(additive-increase, multiplicative-decrease) in-flight limit: the limit grows
+slowly while requests complete quickly and without errors, and is cut sharply
+on 429/5xx responses or timeouts. "Quickly" is measured against the fastest
+of the recent responses of the same page type, so search and article pages
+are judged apart and one unusually fast response only sets the bar until it
+leaves the window. Converged limits are persisted per host by
+ConcurrencyStore so the next run starts where the last one ended.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import defaultdict, deque
+
+from .paths import get_cache_dir
+
+
+class AdaptiveLimiter:
+    """Async context manager limiting in-flight requests with an AIMD limit."""
+
+    def __init__(
+        self,
+        initial,
+        min_limit=1,
+        max_limit=None,
+        decrease_factor=0.5,
+        latency_tolerance=2.0,
+        max_error_rate=0.1,
+        window=20,
+        latency_window=50,
+    ):
+        """
+        Initialize AdaptiveLimiter.
+
+        Args:
+            initial (int): Starting in-flight limit
+            min_limit (int): Lower bound for the limit
+            max_limit (int, optional): Upper bound; defaults to 4x initial (at least 16)
+            decrease_factor (float): Multiplier applied to the limit on overload
+            latency_tolerance (float): Latency above baseline * tolerance is unhealthy
+            max_error_rate (float): Error rate over the window above which the
+                limit stops growing
+            window (int): Number of recent outcomes used for the error rate
+            latency_window (int): Number of recent latencies per page type the
+                baseline (their minimum) is taken from
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit or max(initial * 4, 16)
+        self.limit = float(min(max(initial, min_limit), self.max_limit))
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.max_error_rate = max_error_rate
+        self.outcomes = deque(maxlen=window)
+        # page type -> recent latencies of successful responses
+        self.latencies = defaultdict(lambda: deque(maxlen=latency_window))
+        self.increases = 0
+        self.decreases = 0
+        self._in_flight = 0
+        self._waiters = deque()
+        self._last_decrease = 0.0
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    def _wake(self):
+        free = int(self.limit) - self._in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    async def acquire(self):
+        while self._in_flight >= int(self.limit):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # we were woken but will not use the slot; pass it on
+                    self._wake()
+                raise
+        self._in_flight += 1
+
+    def release(self):
+        self._in_flight -= 1
+        self._wake()
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+    def set_limit(self, limit):
+        self.limit = float(min(max(limit, self.min_limit), self.max_limit))
+        self._wake()
+
+    def baseline_latency(self):
+        """Fastest recent latency of any page type, or None before any response."""
+        return min((min(latencies) for latencies in self.latencies.values()), default=None)
+
+    def record_success(self, latency, page_type=None):
+        """Grow the limit by about one slot per limit's worth of healthy responses."""
+        self.outcomes.append(True)
+        latencies = self.latencies[page_type]
+        latencies.append(latency)
+
+        healthy_latency = latency <= min(latencies) * self.latency_tolerance
+        if healthy_latency and self.error_rate() <= self.max_error_rate:
+            if self.limit < self.max_limit:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+                self.increases += 1
+                self._wake()
+
+    def record_overload(self):
+        """Cut the limit after a 429/5xx response or a timeout."""
+        self.outcomes.append(False)
+        now = time.monotonic()
+        # failures from requests already in flight describe the same overload;
+        # only cut once per (baseline) round trip
+        cooldown = self.baseline_latency() or 1.0
+        if now - self._last_decrease < cooldown:
+            return
+        self._last_decrease = now
+        self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+        self.decreases += 1
+
+    def record_error(self):
+        """Count a non-overload failure towards the error rate only."""
+        self.outcomes.append(False)
+
+    def error_rate(self):
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+
+class ConcurrencyStore:
+    """JSON file of converged in-flight limits keyed by host."""
+
+    def __init__(self, path=None):
+        self.path = path or get_cache_dir() / "concurrency.json"
+        self.limits = {}
+        self._loaded = False
+
+    def load(self):
+        if self._loaded:
+            return self.limits
+        self._loaded = True
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self.limits = json.load(f)
+        except FileNotFoundError:
+            self.limits = {}
+        except (OSError, ValueError) as e:
+            logging.warning(f"Could not read concurrency limits from {self.path}: {e}")
+            self.limits = {}
+        return self.limits
+
+    def get(self, host, default=None):
+        return self.load().get(host, default)
+
+    def set(self, host, limit):
+        self.load()[host] = round(limit, 2)
+
+    def save(self):
+        if not self._loaded:
+            return
+        try:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(self.limits, f, indent=2, sort_keys=True)
+        except OSError as e:
+            logging.warning(f"Could not save concurrency limits to {self.path}: {e}")
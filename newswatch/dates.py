@@ -0,0 +1,269 @@
+"""
+Fast publish-date parsing for newswatch.
+
+dateparser reads every date format the news sites use, but each call costs
+milliseconds: it detects the language, tries its whole list of formats and
+handles relative dates. Every source prints its dates in one or two fixed
+formats, so DateParser learns them instead. When dateparser parses a date,
+DateParser splits the string into tokens (numbers, Indonesian or English
+month and day names) and looks for the field order (day-month-year,
+year-month-day or month-day-year, then hour, minute and second) that turns
+those tokens into the same datetime. It remembers that order for the
+source, the arguments passed to dateparser (locales, settings) and the shape
+of the tokens. Later dates of the same shape are built straight from their
+tokens, and dateparser is only called for shapes it has not seen, strings
+with other words in them ("2 jam yang lalu") and dates that do not fit the
+learned order.
+
+The orders are learned from dateparser's own answers, so the fast path
+returns what dateparser would have returned, with one exception it avoids.
+An all-numeric day and month ("12/08/2024") is read day-first or
+month-first by the language dateparser detects. Without a locale that is
+month-first, but a day name ("Senin") switches it to day-first, and the
+shape does not show which. Such shapes are only learned when the arguments
+fix the order: a single locale or language, or settings["DATE_ORDER"].
+Otherwise they always go through dateparser.
+
+The learned formats are kept for the process; DateStats counts, per source
+and run (see newswatch.stats), the fast and slow parses.
+"""
+
+import logging
+import re
+from collections import defaultdict
+from datetime import datetime
+
+import dateparser
+
+from .stats import SourceCounts, current_stats
+
+MONTHS = {
+    "januari": 1, "january": 1, "jan": 1,
+    "februari": 2, "february": 2, "feb": 2, "peb": 2,
+    "maret": 3, "march": 3, "mar": 3,
+    "april": 4, "apr": 4,
+    "mei": 5, "may": 5,
+    "juni": 6, "june": 6, "jun": 6,
+    "juli": 7, "july": 7, "jul": 7,
+    "agustus": 8, "august": 8, "agu": 8, "agt": 8, "ags": 8, "aug": 8,
+    "september": 9, "sept": 9, "sep": 9,
+    "oktober": 10, "october": 10, "okt": 10, "oct": 10,
+    "november": 11, "nov": 11, "nop": 11,
+    "desember": 12, "december": 12, "des": 12, "dec": 12,
+}
+
+DAY_NAMES = {
+    "senin", "selasa", "rabu", "kamis", "jumat", "sabtu", "minggu", "ahad",
+    "monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday",
+    "mon", "tue", "wed", "thu", "fri", "sat", "sun",
+}
+
+# words that do not change the clock time dateparser returns: time zones
+# (parse_date drops the zone and keeps the local time), the ISO "T" and "pukul"
+NOISE_WORDS = {"wib", "wita", "wit", "utc", "gmt", "z", "t", "pukul"}
+
+DATE_ORDERS = (("day", "month", "year"), ("year", "month", "day"), ("month", "day", "year"))
+# a shape both of these read has a numeric day and month dateparser may swap
+DAY_MONTH_ORDERS = {("day", "month", "year"), ("month", "day", "year")}
+TIME_FIELDS = ("hour", "minute", "second")
+
+_TOKEN = re.compile(r"\d+|[^\W\d_]+")
+
+
+def tokenize(date_string):
+    """
+    Split a date string into values and their shape.
+
+    Args:
+        date_string (str): Date as printed on the page
+
+    Returns:
+        tuple: (values, shape), or None if the string has words other than
+        month names, day names and NOISE_WORDS. Month names become their
+        number; shape has one kind per token: "n" (1-2 digits), "y"
+        (4 digits), "d" (other numbers), "mon" (month name) or "dow" (day
+        name, which has no value).
+    """
+    values = []
+    shape = []
+    for token in _TOKEN.findall(date_string.lower().replace("'", "")):
+        if token.isdigit():
+            values.append(int(token))
+            shape.append("n" if len(token) <= 2 else "y" if len(token) == 4 else "d")
+        elif token in MONTHS:
+            values.append(MONTHS[token])
+            shape.append("mon")
+        elif token in DAY_NAMES:
+            shape.append("dow")
+        elif token not in NOISE_WORDS:
+            return None
+    return values, tuple(shape)
+
+
+def _kinds(shape):
+    return [kind for kind in shape if kind != "dow"]
+
+
+def _fits(order, kinds):
+    for name, kind in zip(order, kinds):
+        if name == "year" and kind != "y":
+            return False
+        if name == "month" and kind not in ("n", "mon"):
+            return False
+        if name in ("day", "hour", "minute", "second") and kind != "n":
+            return False
+    return True
+
+
+def candidate_orders(shape):
+    """Field orders that could read a shape; None marks a token that is ignored."""
+    kinds = _kinds(shape)
+    orders = []
+    for date_order in DATE_ORDERS:
+        for time_fields in range(len(TIME_FIELDS) + 1):
+            used = len(date_order) + time_fields
+            if used > len(kinds):
+                break
+            order = date_order + TIME_FIELDS[:time_fields] + (None,) * (len(kinds) - used)
+            if _fits(order, kinds):
+                orders.append(order)
+    return orders
+
+
+def fixes_date_order(kwargs):
+    """Whether dateparser arguments decide between day-first and month-first."""
+    if (kwargs.get("settings") or {}).get("DATE_ORDER"):
+        return True
+    return any(len(kwargs.get(name) or ()) == 1 for name in ("locales", "languages"))
+
+
+def build(order, values):
+    """Build a datetime from token values read in `order`; ValueError if invalid."""
+    fields = {name: value for name, value in zip(order, values) if name is not None}
+    return datetime(
+        fields["year"], fields["month"], fields["day"],
+        fields.get("hour", 0), fields.get("minute", 0), fields.get("second", 0),
+    )
+
+
+class DateParser:
+    """Per-source learned date formats in front of dateparser."""
+
+    def __init__(self):
+        # (source, dateparser arguments) -> token shape -> field order
+        self.formats = defaultdict(dict)
+
+    def parse(self, date_string, source=None, **kwargs):
+        """
+        Parse a publish date.
+
+        Args:
+            date_string (str): Date as printed on the page
+            source (str, optional): Source the date comes from; formats are
+                learned per source
+            **kwargs: Passed to dateparser.parse on the slow path
+
+        Returns:
+            datetime or None: Naive datetime in the page's local time, or
+            None if the string is not a date
+        """
+        counts = current_stats().dates.counts[source]
+        if not date_string:
+            counts["failed"] += 1
+            return None
+
+        # the same string can read differently under other locales or settings
+        formats = self.formats[source, repr(sorted(kwargs.items()))]
+        tokens = tokenize(date_string)
+        if tokens is not None:
+            values, shape = tokens
+            order = formats.get(shape)
+            if order is not None:
+                try:
+                    parsed_date = build(order, values)
+                except ValueError:
+                    pass  # does not fit the learned order, e.g. a 13th month
+                else:
+                    counts["fast"] += 1
+                    return parsed_date
+
+        counts["slow"] += 1
+        parsed_date = dateparser.parse(date_string, **kwargs)
+        if not parsed_date:
+            counts["failed"] += 1
+            return None
+        parsed_date = parsed_date.replace(tzinfo=None)
+        if tokens is not None and shape not in formats:
+            self._learn(formats, values, shape, parsed_date, counts, fixes_date_order(kwargs))
+        return parsed_date
+
+    def _learn(self, formats, values, shape, parsed_date, counts, order_fixed):
+        orders = candidate_orders(shape)
+        if not order_fixed and DAY_MONTH_ORDERS <= {order[:3] for order in orders}:
+            # day/month or month/day, depending on the language dateparser detects
+            counts["ambiguous"] += 1
+            return
+        matches = []
+        for order in orders:
+            try:
+                if build(order, values) == parsed_date:
+                    matches.append(order)
+            except ValueError:
+                continue
+        if not matches:
+            return
+        if len({order[:3] for order in matches}) > 1:
+            # e.g. 05/05/2024: wait for a date that tells day and month apart
+            counts["ambiguous"] += 1
+            return
+        # the order reading the most time fields, so seconds are kept
+        formats[shape] = max(matches, key=lambda order: sum(1 for name in order if name))
+        counts["learned"] += 1
+
+
+class DateStats(SourceCounts):
+    """Per-source counts of DateParser's fast, slow, learned, ambiguous and failed parses."""
+
+    def stats(self):
+        """
+        Get date parsing statistics.
+
+        Returns:
+            dict: Per source, the fast (learned format) and slow (dateparser)
+            parses, the fast-path hit rate, formats learned, dates too
+            ambiguous to learn from and strings that were not dates
+        """
+        stats = {}
+        for source, counts in self.sources():
+            parsed = counts["fast"] + counts["slow"]
+            stats[source] = {
+                "fast": counts["fast"],
+                "slow": counts["slow"],
+                "hit_rate": round(counts["fast"] / parsed, 3) if parsed else 0.0,
+                "learned": counts["learned"],
+                "ambiguous": counts["ambiguous"],
+                "failed": counts["failed"],
+            }
+        return stats
+
+    def log_summary(self):
+        stats = self.stats()
+        if not stats:
+            return
+        fast = sum(source["fast"] for source in stats.values())
+        slow = sum(source["slow"] for source in stats.values())
+        logging.info(
+            f"Date parsing: {fast}/{fast + slow} from learned formats, "
+            f"{slow} through dateparser"
+        )
+        for source, source_stats in stats.items():
+            logging.info(
+                f"  {source}: {source_stats['hit_rate']:.0%} fast "
+                f"({source_stats['fast']} fast, {source_stats['slow']} slow, "
+                f"{source_stats['learned']} formats learned, {source_stats['failed']} failed)"
+            )
+
+
+# formats shared by every scraper of the process; parse pool workers learn
+# their own
+date_parser = DateParser()
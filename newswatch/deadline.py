@@ -0,0 +1,116 @@
+"""
+Run-wide deadline for newswatch.
+
+A scraping run has a fixed time budget, enforced by a hard timeout that
+cancels whatever is still running. The run also sets a Deadline, a little
+before that timeout, in a context variable every fetch reads: request
+timeouts shrink to the remaining budget, requests that cannot finish are not
+started and retries that would end past the deadline are not scheduled.
+Scrapers then wind down on their own, keeping the articles they already
+queued, instead of being cancelled mid-request.
+"""
+
+import contextvars
+import logging
+import time
+from contextlib import contextmanager
+
+# shortest request worth starting before the deadline
+MIN_ATTEMPT_SECONDS = 2.0
+
+# how long before the hard timeout the deadline falls (at most a tenth of
+# the budget), leaving scrapers time to finish the pages they are on
+DEFAULT_GRACE = 10.0
+
+
+class Deadline:
+    """Time budget shared by every request of a run."""
+
+    def __init__(self, timeout, grace=DEFAULT_GRACE):
+        """
+        Initialize Deadline.
+
+        Args:
+            timeout (float): Seconds until the run's hard timeout
+            grace (float): Seconds before the hard timeout the deadline falls
+        """
+        self.timeout = timeout
+        self.seconds = max(0.0, timeout - min(grace, timeout / 10))
+        self.expires_at = time.monotonic() + self.seconds
+        self.skipped = 0
+        self.retries_dropped = 0
+        self.timeouts_shortened = 0
+
+    def remaining(self):
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self):
+        """True once there is no time left for another request."""
+        return self.remaining() < MIN_ATTEMPT_SECONDS
+
+    def timeout_for(self, timeout):
+        """
+        Clamp a request timeout to the remaining budget.
+
+        Args:
+            timeout (float): The request's own timeout in seconds
+
+        Returns:
+            tuple: (timeout to use, whether it was shortened)
+        """
+        remaining = self.remaining()
+        if timeout <= remaining:
+            return timeout, False
+        self.timeouts_shortened += 1
+        return remaining, True
+
+    def allows_retry(self, wait_time):
+        """True if a retry after `wait_time` seconds can still finish in time."""
+        return self.remaining() - wait_time >= MIN_ATTEMPT_SECONDS
+
+    def stats(self):
+        """
+        Get deadline statistics for the run.
+
+        Returns:
+            dict: The budget, time left, and requests skipped or cut short,
+            retries dropped and timeouts shortened because of it
+        """
+        return {
+            "seconds": self.seconds,
+            "remaining": round(self.remaining(), 1),
+            "skipped": self.skipped,
+            "retries_dropped": self.retries_dropped,
+            "timeouts_shortened": self.timeouts_shortened,
+        }
+
+    def log_summary(self):
+        if self.skipped or self.retries_dropped or self.timeouts_shortened:
+            logging.info(
+                f"Run deadline ({self.seconds:.0f}s): {self.skipped} requests skipped or cut short, "
+                f"{self.retries_dropped} retries dropped, "
+                f"{self.timeouts_shortened} timeouts shortened"
+            )
+
+
+current_deadline = contextvars.ContextVar("deadline", default=None)
+
+
+@contextmanager
+def deadline_scope(timeout, grace=DEFAULT_GRACE):
+    """
+    Set the run deadline for tasks created inside the block.
+
+    Args:
+        timeout (float): Seconds until the run's hard timeout
+        grace (float): Seconds before the hard timeout the deadline falls
+
+    Yields:
+        Deadline: The deadline fetches will read
+    """
+    deadline = Deadline(timeout, grace)
+    token = current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        current_deadline.reset(token)
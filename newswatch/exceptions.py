@@ -21,6 +21,21 @@ class NetworkError(ScraperError):
     pass
 
 
+class HTTPStatusError(NetworkError):
+    """Exception raised when a server answers with an HTTP error status."""
+    
+    def __init__(self, message, status=None):
+        """
+        Initialize HTTPStatusError.
+        
+        Args:
+            message (str): Error message
+            status (int, optional): HTTP status code of the response
+        """
+        super().__init__(message)
+        self.status = status
+
+
 class ParseError(ScraperError):
     """Exception raised when parsing website content fails."""
     pass
@@ -29,16 +44,44 @@ class ParseError(ScraperError):
 class RateLimitError(ScraperError):
     """Exception raised when rate limiting is encountered."""
     
-    def __init__(self, message, retry_after=None):
+    def __init__(self, message, retry_after=None, status=None):
         """
         Initialize RateLimitError.
         
         Args:
             message (str): Error message
             retry_after (int, optional): Seconds to wait before retrying
+            status (int, optional): HTTP status code of the response (429, or
+                a 5xx that carried Retry-After)
         """
         super().__init__(message)
         self.retry_after = retry_after
+        self.status = status
+
+
+class ContentRejectedError(ScraperError):
+    """Exception raised when a response is not a page the scrapers can parse."""
+    pass
+
+
+class CircuitOpenError(NetworkError):
+    """Exception raised when a request is short-circuited by an open circuit breaker."""
+    
+    def __init__(self, message, host=None):
+        """
+        Initialize CircuitOpenError.
+        
+        Args:
+            message (str): Error message
+            host (str, optional): Host whose circuit is open
+        """
+        super().__init__(message)
+        self.host = host
+
+
+class DeadlineExceededError(ScraperError):
+    """Exception raised when a request cannot finish before the run deadline."""
+    pass
 
 
 class ValidationError(NewsWatchError):
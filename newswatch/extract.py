@@ -0,0 +1,486 @@
+"""
+Declarative article extraction for newswatch.
+
+A scraper describes where an article's fields are on its pages with an
+extraction spec, a dict keyed by field:
+
+    Extractor({
+        "title": ".read__title",
+        "author": {"select": [".credit-title-name", ".author"], "default": ""},
+        "publish_date": {"select": ".read__time", "pattern": r"- (.+)"},
+        "category": {"select": ".breadcrumb__wrap", "separator": "/"},
+        "content": {
+            "select": ".read__content",
+            "remove": ["script", ".baca-juga"],
+            "drop_phrases": [r"Baca juga:"],
+            "phrase_tags": ["p"],
+            "separator": " ",
+        },
+        "date_locales": ["id"],
+    })
+
+A field is a CSS selector, a list of them, or a dict with:
+
+    select        selector, or list of selectors tried in order (fallbacks)
+    index         which match to use, e.g. -1 for the last; clamped to the
+                  matches found
+    attr          take this attribute instead of the text, falling back to
+                  the text when the element does not have it
+    separator     get_text separator (default "")
+    strip         strip whitespace from the text (default True)
+    pattern       regex searched in the value; group 1 (or the whole match)
+                  becomes the value, no match means the field is missing
+    scrub         regex whose matches are deleted from the value
+    default       value when the field is missing; without one a missing
+                  field raises ParseError
+    remove        selectors of elements deleted before the text is taken
+    drop_phrases  regexes (case-insensitive); elements whose text matches are
+                  deleted: the `phrase_tags` elements when given, otherwise
+                  the parent of each matching text node
+    paragraphs    selector; the value is the non-empty texts of these
+                  elements joined by spaces, skipping those matching
+                  drop_phrases
+
+The first selector giving a non-empty value wins; with a source, the
+selectors of a list are tried in the order newswatch.fallbacks learns for
+it, the one that wins most often first. Fields are extracted in
+the order title, author, publish_date, category, content, so `remove` on
+the content does not affect the others.
+
+Every selector and pattern is compiled once, when the scraper class is
+defined. Selectors run through soupsieve, which works on the tree of any
+BeautifulSoup parser backend.
+
+The removal options (remove, drop_phrases, phrase_tags, paragraphs) are
+applied by a Cleaner, which visits each node of the element once, skipping
+removed elements and dropping phrase matches as it collects the text,
+instead of a find_all pass per rule followed by get_text. It does not change
+the tree. Hand-written scrapers use Cleaner directly for their content.
+Selectors made of tag names, classes, attribute tests and :is() lists are
+matched in Python during the walk; others run through soupsieve once per
+element, before it.
+"""
+
+import re
+
+import soupsieve
+from bs4 import NavigableString, Tag
+
+from .exceptions import ParseError
+from .fallbacks import selector_cache
+
+FIELDS = ("title", "author", "publish_date", "category", "content")
+
+FIELD_OPTIONS = {
+    "select", "index", "attr", "separator", "strip", "pattern", "scrub", "default",
+    "remove", "drop_phrases", "phrase_tags", "paragraphs",
+}
+
+_MISSING = object()
+
+
+def class_prefix(prefix, tags="*"):
+    """
+    Selector for elements with a class starting with `prefix`.
+
+    Args:
+        prefix (str): Class prefix, e.g. "inject-" for "inject-baca-juga-2"
+        tags (str): Comma-separated tag names the elements may have
+
+    Returns:
+        str: CSS selector
+    """
+    return f':is({tags}):is([class^="{prefix}"], [class*=" {prefix}"])'
+
+
+_TYPE_SELECTOR = re.compile(r"\*|[a-zA-Z][\w-]*")
+_CLASS_SELECTOR = re.compile(r"\.([\w-]+)")
+_ATTRIBUTE_SELECTOR = re.compile(
+    r"""\[\s*([\w-]+)\s*(?:([~|^$*]?=)\s*(?:"([^"]*)"|'([^']*)'|([^\]\s"']+))\s*)?\]"""
+)
+_ATTRIBUTE_TESTS = {
+    None: lambda value, expected: True,
+    "=": lambda value, expected: value == expected,
+    "~=": lambda value, expected: expected in value.split(),
+    "|=": lambda value, expected: value == expected or value.startswith(expected + "-"),
+    "^=": lambda value, expected: bool(expected) and value.startswith(expected),
+    "$=": lambda value, expected: bool(expected) and value.endswith(expected),
+    "*=": lambda value, expected: bool(expected) and expected in value,
+}
+
+
+def _split_selector_list(selectors):
+    parts = []
+    depth = start = 0
+    for position, char in enumerate(selectors):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(selectors[start:position].strip())
+            start = position + 1
+    parts.append(selectors[start:].strip())
+    return parts
+
+
+def _compile_compound(selector):
+    # test function for a compound selector (no combinators), or None if it
+    # uses anything but a tag name, classes, attribute tests and :is()
+    name = None
+    classes = []
+    attributes = []
+    groups = []
+    position = 0
+    match = _TYPE_SELECTOR.match(selector)
+    if match:
+        name = None if match.group() == "*" else match.group().lower()
+        position = match.end()
+    while position < len(selector):
+        if selector.startswith(":is(", position):
+            depth = 0
+            for end in range(position + 3, len(selector)):
+                depth += {"(": 1, ")": -1}.get(selector[end], 0)
+                if depth == 0:
+                    break
+            else:
+                return None
+            group = _compile_selector_list(selector[position + 4:end])
+            if group is None:
+                return None
+            groups.append(group)
+            position = end + 1
+        elif match := _CLASS_SELECTOR.match(selector, position):
+            classes.append(match.group(1))
+            position = match.end()
+        elif match := _ATTRIBUTE_SELECTOR.match(selector, position):
+            attribute, operator, double, single, bare = match.groups()
+            expected = double or single or bare or ""
+            attributes.append((attribute.lower(), _ATTRIBUTE_TESTS[operator], expected))
+            position = match.end()
+        else:
+            return None
+    if not selector:
+        return None
+
+    def test(tag):
+        if name is not None and tag.name != name:
+            return False
+        if classes:
+            tag_classes = tag.get("class") or ()
+            for class_name in classes:
+                if class_name not in tag_classes:
+                    return False
+        for attribute, attribute_test, expected in attributes:
+            value = tag.get(attribute)
+            if value is None:
+                return False
+            if not isinstance(value, str):
+                value = " ".join(value)
+            if not attribute_test(value, expected):
+                return False
+        for group in groups:
+            if not group(tag):
+                return False
+        return True
+
+    return test
+
+
+def _compile_selector_list(selectors):
+    tests = [_compile_compound(part) for part in _split_selector_list(selectors)]
+    if None in tests:
+        return None
+    if len(tests) == 1:
+        return tests[0]
+    return lambda tag: any(test(tag) for test in tests)
+
+
+class _Selector:
+    """Selectors matched against the elements of a Cleaner walk."""
+
+    def __init__(self, selectors):
+        if isinstance(selectors, str):
+            selectors = [selectors]
+        # the whole list through soupsieve, for select()
+        self.pattern = soupsieve.compile(", ".join(selectors))
+        self.names = set()
+        self.tests = []
+        slow = []
+        for part in (part for selector in selectors for part in _split_selector_list(selector)):
+            if _TYPE_SELECTOR.fullmatch(part) and part != "*":
+                self.names.add(part.lower())
+                continue
+            test = _compile_compound(part)
+            if test is None:
+                slow.append(part)
+            else:
+                self.tests.append(test)
+        self.slow = soupsieve.compile(", ".join(slow)) if slow else None
+
+    def matcher(self, element):
+        """Test function for the descendants of `element`."""
+        names = self.names
+        tests = self.tests
+        selected = {id(tag) for tag in self.slow.select(element)} if self.slow is not None else ()
+
+        def matches(tag):
+            if tag.name in names or id(tag) in selected:
+                return True
+            for test in tests:
+                if test(tag):
+                    return True
+            return False
+
+        return matches
+
+
+class Cleaner:
+    """Removal rules for an element's text, applied in one walk over it."""
+
+    def __init__(
+        self, remove=None, drop_phrases=None, phrase_tags=None, paragraphs=None,
+        separator="", strip=True,
+    ):
+        """
+        Initialize Cleaner.
+
+        Args:
+            remove (list, optional): Selectors of elements left out
+            drop_phrases (list, optional): Regexes (case-insensitive); the
+                elements whose text matches are left out: the `phrase_tags`
+                elements when given, otherwise the parent of each matching
+                text node. With `paragraphs`, matching paragraphs are skipped
+            phrase_tags (list, optional): Tag names drop_phrases applies to
+            paragraphs (str, optional): Selector; the text is the non-empty
+                stripped texts of these elements joined by spaces
+            separator (str): Separator between text nodes, as in get_text
+            strip (bool): Strip each text node and skip empty ones, as in
+                get_text
+        """
+        self.remove = _Selector(remove) if remove else None
+        self.drop_phrases = (
+            re.compile("|".join(drop_phrases), re.IGNORECASE) if drop_phrases else None
+        )
+        self.phrase_tags = set(phrase_tags) if phrase_tags and self.drop_phrases else None
+        self.paragraphs = _Selector(paragraphs) if paragraphs else None
+        self.separator = separator
+        # paragraph texts are always taken stripped
+        self.strip = strip or self.paragraphs is not None
+        # drop_phrases tested on every text node (any kind, comments too)
+        self.string_phrases = (
+            self.drop_phrases if self.phrase_tags is None and self.paragraphs is None else None
+        )
+
+    def text(self, element):
+        """
+        Get an element's text without what the rules remove.
+
+        Gives what get_text(separator, strip) returns after deleting the
+        removed elements, but leaves the tree as it is.
+
+        Args:
+            element (Tag): Element to take the text of
+
+        Returns:
+            str: Cleaned text
+        """
+        types = element.interesting_string_types or Tag.MAIN_CONTENT_STRING_TYPES
+        if isinstance(types, type):
+            types = {types}
+        pieces = []
+        # raw text of each phrase tag, for testing drop_phrases on it
+        raw = [] if self.phrase_tags is not None else None
+        paragraphs = [] if self.paragraphs is not None else None
+        removed = self.remove.matcher(element) if self.remove is not None else None
+        paragraph = self.paragraphs.matcher(element) if self.paragraphs is not None else None
+        self._walk(element, types, removed, paragraph, pieces, raw, paragraphs)
+        if paragraphs is not None:
+            return " ".join(text for text in paragraphs if text)
+        return self.separator.join(pieces)
+
+    def _walk(self, tag, types, removed, paragraph, pieces, raw, paragraphs):
+        # appends the text of tag's children to pieces (and raw); returns
+        # True when one of its own text nodes matches string_phrases, so the
+        # caller drops the whole tag
+        dropped = False
+        for child in tag.contents:
+            if isinstance(child, NavigableString):
+                if self.string_phrases is not None and self.string_phrases.search(child):
+                    dropped = True
+                if type(child) not in types:
+                    continue
+                if raw is not None:
+                    raw.append(child)
+                if self.strip:
+                    child = child.strip()
+                    if not child:
+                        continue
+                pieces.append(child)
+                continue
+
+            if removed is not None and removed(child):
+                continue
+            start = len(pieces)
+            slot = None
+            if paragraph is not None and paragraph(child):
+                slot = len(paragraphs)
+                paragraphs.append("")
+            raw_start = len(raw) if raw is not None else 0
+
+            if self._walk(child, types, removed, paragraph, pieces, raw, paragraphs):
+                del pieces[start:]
+            elif (
+                raw is not None
+                and child.name in self.phrase_tags
+                and self.drop_phrases.search("".join(raw[raw_start:]))
+            ):
+                del pieces[start:]
+
+            if slot is not None:
+                text = "".join(pieces[start:])
+                if not (self.drop_phrases and self.drop_phrases.search(text)):
+                    paragraphs[slot] = text
+        return dropped
+
+
+class FieldExtractor:
+    """One field of an extraction spec, compiled."""
+
+    def __init__(self, name, spec):
+        """
+        Initialize FieldExtractor.
+
+        Args:
+            name (str): Field name
+            spec (str, list or dict): Selector(s), or field options (see
+                module docstring)
+        """
+        if not isinstance(spec, dict):
+            spec = {"select": spec}
+        unknown = set(spec) - FIELD_OPTIONS
+        if unknown:
+            raise ValueError(f"Unknown options for field {name!r}: {', '.join(sorted(unknown))}")
+
+        self.name = name
+        selectors = spec["select"]
+        if isinstance(selectors, str):
+            selectors = [selectors]
+        self.selectors = [soupsieve.compile(selector) for selector in selectors]
+        self.index = spec.get("index", 0)
+        self.attr = spec.get("attr")
+        self.separator = spec.get("separator", "")
+        self.strip = spec.get("strip", True)
+        self.pattern = re.compile(spec["pattern"]) if "pattern" in spec else None
+        self.scrub = re.compile(spec["scrub"]) if "scrub" in spec else None
+        self.default = spec.get("default", _MISSING)
+        self.cleaner = Cleaner(
+            remove=spec.get("remove"),
+            drop_phrases=spec.get("drop_phrases"),
+            phrase_tags=spec.get("phrase_tags"),
+            paragraphs=spec.get("paragraphs"),
+            separator=self.separator,
+            strip=self.strip,
+        )
+
+    def _element(self, soup, selector):
+        if self.index == 0:
+            return selector.select_one(soup)
+        matches = selector.select(soup)
+        if not matches:
+            return None
+        return matches[max(-len(matches), min(self.index, len(matches) - 1))]
+
+    def _text(self, element):
+        if self.attr is not None and self.cleaner.paragraphs is None and element.get(self.attr):
+            return element[self.attr]
+        return self.cleaner.text(element)
+
+    def _value(self, text):
+        if self.pattern is not None:
+            match = self.pattern.search(text)
+            if match is None:
+                return ""
+            text = match.group(1) if self.pattern.groups else match.group(0)
+        if self.scrub is not None:
+            text = self.scrub.sub("", text)
+        return text.strip() if self.strip else text
+
+    def _select(self, soup, selector):
+        element = self._element(soup, selector)
+        if element is None:
+            return ""
+        return self._value(self._text(element))
+
+    def extract(self, soup, source=None):
+        """
+        Extract the field from a parsed page.
+
+        Args:
+            soup (BeautifulSoup): Parsed page
+            source (str, optional): Scraper the page belongs to; with one,
+                a selector list is tried in the order learned for it
+
+        Returns:
+            str: Field value
+
+        Raises:
+            ParseError: If no selector gives a value and there is no default
+        """
+        if source is not None and len(self.selectors) > 1:
+            value = selector_cache.first(
+                source, self.name, self.selectors, lambda selector: self._select(soup, selector)
+            )
+            if value:
+                return value
+        else:
+            for selector in self.selectors:
+                value = self._select(soup, selector)
+                if value:
+                    return value
+        if self.default is _MISSING:
+            raise ParseError(f"{self.name} not found")
+        return self.default
+
+
+class Extractor:
+    """Compiled extraction spec of a scraper, shared by all its pages."""
+
+    def __init__(self, spec):
+        """
+        Initialize Extractor.
+
+        Args:
+            spec (dict): Extraction spec (see module docstring)
+        """
+        unknown = set(spec) - set(FIELDS) - {"date_locales"}
+        if unknown:
+            raise ValueError(f"Unknown fields in extraction spec: {', '.join(sorted(unknown))}")
+        missing = [name for name in FIELDS if name not in spec]
+        if missing:
+            raise ValueError(f"Extraction spec is missing fields: {', '.join(missing)}")
+
+        self.fields = [FieldExtractor(name, spec[name]) for name in FIELDS]
+        # keyword arguments for BaseScraper.parse_date
+        self.date_kwargs = {"locales": spec["date_locales"]} if "date_locales" in spec else {}
+
+    def extract(self, soup, fields=FIELDS, source=None):
+        """
+        Extract fields from a parsed article page.
+
+        Args:
+            soup (BeautifulSoup): Parsed article page
+            fields (iterable): Names of the fields to extract; all by default
+            source (str, optional): Scraper the page belongs to, for the
+                order of selector lists (see newswatch.fallbacks)
+
+        Returns:
+            dict: title, author, publish_date (unparsed), category and
+            content, or those of them asked for
+
+        Raises:
+            ParseError: If a field without a default is missing
+        """
+        return {
+            field.name: field.extract(soup, source) for field in self.fields if field.name in fields
+        }
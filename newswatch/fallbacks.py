@@ -0,0 +1,140 @@
+"""
+Adaptive fallback chains for newswatch.
+
+Scrapers that handle several page layouts try a list of selectors in order
+and use the first that matches (the selector lists of an extraction spec,
+kepriantaranews' search result selectors). On any one site nearly every
+page has the same layout, so the selector that matched last time will match
+again, and the ones declared before it are tried and miss on every page.
+
+SelectorCache remembers, per scraper and chain, how often each candidate
+won, and tries them in that order: the most frequent winner first, ties in
+declared order. A site whose pages all match the first declared selector
+sees no change. A page that several candidates match gets the one that wins
+most often on its site rather than the first declared; chains list
+alternative layouts, so that is normally the same element.
+
+The learned orders are kept for the process; SelectorStats counts, per
+source and run (see newswatch.stats), the first-try hits and the
+candidates tried.
+"""
+
+import logging
+from collections import Counter, defaultdict
+
+from .stats import SourceCounts, current_stats
+
+
+class SelectorCache:
+    """Per-source order of fallback candidates, learned from their wins."""
+
+    def __init__(self, adaptive=True):
+        """
+        Initialize SelectorCache.
+
+        Args:
+            adaptive (bool): Reorder chains by their wins; False always tries
+                the declared order (the counts are still kept)
+        """
+        self.adaptive = adaptive
+        # (source, chain) -> candidate indices in the order they are tried
+        self.orders = {}
+        # (source, chain) -> Counter of wins per candidate index
+        self.wins = defaultdict(Counter)
+
+    def first(self, source, chain, candidates, attempt):
+        """
+        Try a chain's candidates until one gives a value.
+
+        Args:
+            source (str): Scraper the chain belongs to
+            chain (str): Name of the chain within the scraper, e.g. "title"
+            candidates (list): Selectors (or whatever `attempt` takes), in
+                declared order; the same list on every call
+            attempt (callable): Returns the value for a candidate, empty when
+                it does not match
+
+        Returns:
+            The first non-empty value, or None if no candidate gives one
+        """
+        key = (source, chain)
+        order = self.orders.get(key)
+        if order is None or len(order) != len(candidates):
+            order = self.orders[key] = list(range(len(candidates)))
+        if not self.adaptive:
+            order = range(len(candidates))
+
+        counts = current_stats().selectors.counts[source]
+        for tries, index in enumerate(order, 1):
+            value = attempt(candidates[index])
+            if value:
+                counts["hits" if tries == 1 else "misses"] += 1
+                counts["tried"] += tries
+                counts["declared"] += index + 1
+                self._won(key, index)
+                return value
+        counts["failed"] += 1
+        counts["tried"] += len(candidates)
+        counts["declared"] += len(candidates)
+        return None
+
+    def _won(self, key, index):
+        wins = self.wins[key]
+        wins[index] += 1
+        order = self.orders[key]
+        position = order.index(index)
+        # move ahead of the candidates with fewer wins
+        while position > 0 and wins[order[position - 1]] < wins[index]:
+            order[position] = order[position - 1]
+            position -= 1
+        order[position] = index
+
+
+class SelectorStats(SourceCounts):
+    """
+    Per-source counts of SelectorCache: first-try hits, misses (won by a
+    later candidate), failures (none won), candidates tried, and candidates
+    the declared order would have tried.
+    """
+
+    def stats(self):
+        """
+        Get fallback chain statistics.
+
+        Returns:
+            dict: Per source, chains resolved by the first candidate tried
+            (hits), by a later one (misses) or by none (failed), the hit
+            rate, and the candidates tried against those the declared order
+            would have tried
+        """
+        stats = {}
+        for source, counts in self.sources():
+            resolved = counts["hits"] + counts["misses"]
+            stats[source] = {
+                "hits": counts["hits"],
+                "misses": counts["misses"],
+                "failed": counts["failed"],
+                "hit_rate": round(counts["hits"] / resolved, 3) if resolved else 0.0,
+                "tried": counts["tried"],
+                "declared": counts["declared"],
+            }
+        return stats
+
+    def log_summary(self):
+        stats = self.stats()
+        if not stats:
+            return
+        tried = sum(source["tried"] for source in stats.values())
+        declared = sum(source["declared"] for source in stats.values())
+        logging.info(f"Fallback chains: {tried} selectors tried, {declared} in declared order")
+        for source, source_stats in stats.items():
+            logging.info(
+                f"  {source}: {source_stats['hit_rate']:.0%} first-try hits "
+                f"({source_stats['misses']} misses, {source_stats['failed']} failed, "
+                f"{source_stats['tried']} tried vs {source_stats['declared']})"
+            )
+
+
+# orders shared by every scraper of the process; parse pool workers learn
+# their own
+selector_cache = SelectorCache()
@@ -0,0 +1,192 @@
+"""
+Keyword relevance matching for newswatch.
+
+Site searches return articles that only mention a keyword in a tag, a
+related-article box or not at all. queue_article checks every article
+against the run's keywords and drops those whose text does not contain the
+keyword they were found for.
+
+KeywordMatcher finds all keywords in one pass over the text, the way an
+Aho-Corasick automaton does: the keywords are merged into a trie, compiled
+to a single regular expression whose alternatives follow the trie's
+branches, so each position of the text is tried against every keyword at
+once, in C. A lookahead makes the matches overlap, and every keyword that is
+a prefix of the longest one matched at a position is counted there too, so
+"bank" and "bank indonesia" both count in "bank indonesia". Matching is
+case-insensitive, and a space in a keyword matches any run of whitespace.
+
+For a handful of keywords, the usual case, a substring search per keyword
+is faster than the one pass, so below SUBSTRING_SEARCH_LIMIT keywords the
+matcher searches for each keyword on its own instead, with the same results.
+Every keyword an accepted article mentions is kept on its row with its hit
+count ("matched_keywords"). KeywordStats counts, per source and run (see
+newswatch.stats), the articles checked and dropped.
+"""
+
+import logging
+import re
+from collections import Counter
+from functools import lru_cache
+
+from .stats import SourceCounts
+
+# below this many keywords, each is searched for on its own (see
+# benchmarks/bench_keywords.py for where the one pass overtakes it)
+SUBSTRING_SEARCH_LIMIT = 40
+
+
+def normalize(keyword):
+    return " ".join(keyword.lower().split())
+
+
+def _trie_pattern(node):
+    alternatives = [
+        (r"\s+" if char == " " else re.escape(char)) + _trie_pattern(child)
+        for char, child in sorted(node.items())
+        if char
+    ]
+    if not alternatives:
+        return ""
+    pattern = alternatives[0] if len(alternatives) == 1 else f"(?:{'|'.join(alternatives)})"
+    # a keyword ends here: the longer ones through this node are optional
+    return f"(?:{pattern})?" if "" in node else pattern
+
+
+class KeywordMatcher:
+    """All of a run's keywords, matched against an article together."""
+
+    def __init__(self, keywords):
+        """
+        Initialize KeywordMatcher.
+
+        Args:
+            keywords (iterable): Keywords to look for; case and spacing are
+                ignored, empty ones skipped
+        """
+        # normalized keyword -> the keyword as given (the first spelling)
+        self.names = {}
+        for keyword in keywords:
+            self.names.setdefault(normalize(keyword), keyword.strip())
+        self.names.pop("", None)
+        self.keywords = list(self.names)
+        self.substring_search = len(self.keywords) < SUBSTRING_SEARCH_LIMIT
+        # (keyword, pattern) for the substring search; a keyword with spaces
+        # gets a pattern matching any whitespace between its words
+        self.searches = [
+            (keyword, re.compile(r"\s+".join(map(re.escape, keyword.split(" ")))) if " " in keyword else None)
+            for keyword in self.keywords
+        ]
+        # char -> child node; "" -> the keyword ending at the node
+        trie = {}
+        for keyword in self.keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[""] = keyword
+        self.pattern = re.compile(f"(?=({_trie_pattern(trie)}))") if self.keywords else None
+        # longest keyword matched at a position -> every keyword matched there,
+        # the ones ending on its path through the trie
+        self.prefixes = {}
+        for keyword in self.keywords:
+            node, prefixes = trie, []
+            for char in keyword:
+                node = node[char]
+                if "" in node:
+                    prefixes.append(node[""])
+            self.prefixes[keyword] = prefixes
+
+    def matches(self, *texts):
+        """
+        Count the keywords in some texts.
+
+        Args:
+            *texts (str): Texts to scan, e.g. an article's title and content;
+                None is skipped, and no match spans two texts
+
+        Returns:
+            Counter: Keyword (normalized) -> hits, for the keywords found
+        """
+        hits = Counter()
+        if self.pattern is None:
+            return hits
+        text = "\0".join(text for text in texts if text).lower()
+        if self.substring_search:
+            return self._search(text, hits)
+        for match in self.pattern.finditer(text):
+            hits.update(self.prefixes[" ".join(match.group(1).split())])
+        return hits
+
+    def _search(self, text, hits):
+        for keyword, pattern in self.searches:
+            # overlapping, as the one pass counts them
+            if pattern is None:
+                start = text.find(keyword)
+                while start != -1:
+                    hits[keyword] += 1
+                    start = text.find(keyword, start + 1)
+            else:
+                match = pattern.search(text)
+                while match is not None:
+                    hits[keyword] += 1
+                    match = pattern.search(text, match.start() + 1)
+        return hits
+
+    def named(self, hits):
+        """
+        Key hits by the keywords as given.
+
+        Args:
+            hits (Counter): Result of matches
+
+        Returns:
+            dict: Keyword as given -> hits, in the keywords' order, for the
+            keywords found
+        """
+        return {self.names[keyword]: hits[keyword] for keyword in self.keywords if hits[keyword]}
+
+
+@lru_cache(maxsize=16)
+def keyword_matcher(keywords):
+    """
+    Get the matcher for a set of keywords, built once and shared.
+
+    Args:
+        keywords (tuple): Keywords of the run
+
+    Returns:
+        KeywordMatcher: Matcher for `keywords`
+    """
+    return KeywordMatcher(keywords)
+
+
+class KeywordStats(SourceCounts):
+    """Per-source counts of the keyword relevance check: articles checked and dropped."""
+
+    def record(self, source, dropped):
+        counts = self.counts[source]
+        counts["checked"] += 1
+        counts["dropped"] += dropped
+
+    def stats(self):
+        """
+        Get relevance check statistics.
+
+        Returns:
+            dict: Per source, the articles checked and those dropped as not
+            containing their keyword
+        """
+        return {
+            source: {"checked": counts["checked"], "dropped": counts["dropped"]}
+            for source, counts in self.sources()
+        }
+
+    def log_summary(self):
+        stats = self.stats()
+        if not stats:
+            return
+        checked = sum(source["checked"] for source in stats.values())
+        dropped = sum(source["dropped"] for source in stats.values())
+        logging.info(f"Keyword check: {dropped}/{checked} articles dropped as not mentioning their keyword")
+        for source, source_stats in stats.items():
+            if source_stats["dropped"]:
+                logging.info(f"  {source}: {source_stats['dropped']}/{source_stats['checked']} dropped")
@@ -0,0 +1,137 @@
+"""
+Search-listing date prefilter for newswatch.
+
+The start date cut-off is applied in queue_article, once an article page
+has been fetched and parsed. Many search pages already print each result's
+date, so scrapers whose parse_article_links can read it return a dict of
+URL -> listing date (built with add_listing) instead of plain URLs, and
+fetch_search_results drops the results listed before start_date without
+fetching them. Like an article older than start_date, such a result also
+ends the pagination.
+
+Listing dates are often coarser than the article's (a day without a time,
+or in another time zone than the article page), so a result is only
+dropped when it is listed more than LISTING_DATE_SLACK before start_date:
+the articles kept are the same as without the prefilter. Sources whose
+article date can be much later than the listed one set their own slack
+(BaseScraper.listing_date_slack), or None to fetch every result: kompas
+lists the first publish time, while its article date is the last update
+("Diperbarui"), which can come any time later. ListingStats
+counts, per source and run (see newswatch.stats), the results that carried
+a date, those without one, and the article fetches avoided.
+"""
+
+import logging
+from datetime import timedelta
+
+from .stats import SourceCounts, current_stats
+
+# how far before start_date a result must be listed to be dropped unfetched
+LISTING_DATE_SLACK = timedelta(days=1)
+
+
+def add_listing(listings, link, listed_at):
+    """
+    Add a search result to a page's results.
+
+    A URL can be listed more than once on a page (a headline box and the
+    result list, with or without a date); it is fetched once, keeping the
+    date it has when the other listing has none, and the latest of two
+    dates, so it is only dropped when every listing of it is too old.
+
+    Args:
+        listings (dict): URL -> listing date or None, in listing order
+        link (str): Result URL
+        listed_at (datetime or None): Date printed next to it
+    """
+    current = listings.setdefault(link, listed_at)
+    if listed_at is not None and (current is None or listed_at > current):
+        listings[link] = listed_at
+
+
+def prefilter_links(links, start_date, source=None, slack=LISTING_DATE_SLACK):
+    """
+    Drop search results listed before start_date.
+
+    Args:
+        links (iterable): URLs, (URL, listing date or None) pairs, or a dict
+            of URL -> listing date or None, as returned by
+            parse_article_links; a URL given more than once is kept once
+        start_date (datetime, optional): Cut-off; None keeps every result
+        source (str, optional): Scraper the results belong to, counted in
+            the run's ListingStats
+        slack (timedelta, optional): How far before start_date a result
+            must be listed to be dropped; None keeps every result
+
+    Returns:
+        tuple: (URLs to fetch in listing order, whether a result was dropped)
+    """
+    cutoff = start_date - slack if start_date and slack is not None else None
+    listings, plain = {}, []
+    for link in links.items() if isinstance(links, dict) else links:
+        if isinstance(link, tuple):
+            add_listing(listings, *link)
+        else:
+            plain.append(link)
+    kept, dropped = list(dict.fromkeys(plain)), 0
+    dated = undated = 0
+    for link, listed_at in listings.items():
+        if listed_at is None:
+            undated += 1
+        else:
+            dated += 1
+            if cutoff is not None and listed_at < cutoff:
+                dropped += 1
+                continue
+        kept.append(link)
+    current_stats().listings.record(source, dated=dated, undated=undated, skipped=dropped)
+    return kept, dropped > 0
+
+
+class ListingStats(SourceCounts):
+    """
+    Per-source counts of the search-listing date prefilter: results with a
+    listing date, without one, and dropped before their article was fetched.
+    """
+
+    def record(self, source, dated=0, undated=0, skipped=0):
+        """
+        Count the results of a search page.
+
+        Args:
+            source (str): Scraper the page belongs to
+            dated (int): Results that carried a listing date
+            undated (int): Results returned as pairs without a date
+            skipped (int): Results dropped as older than start_date
+        """
+        if dated or undated:
+            self.counts[source].update(dated=dated, undated=undated, skipped=skipped)
+
+    def stats(self):
+        """
+        Get prefilter statistics.
+
+        Returns:
+            dict: Per source, the search results with and without a listing
+            date, and the article fetches avoided (skipped)
+        """
+        stats = {}
+        for source, counts in self.sources():
+            stats[source] = {
+                "dated": counts["dated"],
+                "undated": counts["undated"],
+                "skipped": counts["skipped"],
+            }
+        return stats
+
+    def log_summary(self):
+        stats = self.stats()
+        if not stats:
+            return
+        skipped = sum(source["skipped"] for source in stats.values())
+        logging.info(f"Listing dates: {skipped} article fetches avoided")
+        for source, source_stats in stats.items():
+            logging.info(
+                f"  {source}: {source_stats['skipped']} skipped of {source_stats['dated']} "
+                f"dated results ({source_stats['undated']} without a date)"
+            )
@@ -1,5 +1,6 @@
 import asyncio
 import csv
+import json
 import logging
 import platform
 from datetime import datetime
@@ -29,6 +30,12 @@ from .scrapers.keprinews import KeprinewsScraper
 from .scrapers.ulasan import UlasanScraper
 from .scrapers.alurnews import AlurnewsScraper
 from .scrapers.hariankepri import HarianKepriScraper
+from .cache import ResponseCache
+from .deadline import deadline_scope
+from .parsepool import ParsePool
+from .scrapers.basescraper import resolve_html_parser
+from .session import SessionManager, preferred_http_backend
+from .stats import stats_scope
 
 # Enhanced logging configuration
 logging.basicConfig(
@@ -63,6 +70,30 @@ def setup_signal_handlers():
     signal.signal(signal.SIGTERM, signal_handler)
 
 
+# columns that can hold a list (a merged row's keywords) or a dict
+# (matched_keywords), written to files as JSON
+JSON_COLUMNS = ("keyword", "matched_keywords")
+
+
+def json_cell(value):
+    """Encode a list or dict for a file cell as JSON; other values are kept."""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def format_row(item):
+    """
+    Format a row's values for a file, in place: datetimes as strings, and
+    lists and dicts as JSON
+    """
+    if isinstance(item.get("publish_date"), datetime):
+        item["publish_date"] = item["publish_date"].strftime("%Y-%m-%d %H:%M:%S")
+    for name in JSON_COLUMNS:
+        if name in item:
+            item[name] = json_cell(item[name])
+
+
 async def write_csv(queue: asyncio.Queue, keywords: str, filename: Optional[str] = None) -> bool:
     """
     Write scraped data to CSV file with improved error handling
@@ -70,7 +101,7 @@ async def write_csv(queue: asyncio.Queue, keywords: str, filename: Optional[str]
     """
     fieldnames = [
         "title", "publish_date", "author", "content", 
-        "keyword", "category", "source", "link"
+        "keyword", "category", "source", "link", "matched_keywords"
     ]
 
     current_time = datetime.now().strftime("%Y%m%d_%H")
@@ -102,9 +133,7 @@ async def write_csv(queue: asyncio.Queue, keywords: str, filename: Optional[str]
                     logger.info("Received stop signal for CSV writer")
                     break
 
-                # Format datetime objects as strings
-                if isinstance(item.get("publish_date"), datetime):
-                    item["publish_date"] = item["publish_date"].strftime("%Y-%m-%d %H:%M:%S")
+                format_row(item)
                 
                 csv_writer.writerow(item)
                 csvfile.flush()
@@ -152,7 +181,7 @@ async def write_xlsx(queue: asyncio.Queue, keywords: str, filename: Optional[str
 
     fieldnames = [
         "title", "publish_date", "author", "content",
-        "keyword", "category", "source", "link"
+        "keyword", "category", "source", "link", "matched_keywords"
     ]
     
     current_time = datetime.now().strftime("%Y%m%d_%H")
@@ -180,9 +209,7 @@ async def write_xlsx(queue: asyncio.Queue, keywords: str, filename: Optional[str
                     logger.info("Received stop signal for XLSX writer")
                     break
 
-                # Format datetime objects as strings
-                if isinstance(item.get("publish_date"), datetime):
-                    item["publish_date"] = item["publish_date"].strftime("%Y-%m-%d %H:%M:%S")
+                format_row(item)
                 
                 items.append(item)
                 items_collected += 1
@@ -220,33 +247,131 @@ async def write_xlsx(queue: asyncio.Queue, keywords: str, filename: Optional[str
 
 def get_available_scrapers():
     """Get list of available scrapers based on platform"""
+    # "http_backend" is the client a source prefers; "http2" is only used
+    # with the httpx[http2] extra installed (see preferred_http_backend)
     scraper_classes = {
-        "antaranews": {"class": AntaranewsScraper, "params": {"concurrency": 7}},
-        "alurnews": {"class": AlurnewsScraper, "params": {"concurrency": 8}},
-        "batampos": {"class": BatamposScraper, "params": {"concurrency": 8}},
-        "bisnis": {"class": BisnisScraper, "params": {"concurrency": 5}},
-        "bloombergtechnoz": {"class": BloombergTechnozScraper, "params": {}},
-        "cnbcindonesia": {"class": CNBCScraper, "params": {"concurrency": 5}},
-        "detik": {"class": DetikScraper, "params": {"concurrency": 5}},
-        "hariankepri": {"class": HarianKepriScraper, "params": {"concurrency": 8}},
-        "kompas": {"class": KompasScraper, "params": {"concurrency": 7}},
-        "kepriantaranews": {"class": KepriAntaranewsScraper, "params": {"concurrency": 7}},
-        "keprinews": {"class": KeprinewsScraper, "params": {"concurrency": 8}},
-        "metrotvnews": {"class": MetrotvnewsScraper, "params": {"concurrency": 2}},
-        "okezone": {"class": OkezoneScraper, "params": {"concurrency": 7}},
-        "tempo": {"class": TempoScraper, "params": {"concurrency": 1}},
-        "ulasan": {"class": UlasanScraper, "params": {"concurrency": 8}},
-        "viva": {"class": VivaScraper, "params": {"concurrency": 7}},
-        "mediaindonesia": {"class": MediaIndonesiaScraper, "params": {}},
-        # "jawapos": {"class": JawaposScraper, "params": {"concurrency": 5}},
-        # "katadata": {"class": KatadataScraper, "params": {}},
-        # "kontan": {"class": KontanScraper, "params": {}},
+        "antaranews": {
+            "class": AntaranewsScraper,
+            "params": {"concurrency": 7},
+            "rate_limit": {"rate": 5, "burst": 7},
+        },
+        "alurnews": {
+            "class": AlurnewsScraper,
+            "params": {"concurrency": 8},
+            "rate_limit": {"rate": 8, "burst": 8},
+        },
+        "batampos": {
+            "class": BatamposScraper,
+            "params": {"concurrency": 8},
+            "rate_limit": {"rate": 8, "burst": 8},
+        },
+        "bisnis": {
+            "class": BisnisScraper,
+            "params": {"concurrency": 5},
+            "rate_limit": {"rate": 4, "burst": 5},
+        },
+        "bloombergtechnoz": {
+            "class": BloombergTechnozScraper,
+            "params": {},
+            "rate_limit": {"rate": 5, "burst": 10},
+        },
+        "cnbcindonesia": {
+            "class": CNBCScraper,
+            "params": {"concurrency": 5},
+            "rate_limit": {"rate": 4, "burst": 5},
+            "http_backend": "http2",
+        },
+        "detik": {
+            "class": DetikScraper,
+            "params": {"concurrency": 5},
+            "rate_limit": {"rate": 5, "burst": 5},
+            "http_backend": "http2",
+        },
+        "hariankepri": {
+            "class": HarianKepriScraper,
+            "params": {"concurrency": 8},
+            "rate_limit": {"rate": 8, "burst": 8},
+        },
+        "kompas": {
+            "class": KompasScraper,
+            "params": {"concurrency": 7},
+            "rate_limit": {"rate": 6, "burst": 7},
+            "http_backend": "http2",
+        },
+        "kepriantaranews": {
+            "class": KepriAntaranewsScraper,
+            "params": {"concurrency": 7},
+            "rate_limit": {"rate": 5, "burst": 7},
+        },
+        "keprinews": {
+            "class": KeprinewsScraper,
+            "params": {"concurrency": 8},
+            "rate_limit": {"rate": 8, "burst": 8},
+        },
+        "metrotvnews": {
+            "class": MetrotvnewsScraper,
+            "params": {"concurrency": 2},
+            "rate_limit": {"rate": 1.5, "burst": 2},
+        },
+        "okezone": {
+            "class": OkezoneScraper,
+            "params": {"concurrency": 7},
+            "rate_limit": {"rate": 6, "burst": 7},
+        },
+        "tempo": {
+            "class": TempoScraper,
+            "params": {"concurrency": 1},
+            "rate_limit": {"rate": 1, "burst": 1},
+            "http_backend": "http2",
+        },
+        "ulasan": {
+            "class": UlasanScraper,
+            "params": {"concurrency": 8},
+            "rate_limit": {"rate": 8, "burst": 8},
+        },
+        "viva": {
+            "class": VivaScraper,
+            "params": {"concurrency": 7},
+            "rate_limit": {"rate": 6, "burst": 7},
+        },
+        "mediaindonesia": {
+            "class": MediaIndonesiaScraper,
+            "params": {},
+            "rate_limit": {"rate": 4, "burst": 6},
+        },
+        # "jawapos": {
+        #     "class": JawaposScraper,
+        #     "params": {"concurrency": 5},
+        #     "rate_limit": {"rate": 4, "burst": 5},
+        # },
+        # "katadata": {
+        #     "class": KatadataScraper,
+        #     "params": {},
+        #     "rate_limit": {"rate": 4, "burst": 6},
+        # },
+        # "kontan": {
+        #     "class": KontanScraper,
+        #     "params": {},
+        #     "rate_limit": {"rate": 4, "burst": 6},
+        # },
     }
 
     linux_excluded_scrapers = {
-        "katadata": {"class": KatadataScraper, "params": {}},
-        "jawapos": {"class": JawaposScraper, "params": {"concurrency": 5}},
-        "kontan": {"class": KontanScraper, "params": {}},
+        "katadata": {
+            "class": KatadataScraper,
+            "params": {},
+            "rate_limit": {"rate": 4, "burst": 6},
+        },
+        "jawapos": {
+            "class": JawaposScraper,
+            "params": {"concurrency": 5},
+            "rate_limit": {"rate": 4, "burst": 5},
+        },
+        "kontan": {
+            "class": KontanScraper,
+            "params": {},
+            "rate_limit": {"rate": 4, "burst": 6},
+        },
     }
 
     if platform.system().lower() != "linux":
@@ -289,44 +414,48 @@ async def run_scrapers(scrapers: List, queue: asyncio.Queue, timeout: float = 30
     scraper_tasks = []
     successful_scrapers = 0
 
-    try:
-        # Create tasks for all scrapers
-        for scraper in scrapers:
-            try:
-                task = asyncio.create_task(scraper.scrape())
-                scraper_tasks.append(task)
-                logger.info(f"Started scraper: {scraper.__class__.__name__}")
-            except Exception as e:
-                logger.error(f"Failed to start scraper {scraper.__class__.__name__}: {e}")
+    # Create tasks for all scrapers; their fetches wind down at the run
+    # deadline, shortly before the timeout below cancels them
+    with deadline_scope(timeout) as deadline:
+        try:
+            for scraper in scrapers:
+                try:
+                    task = asyncio.create_task(scraper.scrape())
+                    scraper_tasks.append(task)
+                    logger.info(f"Started scraper: {scraper.__class__.__name__}")
+                except Exception as e:
+                    logger.error(f"Failed to start scraper {scraper.__class__.__name__}: {e}")
 
-        if not scraper_tasks:
-            logger.error("No scraper tasks could be started")
-            return False
+            if not scraper_tasks:
+                logger.error("No scraper tasks could be started")
+                return False
 
-        # Run scrapers with timeout and handle results
-        try:
-            results = await asyncio.wait_for(
-                asyncio.gather(*scraper_tasks, return_exceptions=True), 
-                timeout=timeout
-            )
+            # Run scrapers with timeout and handle results
+            try:
+                results = await asyncio.wait_for(
+                    asyncio.gather(*scraper_tasks, return_exceptions=True), 
+                    timeout=timeout
+                )
             
-            # Check results
-            for i, result in enumerate(results):
-                scraper_name = scrapers[i].__class__.__name__
-                if isinstance(result, Exception):
-                    logger.error(f"Scraper {scraper_name} failed: {result}")
-                else:
-                    logger.info(f"Scraper {scraper_name} completed successfully")
-                    successful_scrapers += 1
+                # Check results
+                for i, result in enumerate(results):
+                    scraper_name = scrapers[i].__class__.__name__
+                    if isinstance(result, Exception):
+                        logger.error(f"Scraper {scraper_name} failed: {result}")
+                    else:
+                        logger.info(f"Scraper {scraper_name} completed successfully")
+                        successful_scrapers += 1
 
-        except asyncio.TimeoutError:
-            logger.warning(f"Scraping timed out after {timeout}s")
+            except asyncio.TimeoutError:
+                logger.warning(f"Scraping timed out after {timeout}s")
+                await cleanup_tasks(scraper_tasks, timeout=30.0)
+
+        except Exception as e:
+            logger.error(f"Critical error during scraping: {e}")
             await cleanup_tasks(scraper_tasks, timeout=30.0)
+        finally:
+            deadline.log_summary()
 
-    except Exception as e:
-        logger.error(f"Critical error during scraping: {e}")
-        await cleanup_tasks(scraper_tasks, timeout=30.0)
-    
     logger.info(f"Scraping completed. {successful_scrapers}/{len(scrapers)} scrapers successful")
     return successful_scrapers > 0
 
@@ -386,6 +515,7 @@ async def main(args):
                 scrapers_to_run = [name.strip().lower() for name in selected_scrapers.split(",")]
 
             # Initialize scrapers
+            html_parser = resolve_html_parser(getattr(args, "parser", None))
             scrapers = []
             for scraper_name in scrapers_to_run:
                 scraper_info = scraper_classes.get(scraper_name)
@@ -396,6 +526,12 @@ async def main(args):
                         scraper_instance = scraper_class(
                             keywords, start_date=start_date, queue_=queue_, **scraper_params
                         )
+                        scraper_instance.rate_limit = scraper_info.get("rate_limit")
+                        scraper_instance.http_backend = preferred_http_backend(
+                            scraper_info.get("http_backend")
+                        )
+                        scraper_instance.html_parser = html_parser
+                        scraper_instance.merge_keywords = getattr(args, "merge_keywords", False)
                         scrapers.append(scraper_instance)
                         logger.info(f"Initialized scraper: {scraper_name}")
                     except Exception as e:
@@ -413,17 +549,45 @@ async def main(args):
                 writer_task.cancel()
             return 1
 
-        # Run scrapers
+        # Run scrapers over one shared connection pool
+        parse_pool = None
         try:
-            scraping_successful = await run_scrapers(scrapers, queue_, timeout=300.0)
-            
-            if not scraping_successful:
-                logger.warning("No scrapers completed successfully")
-            
+            parse_workers = getattr(args, "parse_workers", 0)
+            if parse_workers > 0:
+                # fork the parse workers before the session opens connections
+                parse_pool = ParsePool(parse_workers)
+                await parse_pool.start()
+                for scraper in scrapers:
+                    scraper.parse_pool = parse_pool
+
+            cache = ResponseCache() if getattr(args, "cache", False) else None
+            with stats_scope() as run_stats:
+                async with SessionManager(
+                    cache=cache,
+                    record_to=getattr(args, "record", None),
+                    replay_from=getattr(args, "replay", None),
+                    replay_latency=getattr(args, "replay_latency", False),
+                    base_url_override=getattr(args, "base_url", None),
+                ) as session_manager:
+                    for scraper in scrapers:
+                        scraper.session_manager = session_manager
+
+                    scraping_successful = await run_scrapers(scrapers, queue_, timeout=300.0)
+
+                    if not scraping_successful:
+                        logger.warning("No scrapers completed successfully")
+
+                    session_manager.log_summary()
+                    run_stats.log_summary()
+
         except Exception as e:
             logger.error(f"Error during scraping execution: {e}")
         
         finally:
+            if parse_pool is not None:
+                parse_pool.log_summary()
+                await parse_pool.close()
+
             # Signal writer to stop
             try:
                 await queue_.put(None)
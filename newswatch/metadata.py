@@ -0,0 +1,237 @@
+"""
+Article metadata fast path for newswatch.
+
+Many news sites describe each article for search engines and social media:
+a JSON-LD block (`<script type="application/ld+json">`) with a schema.org
+NewsArticle, and OpenGraph `<meta>` tags in the `<head>`. read_metadata
+finds those with regular expressions on the raw page, without building a
+document tree, so when they hold every field a scraper needs the page is
+never parsed with BeautifulSoup. Fields they do not hold are left to the
+scraper's DOM selectors.
+
+Fields are taken from:
+
+    title         JSON-LD headline (og:title is not used: most sites append
+                  their own name to it)
+    publish_date  JSON-LD datePublished, or article:published_time
+    author        JSON-LD author (names joined by ", "), or the author /
+                  article:author meta tag unless it is a URL
+    category      JSON-LD articleSection (the first one), or article:section
+    content       JSON-LD articleBody, never for a scraper with an extraction
+                  spec: it has not been through the spec's cleaner
+
+The fast path is off unless a scraper lists the fields its pages' metadata
+was checked to match in `metadata_fields` (BaseScraper), since the metadata
+of a site can disagree with what its DOM selectors extract (detik's author,
+kompas' category). benchmarks/bench_metadata.py compares the two, on stub
+pages or a cassette recorded from the real sites.
+JSON-LD blocks are looked for anywhere in the page, since some sites put
+them in the body; meta tags only in the head. MetadataStats counts, per
+source, how many pages the fast path covered completely, partly or not at
+all, for a run (see newswatch.stats).
+"""
+
+import html
+import json
+import logging
+import re
+
+from .extract import FIELDS
+from .stats import SourceCounts
+
+# schema.org types whose properties are read as the article's
+ARTICLE_TYPES = {
+    "Article", "NewsArticle", "ReportageNews", "AnalysisNewsArticle", "OpinionNewsArticle",
+    "BackgroundNewsArticle", "ReviewNewsArticle", "BlogPosting", "LiveBlogPosting", "Report",
+}
+
+# meta tag (property or name, lowercased) -> field, in order of preference
+META_FIELDS = (
+    ("article:published_time", "publish_date"),
+    ("author", "author"),
+    ("article:author", "author"),
+    ("article:section", "category"),
+)
+
+_LD_JSON = re.compile(
+    r"<script\b[^>]*\btype\s*=\s*[\"']?application/ld\+json[\"']?[^>]*>(.*?)</script\s*>",
+    re.IGNORECASE | re.DOTALL,
+)
+_HEAD_END = re.compile(r"</head\s*>|<body\b", re.IGNORECASE)
+_META = re.compile(r"<meta\b[^>]*>", re.IGNORECASE)
+_ATTRIBUTE = re.compile(r"([\w:-]+)\s*=\s*(?:\"([^\"]*)\"|'([^']*)'|([^\s\"'>]+))")
+_COMMENT = re.compile(r"^\s*(?:<!--|/\*\s*<!\[CDATA\[\s*\*/)|(?:-->|/\*\s*\]\]>\s*\*/)\s*$")
+
+
+def _decode(markup, charset):
+    if isinstance(markup, str):
+        return markup
+    try:
+        return markup.decode(charset or "utf-8", errors="replace")
+    except LookupError:
+        return markup.decode("utf-8", errors="replace")
+
+
+def _types(node):
+    types = node.get("@type", ())
+    return {types} if isinstance(types, str) else set(types)
+
+
+def _find_article(node):
+    if isinstance(node, list):
+        for item in node:
+            found = _find_article(item)
+            if found is not None:
+                return found
+    elif isinstance(node, dict):
+        if _types(node) & ARTICLE_TYPES:
+            return node
+        if "@graph" in node:
+            return _find_article(node["@graph"])
+    return None
+
+
+def read_metadata(markup, charset=None):
+    """
+    Read a page's JSON-LD article and meta tags without parsing it.
+
+    Args:
+        markup (bytes or str): Page body
+        charset (str, optional): Encoding of `markup` when it is bytes
+
+    Returns:
+        dict: "ld_json", the first JSON-LD object of an article type ({} if
+        there is none), and "meta", the head's meta tags as lowercased
+        property or name -> content (the first of each)
+    """
+    page = _decode(markup, charset)
+
+    ld_json = {}
+    for block in _LD_JSON.findall(page):
+        try:
+            # strict=False: article bodies often carry raw newlines
+            data = json.loads(_COMMENT.sub("", block), strict=False)
+        except ValueError:
+            continue
+        ld_json = _find_article(data) or {}
+        if ld_json:
+            break
+
+    head_end = _HEAD_END.search(page)
+    meta = {}
+    for tag in _META.findall(page, 0, head_end.start() if head_end else len(page)):
+        attributes = {
+            name.lower(): double or single or bare
+            for name, double, single, bare in _ATTRIBUTE.findall(tag)
+        }
+        key = (attributes.get("property") or attributes.get("name") or "").lower()
+        if key and "content" in attributes:
+            meta.setdefault(key, html.unescape(attributes["content"]))
+
+    return {"ld_json": ld_json, "meta": meta}
+
+
+def _text(value):
+    if isinstance(value, list):
+        value = value[0] if value else ""
+    if isinstance(value, dict):
+        value = value.get("name", "")
+    return html.unescape(value).strip() if isinstance(value, str) else ""
+
+
+def _author(value):
+    if not isinstance(value, list):
+        value = [value]
+    return ", ".join(name for name in (_text(author) for author in value) if name)
+
+
+def article_fields(metadata):
+    """
+    Map metadata from read_metadata to article fields.
+
+    Args:
+        metadata (dict): Result of read_metadata
+
+    Returns:
+        dict: The fields found, non-empty; publish_date is unparsed
+    """
+    ld_json = metadata["ld_json"]
+    fields = {
+        "title": _text(ld_json.get("headline")),
+        "publish_date": _text(ld_json.get("datePublished")),
+        "author": _author(ld_json.get("author", [])),
+        "category": _text(ld_json.get("articleSection")),
+        "content": _text(ld_json.get("articleBody")),
+    }
+    for key, name in META_FIELDS:
+        value = metadata["meta"].get(key, "").strip()
+        if fields[name] or not value:
+            continue
+        if name == "author" and value.startswith(("http://", "https://")):
+            continue
+        fields[name] = value
+    return {name: value for name, value in fields.items() if value}
+
+
+class MetadataStats(SourceCounts):
+    """
+    Per-source coverage of the metadata fast path: pages covered fully,
+    partly or not at all, and how often each field was taken from metadata.
+    """
+
+    def record(self, source, fields):
+        """
+        Count a page.
+
+        Args:
+            source (str): Scraper the page belongs to
+            fields (iterable): Fields the fast path provided
+        """
+        fields = set(fields)
+        counts = self.counts[source]
+        counts["pages"] += 1
+        if len(fields) == len(FIELDS):
+            counts["full"] += 1
+        elif fields:
+            counts["partial"] += 1
+        else:
+            counts["none"] += 1
+        counts.update(fields)
+
+    def stats(self):
+        """
+        Get fast path statistics.
+
+        Returns:
+            dict: Per source, the pages seen, those the metadata covered
+            completely (no DOM parse), partly or not at all, the share of
+            full pages, and how often each field came from the metadata
+        """
+        stats = {}
+        for source, counts in self.sources():
+            stats[source] = {
+                "pages": counts["pages"],
+                "full": counts["full"],
+                "partial": counts["partial"],
+                "none": counts["none"],
+                "coverage": round(counts["full"] / counts["pages"], 3) if counts["pages"] else 0.0,
+                "fields": {name: counts[name] for name in FIELDS},
+            }
+        return stats
+
+    def log_summary(self):
+        stats = self.stats()
+        if not stats:
+            return
+        pages = sum(source["pages"] for source in stats.values())
+        full = sum(source["full"] for source in stats.values())
+        logging.info(f"Metadata fast path: {full}/{pages} articles without a DOM parse")
+        for source, source_stats in stats.items():
+            fields = ", ".join(
+                f"{name} {count}" for name, count in source_stats["fields"].items() if count
+            )
+            logging.info(
+                f"  {source}: {source_stats['coverage']:.0%} full "
+                f"({source_stats['partial']} partial, {source_stats['none']} none"
+                f"{'; ' + fields if fields else ''})"
+            )
@@ -0,0 +1,143 @@
+"""
+Process pool for article parsing in newswatch.
+
+Parsing an article page with BeautifulSoup and running its date through
+dateparser is pure CPU work, and on the event loop every millisecond of it
+delays every other scraper's I/O. A ParsePool moves that work to worker
+processes. The workers import bs4, lxml and dateparser and parse a few
+dates as they start, so the first articles do not pay for loading
+dateparser's language data, and stay up for the whole run.
+
+The pool is started before the HTTP session so the workers are forked
+from a process that has no connections or resolver threads yet.
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .stats import current_stats, stats_scope
+
+# dates in the formats the scrapers meet, parsed once per worker to load
+# dateparser's Indonesian and English data before the first article
+WARM_UP_DATES = (
+    "Senin, 12 Agustus 2024 14:30 WIB",
+    "12 Agu 2024, 09:15",
+    "2024-08-12T14:30:00+07:00",
+    "2 jam yang lalu",
+)
+
+
+def _warm_up():
+    import bs4
+    import dateparser
+
+    try:
+        import lxml  # noqa: F401
+    except ImportError:
+        pass
+
+    bs4.BeautifulSoup("<p>newswatch</p>", "html.parser")
+    for date_string in WARM_UP_DATES:
+        dateparser.parse(date_string)
+
+
+def _ready():
+    return True
+
+
+def _run_job(func, args):
+    # the job counts into stats of its own, which go back with the result
+    # and are added to the run's (see newswatch.stats)
+    with stats_scope() as job_stats:
+        result = func(*args)
+    return result, job_stats.take_counts()
+
+
+class ParsePool:
+    """Warm worker processes shared by every scraper of a run."""
+
+    def __init__(self, workers):
+        """
+        Initialize ParsePool.
+
+        Args:
+            workers (int): Number of worker processes
+        """
+        self.workers = workers
+        self.executor = None
+        self.jobs = 0
+        self.failures = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+
+    async def start(self):
+        """Start the workers and wait until all of them are warm."""
+        self.executor = ProcessPoolExecutor(self.workers, initializer=_warm_up)
+        loop = asyncio.get_running_loop()
+        started_at = time.perf_counter()
+        # one job per worker: the executor forks a new process for each
+        # job submitted while no worker is idle
+        await asyncio.gather(
+            *(loop.run_in_executor(self.executor, _ready) for _ in range(self.workers))
+        )
+        logging.info(
+            f"Parse pool: {self.workers} workers ready in {time.perf_counter() - started_at:.1f}s"
+        )
+
+    async def run(self, func, *args):
+        """
+        Run `func(*args)` in a worker process.
+
+        Args:
+            func: Picklable callable, e.g. a scraper classmethod
+            *args: Picklable arguments
+
+        Returns:
+            The return value of `func`; its exceptions propagate.
+        """
+        loop = asyncio.get_running_loop()
+        started_at = time.perf_counter()
+        try:
+            result, counts = await loop.run_in_executor(self.executor, _run_job, func, args)
+            current_stats().add_counts(counts)
+            return result
+        except Exception:
+            self.failures += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - started_at
+            self.jobs += 1
+            self.seconds += elapsed
+            self.max_seconds = max(self.max_seconds, elapsed)
+
+    async def close(self):
+        """Stop the workers; waits for them to exit in a thread, not on the event loop."""
+        if self.executor is not None:
+            executor, self.executor = self.executor, None
+            await asyncio.to_thread(executor.shutdown, True, cancel_futures=True)
+
+    def stats(self):
+        """
+        Get parse pool statistics for the run.
+
+        Returns:
+            dict: Workers, jobs run and failed, and the mean and longest time
+            a job took from submission to result, in milliseconds
+        """
+        return {
+            "workers": self.workers,
+            "jobs": self.jobs,
+            "failures": self.failures,
+            "mean_ms": round(self.seconds * 1000 / self.jobs, 2) if self.jobs else 0.0,
+            "max_ms": round(self.max_seconds * 1000, 2),
+        }
+
+    def log_summary(self):
+        stats = self.stats()
+        logging.info(
+            f"Parse pool ({stats['workers']} workers): {stats['jobs']} pages parsed, "
+            f"{stats['failures']} failed, {stats['mean_ms']:.1f} ms mean, "
+            f"{stats['max_ms']:.1f} ms max"
+        )
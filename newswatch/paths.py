@@ -0,0 +1,25 @@
+"""
+Filesystem locations used by newswatch for state kept between runs.
+"""
+
+import os
+from pathlib import Path
+
+
+def get_cache_dir():
+    """
+    Get the directory for newswatch state kept between runs.
+
+    Uses $NEWSWATCH_CACHE_DIR when set, otherwise ~/.cache/newswatch.
+    The directory is created if it does not exist.
+
+    Returns:
+        Path: Cache directory
+    """
+    cache_dir = os.environ.get("NEWSWATCH_CACHE_DIR")
+    if cache_dir:
+        path = Path(cache_dir).expanduser()
+    else:
+        path = Path.home() / ".cache" / "newswatch"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
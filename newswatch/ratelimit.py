@@ -0,0 +1,142 @@
+"""
+Per-host request rate limiting for newswatch.
+
+Each host gets a token bucket that refills at a fixed requests-per-second rate
+and allows short bursts up to its capacity. Buckets are keyed by host and live
+on the run's SessionManager, so every scraper that hits the same host draws
+from the same bucket.
+"""
+
+import asyncio
+import logging
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """Token bucket that refills at `rate` tokens per second up to `burst`."""
+
+    def __init__(self, rate, burst=None):
+        """
+        Initialize TokenBucket.
+
+        Args:
+            rate (float): Tokens added per second (requests per second)
+            burst (int, optional): Bucket capacity; defaults to max(1, rate)
+        """
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1.0, rate))
+        self.tokens = self.burst
+        self.updated_at = None
+        self.paused_until = 0.0
+        self.requests = 0
+        self.waited = 0.0
+        self.pauses = 0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now):
+        if self.updated_at is not None:
+            elapsed = now - self.updated_at
+            self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+        self.updated_at = now
+
+    def pause(self, seconds):
+        """Hold back every request to this host for `seconds` (Retry-After)."""
+        loop = asyncio.get_running_loop()
+        self.paused_until = max(self.paused_until, loop.time() + seconds)
+        self.pauses += 1
+
+    async def acquire(self):
+        """Wait until a token is available and take it."""
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            while loop.time() < self.paused_until:
+                wait_time = self.paused_until - loop.time()
+                self.waited += wait_time
+                await asyncio.sleep(wait_time)
+            self._refill(loop.time())
+            while self.tokens < 1:
+                wait_time = (1 - self.tokens) / self.rate
+                self.waited += wait_time
+                await asyncio.sleep(wait_time)
+                self._refill(loop.time())
+            self.tokens -= 1
+            self.requests += 1
+
+
+class HostRateLimiter:
+    """Registry of token buckets keyed by host name."""
+
+    def __init__(self):
+        self.buckets = {}
+
+    @staticmethod
+    def host_for(url):
+        return urlparse(url).hostname or ""
+
+    def configure(self, host, rate, burst=None):
+        """Set (or replace) the rate limit for a host."""
+        self.buckets[host] = TokenBucket(rate, burst)
+        return self.buckets[host]
+
+    def bucket_for(self, url, rate_limit=None):
+        """
+        Get the bucket for the host of `url`.
+
+        The first scraper to reach a host with a `rate_limit` creates the
+        bucket; later callers share it regardless of their own settings.
+
+        Args:
+            url (str): Request URL
+            rate_limit (dict, optional): {"rate": float, "burst": int}
+
+        Returns:
+            TokenBucket or None: None when the host is not rate limited
+        """
+        host = self.host_for(url)
+        bucket = self.buckets.get(host)
+        if bucket is None and rate_limit:
+            bucket = self.configure(
+                host, rate_limit["rate"], rate_limit.get("burst")
+            )
+        return bucket
+
+    async def acquire(self, url, rate_limit=None):
+        bucket = self.bucket_for(url, rate_limit)
+        if bucket is not None:
+            await bucket.acquire()
+
+    def pause(self, url, seconds):
+        """Apply a server's Retry-After to every scraper using this host."""
+        bucket = self.buckets.get(self.host_for(url))
+        if bucket is not None:
+            bucket.pause(seconds)
+
+    def stats(self):
+        """
+        Get per-host limiter statistics.
+
+        Returns:
+            dict: host -> rate, burst, requests and total seconds spent waiting
+        """
+        return {
+            host: {
+                "rate": bucket.rate,
+                "burst": bucket.burst,
+                "requests": bucket.requests,
+                "waited": round(bucket.waited, 2),
+                "pauses": bucket.pauses,
+            }
+            for host, bucket in self.buckets.items()
+        }
+
+    def log_summary(self):
+        for host, stats in sorted(self.stats().items()):
+            if stats["waited"]:
+                logging.info(
+                    f"Rate limit {host}: {stats['requests']} requests at "
+                    f"{stats['rate']:g}/s (burst {stats['burst']:g}), "
+                    f"throttled {stats['waited']:.1f}s, "
+                    f"{stats['pauses']} Retry-After pauses"
+                )
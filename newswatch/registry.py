@@ -0,0 +1,160 @@
+"""
+Run-scoped article registry for newswatch.
+
+A scraper searches each keyword on its own, and an article that several
+keywords find ("bps", "inflasi", "harga cabai") used to be fetched and
+parsed once per keyword. ArticleRegistry keeps, for one scraper's run, each
+article URL's parsed page: the first keyword to list a URL fetches and
+parses it, and every later keyword (or one waiting while the first is still
+fetching) reuses the parsed article. The date and keyword checks of
+queue_article still run for each keyword, and each accepted (article,
+keyword) is emitted at once, as one row, as before the registry.
+
+With `merge`, accepted articles are instead held until the scraper's
+keywords are all done and emitted once each, with "keyword" the list of
+the keywords that found the article and that it mentions, in the order
+they were given. RegistryStats counts, per source and run (see
+newswatch.stats), the articles fetched and parsed, the reuses (fetches and
+parses avoided) and the rows emitted.
+"""
+
+import asyncio
+import logging
+
+from .stats import SourceCounts
+
+
+class ArticleRegistry:
+    """Parsed article pages and accepted articles of one scraper's run, by URL."""
+
+    def __init__(self, keywords, merge=False):
+        """
+        Initialize ArticleRegistry.
+
+        Args:
+            keywords (list): The scraper's keywords, in the order a merged
+                row lists them
+            merge (bool): Hold accepted articles and emit one row per article
+                instead of one per article and keyword
+        """
+        self.order = {keyword: index for index, keyword in enumerate(keywords)}
+        self.merge = merge
+        # link -> Future of the parsed page: (article, source), or None if
+        # the fetch or parse failed
+        self.pages = {}
+        # link -> page recorded by queue_article while the link's fetch runs
+        self.parsed = {}
+        # links accepted for a keyword
+        self.accepted = set()
+        # with merge: link -> (item, keywords that accepted it), in
+        # acceptance order
+        self.items = {}
+
+    def claim(self, link):
+        """
+        Get a link's parsed page, or the right to fetch it.
+
+        Returns:
+            Future or None: None if nobody has fetched `link` (or the fetches
+            failed): the caller now owns it and must call release. Otherwise
+            a Future of (article, source), or None if the owner's fetch failed
+        """
+        future = self.pages.get(link)
+        if future is None:
+            self.pages[link] = asyncio.get_running_loop().create_future()
+        return future
+
+    def record_page(self, link, article, source):
+        """Keep the article parsed from a claimed link for the other keywords."""
+        future = self.pages.get(link)
+        if future is not None and not future.done():
+            self.parsed.setdefault(link, (article, source))
+
+    def release(self, link):
+        """End the fetch of a claimed link; a failed one can be claimed again."""
+        page = self.parsed.pop(link, None)
+        future = self.pages[link]
+        if page is None:
+            del self.pages[link]
+        if not future.done():
+            future.set_result(page)
+
+    def accept(self, item, keyword):
+        """
+        Note an article accepted for a keyword.
+
+        Args:
+            item (dict): Row queue_article built
+            keyword (str): Keyword it was accepted for
+
+        Returns:
+            bool: True if the row is held for merging, False if the caller
+            emits it now
+        """
+        link = item["link"]
+        self.accepted.add(link)
+        if not self.merge:
+            return False
+        if link not in self.items:
+            self.items[link] = (item, [])
+        keywords = self.items[link][1]
+        if keyword not in keywords:
+            keywords.append(keyword)
+        return True
+
+    def merged_rows(self):
+        """
+        Get the rows held with merge.
+
+        Returns:
+            list: One row per article, with "keyword" the list of keywords
+            that accepted it, in the order the keywords were given
+        """
+        return [
+            {**item, "keyword": sorted(keywords, key=lambda keyword: self.order.get(keyword, len(self.order)))}
+            for item, keywords in self.items.values()
+        ]
+
+
+class RegistryStats(SourceCounts):
+    """
+    Per-source savings of the article registry: pages fetched and parsed,
+    pages reused instead, articles and rows emitted.
+    """
+
+    def stats(self):
+        """
+        Get registry statistics.
+
+        Returns:
+            dict: Per source, the article pages fetched and parsed, those
+            reused for another keyword (fetches and parses avoided), and the
+            articles and rows emitted
+        """
+        stats = {}
+        for source, counts in self.sources():
+            stats[source] = {
+                "fetched": counts["fetched"],
+                "reused": counts["reused"],
+                "articles": counts["articles"],
+                "rows": counts["rows"],
+            }
+        return stats
+
+    def log_summary(self):
+        stats = self.stats()
+        if not stats:
+            return
+        fetched = sum(source["fetched"] for source in stats.values())
+        reused = sum(source["reused"] for source in stats.values())
+        logging.info(
+            f"Article registry: {fetched} pages fetched and parsed, "
+            f"{reused} reused for another keyword"
+        )
+        for source, source_stats in stats.items():
+            if source_stats["reused"]:
+                logging.info(
+                    f"  {source}: {source_stats['reused']} reused of "
+                    f"{source_stats['fetched'] + source_stats['reused']}, "
+                    f"{source_stats['articles']} articles in {source_stats['rows']} rows"
+                )
@@ -0,0 +1,78 @@
+"""
+Retry scheduling for newswatch HTTP requests.
+
+RetryPolicy decides how long a failed request waits before it is tried again:
+exponential backoff with jitter, or the server's Retry-After when it sends
+one. The wait happens outside the scraper's in-flight slot, so a request
+that is backing off never blocks healthy requests.
+"""
+
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+
+def parse_retry_after(value):
+    """
+    Parse a Retry-After header value.
+
+    Args:
+        value (str): Delay in seconds or an HTTP date
+
+    Returns:
+        float or None: Seconds to wait, or None if the header is missing/invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryPolicy:
+    """Jittered exponential backoff that honours Retry-After."""
+
+    def __init__(self, base_delay=1.0, max_delay=30.0, max_retry_after=60.0):
+        """
+        Initialize RetryPolicy.
+
+        Args:
+            base_delay (float): Backoff for the first retry, doubled per attempt
+            max_delay (float): Upper bound for computed backoff
+            max_retry_after (float): Longest Retry-After worth waiting for
+                within a run; longer requests are not retried
+        """
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+
+    def delay(self, attempt, retry_after=None):
+        """
+        Get the wait before retry number `attempt + 1`.
+
+        Args:
+            attempt (int): Number of retries already made
+            retry_after (float, optional): Server-requested delay in seconds
+
+        Returns:
+            float or None: Seconds to wait, or None if the request should not
+            be retried
+        """
+        if retry_after is not None:
+            if retry_after > self.max_retry_after:
+                return None
+            # spread out requests that were all told to come back at once
+            return retry_after + random.uniform(0, min(1.0, self.base_delay))
+
+        backoff = min(self.max_delay, self.base_delay * 2**attempt)
+        # "equal jitter": keep half the backoff, randomise the other half
+        return backoff / 2 + random.uniform(0, backoff / 2)
@@ -1,23 +1,401 @@
 import logging
+import re
 from abc import ABC, abstractmethod
 
-import dateparser
+from bs4 import BeautifulSoup
 
-from ..utils import AsyncScraper
+from ..dates import date_parser
+from ..extract import FIELDS
+from ..fallbacks import selector_cache
+from ..keywords import keyword_matcher, normalize
+from ..listings import LISTING_DATE_SLACK, prefilter_links
+from ..metadata import article_fields, read_metadata
+from ..registry import ArticleRegistry
+from ..stats import current_stats
+from ..utils import AsyncScraper, page_type_scope
+
+try:
+    import lxml
+except ImportError:
+    lxml = None
+
+# parser backends parse_html can use; all are BeautifulSoup tree builders, so
+# the scrapers' find/select calls work unchanged. "auto" picks lxml when it
+# is installed and the pure-Python html.parser otherwise
+HTML_PARSERS = ("auto", "lxml", "html.parser")
+DEFAULT_HTML_PARSER = "auto"
+
+
+def resolve_html_parser(name=None):
+    """
+    Get the BeautifulSoup tree builder for a parser backend setting.
+
+    Args:
+        name (str, optional): One of HTML_PARSERS; defaults to DEFAULT_HTML_PARSER
+
+    Returns:
+        str: Tree builder name to pass to BeautifulSoup
+    """
+    name = name or DEFAULT_HTML_PARSER
+    if name not in HTML_PARSERS:
+        raise ValueError(f"Unknown HTML parser {name!r}, expected one of {HTML_PARSERS}")
+    if name == "auto":
+        return "lxml" if lxml is not None else "html.parser"
+    if name == "lxml" and lxml is None:
+        logging.warning("lxml is not installed (pip install lxml); using html.parser")
+        return "html.parser"
+    return name
+
+
+def parse_markup(markup, charset=None, html_parser="html.parser", parse_only=None):
+    """
+    Parse a page with BeautifulSoup.
+
+    Bytes go to the parser as they are, together with their charset, so the
+    page is decoded once, by the parser, instead of being decoded to str
+    first.
+
+    Args:
+        markup (bytes or str): Page body
+        charset (str, optional): Encoding of `markup` when it is bytes
+        html_parser (str): BeautifulSoup tree builder
+        parse_only (SoupStrainer, optional): Build only the elements it
+            matches, with their descendants, instead of the whole tree
+
+    Returns:
+        BeautifulSoup: Parsed document
+    """
+    if isinstance(markup, bytes):
+        return BeautifulSoup(markup, html_parser, from_encoding=charset, parse_only=parse_only)
+    return BeautifulSoup(markup, html_parser, parse_only=parse_only)
+
+
+def class_pattern(class_name):
+    """
+    Match a class among an element's classes, for a SoupStrainer.
+
+    While the page is parsed, a SoupStrainer sees the class attribute as one
+    string ("card__post card__post-list"), so `class_="card__post"` would only
+    match elements that have no other class.
+
+    Args:
+        class_name (str): A single CSS class
+
+    Returns:
+        re.Pattern: Pattern to pass as `class_`
+    """
+    return re.compile(rf"(?:^|\s){re.escape(class_name)}(?:\s|$)")
 
 
 class BaseScraper(AsyncScraper, ABC):
+    # Extractor compiled from the scraper's extraction spec, used by the
+    # default parse_article; scrapers without one override parse_article
+    extractor = None
+    # fields the metadata fast path may take from the page's JSON-LD and meta
+    # tags before the DOM is parsed (see newswatch.metadata); off by default,
+    # scrapers opt in with the fields their pages' metadata was checked to
+    # match. content is never taken from it when there is an extraction spec
+    metadata_fields = ()
+    # queue_article keeps an article that mentions its whole keyword. With
+    # any_keyword_word one word of the keyword is enough, and the check comes
+    # before the date check, so an unrelated old result does not end the
+    # pagination (kepriantaranews' own check, for its loose search)
+    any_keyword_word = False
+    # how far before start_date a search result must be listed to be dropped
+    # unfetched (see newswatch.listings); None fetches every result
+    listing_date_slack = LISTING_DATE_SLACK
+
     def __init__(self, keywords, concurrency=10, queue_=None):
         super().__init__(concurrency)
         self.keywords = [keyword.strip() for keyword in keywords.split(",")]
+        # every keyword of the run, matched against the articles in queue_article
+        self.keyword_matcher = keyword_matcher(tuple(self.keywords))
+        # emit one row per article, listing its keywords, instead of one per
+        # article and keyword, see newswatch.registry; the registry itself
+        # lives for one scrape()
+        self.merge_keywords = False
+        self.article_registry = None
         self.queue_ = queue_
         self.continue_scraping = True
+        # BeautifulSoup tree builder used by parse_html, see resolve_html_parser
+        self.html_parser = resolve_html_parser()
+        # ParsePool article pages are parsed in; None parses them on the event loop
+        self.parse_pool = None
+        # SoupStrainer matching the part of a search page that holds the
+        # result links; None builds the whole page
+        self.search_strainer = None
+
+    @classmethod
+    def parse_date(cls, date_string, **kwargs):
+        """
+        Parse a publish date, with the formats learned for this scraper.
+
+        Args:
+            date_string (str): Date as printed on the page
+            **kwargs: Passed to dateparser.parse when no learned format fits
+
+        Returns:
+            datetime or None: Naive datetime, or None if it is not a date
+        """
+        return date_parser.parse(date_string, cls.__name__, **kwargs)
+
+    @classmethod
+    def parse_listing_date(cls, date_string, **kwargs):
+        """
+        Parse the date a search page prints next to a result.
+
+        Formats are learned apart from the article pages' (see
+        newswatch.listings for how the date is used).
+
+        Args:
+            date_string (str): Date as printed on the search page
+            **kwargs: Passed to dateparser.parse when no learned format fits
+
+        Returns:
+            datetime or None: Naive datetime, or None if there is no date
+        """
+        if not date_string:
+            return None
+        return date_parser.parse(date_string, f"{cls.__name__} (listing)", **kwargs)
+
+    def parse_html(self, markup, charset=None, parse_only=None):
+        """
+        Parse a page with the configured parser backend.
+
+        Args:
+            markup (bytes or str): Page body
+            charset (str, optional): Encoding of `markup` when it is bytes
+            parse_only (SoupStrainer, optional): See parse_markup
+
+        Returns:
+            BeautifulSoup: Parsed document
+        """
+        return parse_markup(markup, charset, self.html_parser, parse_only)
+
+    def parse_search_page(self, markup, charset=None):
+        """
+        Parse a search page for parse_article_links.
+
+        Only the elements matching search_strainer are built, so the
+        scraper's link selectors must lie within them.
+
+        Args:
+            markup (bytes or str): Page body
+            charset (str, optional): Encoding of `markup` when it is bytes
+
+        Returns:
+            BeautifulSoup: Parsed document, or the matched part of it
+        """
+        return self.parse_html(markup, charset, self.search_strainer)
+
+    @classmethod
+    def first_match(cls, chain, candidates, attempt):
+        """
+        Resolve a fallback chain, trying its most frequent winner first.
 
-    def parse_date(self, date_string, **kwargs):
-        parsed_date = dateparser.parse(date_string, **kwargs)
-        if parsed_date:
-            return parsed_date.replace(tzinfo=None)
-        return None
+        For scrapers that try several selectors in order and use the first
+        that matches; see newswatch.fallbacks. The fields of an extraction
+        spec already go through it.
+
+        Args:
+            chain (str): Name of the chain, unique within the scraper
+            candidates (list): Selectors in declared order, the same list on
+                every call
+            attempt (callable): Returns the value for a selector, empty when
+                it does not match
+
+        Returns:
+            The first non-empty value, or None if no selector gives one
+        """
+        return selector_cache.first(cls.__name__, chain, candidates, attempt)
+
+    @classmethod
+    def parse_article(cls, soup, link):
+        """
+        Extract an article's fields from its parsed page.
+
+        This is the pure half of get_article: it may run in a worker process
+        of the parse pool, so it only uses its arguments and class attributes,
+        never the scraper instance. By default it runs the scraper's
+        extractor, see newswatch.extract.
+
+        Args:
+            soup (BeautifulSoup): Parsed article page
+            link (str): Article URL
+
+        Returns:
+            dict: title, publish_date (datetime, or None if it could not be
+            parsed), author, content and category
+        """
+        if cls.extractor is None:
+            raise NotImplementedError(f"{cls.__name__} has no extraction spec")
+        article = cls.extractor.extract(soup, source=cls.__name__)
+        article["publish_date"] = cls.parse_date(
+            article["publish_date"], **cls.extractor.date_kwargs
+        )
+        return article
+
+    @classmethod
+    def parse_metadata(cls, metadata, link):
+        """
+        Take an article's fields from its page's metadata.
+
+        This is the fast path of parse_article: it runs on the metadata
+        newswatch.metadata.read_metadata found in the raw page, before (and,
+        when it finds every field, instead of) parsing the page.
+
+        Args:
+            metadata (dict): JSON-LD article and meta tags of the page
+            link (str): Article URL
+
+        Returns:
+            dict: The fields found, with publish_date unparsed
+        """
+        return article_fields(metadata)
+
+    @classmethod
+    def parse_fields(cls, soup, link, fields):
+        """
+        Extract the fields the metadata fast path did not provide.
+
+        With an extraction spec only `fields` are extracted; otherwise
+        parse_article runs and its other fields are dropped.
+
+        Args:
+            soup (BeautifulSoup): Parsed article page
+            link (str): Article URL
+            fields (list): Names of the fields to extract
+
+        Returns:
+            dict: The fields, as parse_article returns them
+        """
+        if cls.extractor is None:
+            article = cls.parse_article(soup, link)
+            return {
+                name: value for name, value in article.items()
+                if name in fields or name not in FIELDS
+            }
+        article = cls.extractor.extract(soup, fields, cls.__name__)
+        if "publish_date" in article:
+            article["publish_date"] = cls.parse_date(
+                article["publish_date"], **cls.extractor.date_kwargs
+            )
+        return article
+
+    @classmethod
+    def _parse_article_page(cls, body, charset, link, html_parser):
+        fields = cls.metadata_fields
+        if cls.extractor is not None:
+            # articleBody has not been through the spec's cleaner (remove,
+            # drop_phrases, separator), so the content comes from the DOM
+            fields = [name for name in fields if name != "content"]
+        found = cls.parse_metadata(read_metadata(body, charset), link)
+        article = {name: found[name] for name in fields if found.get(name)}
+        if "publish_date" in article:
+            date_kwargs = cls.extractor.date_kwargs if cls.extractor is not None else {}
+            article["publish_date"] = cls.parse_date(article["publish_date"], **date_kwargs)
+            if article["publish_date"] is None:
+                del article["publish_date"]
+        current_stats().metadata.record(cls.__name__, article)
+
+        missing = [name for name in FIELDS if name not in article]
+        if missing:
+            soup = parse_markup(body, charset, html_parser)
+            article.update(cls.parse_fields(soup, link, missing))
+        return {**{name: article.pop(name) for name in FIELDS}, **article}
+
+    @classmethod
+    def _parse_page(cls, body, charset, link, html_parser, method):
+        if method == "parse_article" and cls.metadata_fields:
+            return cls._parse_article_page(body, charset, link, html_parser)
+        soup = parse_markup(body, charset, html_parser)
+        return getattr(cls, method)(soup, link)
+
+    async def extract_article(self, response, link, method="parse_article"):
+        """
+        Parse a page fetched with fetch_bytes and extract its fields.
+
+        Article pages go through the metadata fast path first, and are only
+        parsed for the fields it did not find. Runs in the parse pool when
+        one is set, so parsing does not hold up the event loop, and inline
+        otherwise.
+
+        Args:
+            response (tuple): (body, charset) from fetch_bytes
+            link (str): Article URL
+            method (str): Name of the classmethod doing the extraction
+
+        Returns:
+            dict: What `method` returned
+        """
+        body, charset = response
+        args = (body, charset, link, self.html_parser, method)
+        if self.parse_pool is None:
+            return self._parse_page(*args)
+        return await self.parse_pool.run(self._parse_page, *args)
+
+    async def queue_article(self, article, keyword, link, source):
+        """
+        Queue an extracted article unless it is older than start_date or
+        does not mention its keyword.
+
+        During scrape() the article is kept for the other keywords that list
+        it; with merge_keywords its row is held in the article registry
+        until every keyword is done.
+
+        Args:
+            article (dict): Fields returned by parse_article
+            keyword (str): Keyword the article was found for
+            link (str): Article URL
+            source (str): Source name stored with the article
+
+        Returns:
+            bool: True if the article was queued
+        """
+        if self.article_registry is not None:
+            self.article_registry.record_page(link, article, source)
+
+        publish_date = article["publish_date"]
+        if not publish_date:
+            logging.error(f"Error parsing date for article {link}")
+            return False
+        too_old = bool(self.start_date) and publish_date < self.start_date
+        if too_old and not self.any_keyword_word:
+            self.continue_scraping = False
+            return False
+
+        hits = self.keyword_matcher.matches(article["title"], article["content"])
+        if self.any_keyword_word:
+            text = f"{article['title']} {article['content'] or ''}".lower()
+            relevant = any(word in text for word in keyword.lower().replace(",", " ").split())
+        else:
+            relevant = hits[normalize(keyword)] > 0
+        current_stats().keywords.record(type(self).__name__, dropped=not relevant)
+        if not relevant:
+            logging.debug(f"Article {link} does not mention '{keyword}', skipping")
+            return False
+        if too_old:
+            self.continue_scraping = False
+            return False
+
+        item = {
+            "title": article["title"],
+            "publish_date": publish_date,
+            "author": article["author"],
+            "content": article["content"],
+            "keyword": keyword,
+            "category": article["category"],
+            "source": source,
+            "link": link,
+            # every keyword of the run the article mentions -> hits
+            "matched_keywords": self.keyword_matcher.named(hits),
+        }
+        registry = self.article_registry
+        if registry is None or not registry.accept(item, keyword):
+            await self.queue_.put(item)
+            if registry is not None:
+                current_stats().registry.record(type(self).__name__, rows=1)
+        return True
 
     @abstractmethod
     async def build_search_url(self, keyword, page):
@@ -25,6 +403,14 @@ class BaseScraper(AsyncScraper, ABC):
 
     @abstractmethod
     def parse_article_links(self, response_text):
+        """
+        Get the article links of a search page.
+
+        Returns:
+            iterable: Article URLs, or a dict of URL -> listing date when the
+            page prints the results' dates (see newswatch.listings); empty or
+            None when the page has no results
+        """
         pass
 
     @abstractmethod
@@ -36,7 +422,8 @@ class BaseScraper(AsyncScraper, ABC):
         found_articles = False
 
         while self.continue_scraping:
-            response_text = await self.build_search_url(keyword, page)
+            with page_type_scope("search"):
+                response_text = await self.build_search_url(keyword, page)
             if not response_text:
                 break
 
@@ -45,6 +432,11 @@ class BaseScraper(AsyncScraper, ABC):
                 break
 
             found_articles = True
+            filtered_hrefs, listed_too_old = prefilter_links(
+                filtered_hrefs, self.start_date, type(self).__name__, self.listing_date_slack
+            )
+            if listed_too_old:
+                self.continue_scraping = False
             continue_scraping = await self.process_page(filtered_hrefs, keyword)
             if not continue_scraping:
                 break
@@ -55,11 +447,51 @@ class BaseScraper(AsyncScraper, ABC):
             logging.info(f"No news found on {self.base_url} for keyword: '{keyword}'")
 
     async def process_page(self, filtered_hrefs, keyword):
-        tasks = [self.get_article(href, keyword) for href in filtered_hrefs]
+        tasks = [self.get_article_once(href, keyword) for href in filtered_hrefs]
         await self.run(tasks)
         return self.continue_scraping
 
+    async def get_article_once(self, link, keyword):
+        """
+        Run get_article for the first keyword to list a link, and only
+        queue_article, on the article it parsed, for every later one.
+
+        Args:
+            link (str): Article URL
+            keyword (str): Keyword the article was found for
+        """
+        registry = self.article_registry
+        if registry is None:
+            return await self.get_article(link, keyword)
+        source = type(self).__name__
+        while True:
+            page = registry.claim(link)
+            if page is None:
+                current_stats().registry.record(source, fetched=1)
+                try:
+                    return await self.get_article(link, keyword)
+                finally:
+                    registry.release(link)
+            page = await page
+            # None: the fetch failed, and the link is up for claiming again
+            if page is not None:
+                current_stats().registry.record(source, reused=1)
+                article, site = page
+                return await self.queue_article(article, keyword, link, site)
+
     async def scrape(self):
-        async with self:
-            tasks = [self.fetch_search_results(keyword) for keyword in self.keywords]
-            await self.run(tasks)
+        self.article_registry = ArticleRegistry(self.keywords, self.merge_keywords)
+        try:
+            async with self:
+                tasks = [self.fetch_search_results(keyword) for keyword in self.keywords]
+                await self.run(tasks)
+        finally:
+            # also when the run's timeout cancels the scraper: the queue is
+            # unbounded, so nothing here waits
+            registry, self.article_registry = self.article_registry, None
+            rows = registry.merged_rows()
+            for row in rows:
+                self.queue_.put_nowait(row)
+            current_stats().registry.record(
+                type(self).__name__, articles=len(registry.accepted), rows=len(rows)
+            )
@@ -1,18 +1,37 @@
 import logging
 from urllib.parse import urlencode
 
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 
-from .basescraper import BaseScraper
+from ..extract import Extractor
+from ..listings import add_listing
+from .basescraper import BaseScraper, class_pattern
 
 # from .sentiment import classify_sentiment_id
 
 
 class BatamposScraper(BaseScraper):
+    # fields read from the metadata (checked with benchmarks/bench_metadata.py)
+    metadata_fields = ("title", "publish_date", "author", "category")
+
+    extractor = Extractor({
+        "title": ["h1.entry-title, h1.tdb-title-text", "h1"],
+        "author": {"select": ".td-post-author-name a, .tdb-author-name a", "default": "Admin"},
+        "publish_date": {"select": "time.entry-date", "attr": "datetime", "default": ""},
+        "category": {"select": "a.td-post-category, .tdb-category a", "default": ""},
+        "content": {
+            "select": [".tdb_single_content", ".tdb-block-inner.td-fix-index"],
+            "paragraphs": "p",
+            "drop_phrases": ["Baca Juga"],
+            "default": "",
+        },
+    })
+
     def __init__(self, keywords, concurrency=12, start_date=None, queue_=None):
         super().__init__(keywords, concurrency, queue_)
         self.base_url = "batampos.co.id"
         self.start_date = start_date
+        self.search_strainer = SoupStrainer("div", class_=class_pattern("tdb_module_loop"))
 
     async def build_search_url(self, keyword, page):
         # BatamPos menggunakan format: /page/{page}/?s=keyword
@@ -28,7 +47,7 @@ class BatamposScraper(BaseScraper):
         if not response_text:
             return None
 
-        soup = BeautifulSoup(response_text, "html.parser")
+        soup = self.parse_search_page(response_text)
         
         # Cari semua artikel dengan class "tdb_module_loop"
         articles = soup.find_all("div", class_="tdb_module_loop")
@@ -36,7 +55,7 @@ class BatamposScraper(BaseScraper):
         if not articles:
             return None
 
-        filtered_hrefs = set()
+        filtered_hrefs = {}
         for article in articles:
             # Cari link di dalam h3.entry-title > a
             title_link = article.select_one("h3.entry-title a")
@@ -44,90 +63,20 @@ class BatamposScraper(BaseScraper):
                 href = title_link["href"]
                 # Filter hanya artikel batampos.co.id
                 if "batampos.co.id" in href:
-                    filtered_hrefs.add(href)
+                    # Tanggal terbit di hasil pencarian (lihat newswatch.listings)
+                    time_tag = article.select_one("time[datetime]")
+                    listed_at = self.parse_listing_date(time_tag["datetime"]) if time_tag else None
+                    add_listing(filtered_hrefs, href, listed_at)
         
         return filtered_hrefs if filtered_hrefs else None
 
     async def get_article(self, link, keyword):
-        response_text = await self.fetch(link, timeout=30)
-        if not response_text:
+        response = await self.fetch_bytes(link, timeout=30)
+        if not response:
             logging.warning(f"No response for {link}")
             return
-        soup = BeautifulSoup(response_text, "html.parser")
-
         try:
-            # Title - dalam h1.entry-title atau h1.tdb-title-text
-            title_elem = soup.select_one("h1.entry-title, h1.tdb-title-text")
-            if not title_elem:
-                title_elem = soup.find("h1")
-            title = title_elem.get_text(strip=True) if title_elem else ""
-            
-            if not title:
-                logging.error(f"Title not found for article {link}")
-                return
-
-            # Publish date - dalam time.entry-date
-            publish_date_str = ""
-            date_elem = soup.select_one("time.entry-date")
-            if date_elem:
-                # Coba ambil dari datetime attribute dulu
-                publish_date_str = date_elem.get("datetime", "")
-                if not publish_date_str:
-                    publish_date_str = date_elem.get_text(strip=True)
-            
-            # Author - dalam div.td-post-author-name atau span.td-post-author-name
-            author = "Admin"  # Default
-            author_elem = soup.select_one(".td-post-author-name a, .tdb-author-name a")
-            if author_elem:
-                author = author_elem.get_text(strip=True)
-
-            # Category - dalam a.td-post-category atau kategori di breadcrumb
-            category = ""
-            category_elem = soup.select_one("a.td-post-category, .tdb-category a")
-            if category_elem:
-                category = category_elem.get_text(strip=True)
-
-            # Content - ambil semua tag <p> dari .tdb_single_content
-            content_div = soup.select_one(".tdb_single_content")
-            
-            if not content_div:
-                # Fallback ke .tdb-block-inner.td-fix-index
-                content_div = soup.select_one(".tdb-block-inner.td-fix-index")
-            
-            if content_div:
-                # Ambil semua tag <p>
-                paragraphs = content_div.find_all("p")
-                content_parts = []
-                for p in paragraphs:
-                    p_text = p.get_text(strip=True)
-                    # Skip paragraf yang mengandung "Baca Juga" atau kosong
-                    if p_text and "Baca Juga" not in p_text:
-                        content_parts.append(p_text)
-                content = " ".join(content_parts)
-            else:
-                content = ""
-            
-            # sentiment = classify_sentiment_id(title)
-
-            publish_date = self.parse_date(publish_date_str)
-            if not publish_date:
-                logging.error(f"Error parsing date for article {link}: {publish_date_str}")
-                return
-            if self.start_date and publish_date < self.start_date:
-                self.continue_scraping = False
-                return
-
-            item = {
-                "title": title,
-                "publish_date": publish_date,
-                "author": author,
-                "content": content,
-                "keyword": keyword,
-                "category": category,
-                "source": self.base_url,
-                "link": link,
-                # "sentiment": sentiment
-            }
-            await self.queue_.put(item)
+            article = await self.extract_article(response, link)
+            await self.queue_article(article, keyword, link, self.base_url)
         except Exception as e:
-            logging.error(f"Error parsing article {link}: {e}")
\ No newline at end of file
+            logging.error(f"Error parsing article {link}: {e}")
@@ -1,18 +1,22 @@
 import logging
 from urllib.parse import unquote, urlencode
 
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 
-from .basescraper import BaseScraper
+from ..extract import Cleaner, class_prefix
+from .basescraper import BaseScraper, class_pattern
 
 # from .sentiment import classify_sentiment_id
 
 
 class BisnisScraper(BaseScraper):
+    content_cleaner = Cleaner(remove=[class_prefix("baca-juga-box", "div")], separator=" ")
+
     def __init__(self, keywords, concurrency=12, start_date=None, queue_=None):
         super().__init__(keywords, concurrency, queue_)
         self.base_url = "bisnis.com"
         self.start_date = start_date
+        self.search_strainer = SoupStrainer("a", class_=class_pattern("artLink"))
 
     async def build_search_url(self, keyword, page):
         # https://search.bisnis.com/?q=prabowo&page=2
@@ -28,7 +32,7 @@ class BisnisScraper(BaseScraper):
         if not response_text:
             return None
 
-        soup = BeautifulSoup(response_text, "html.parser")
+        soup = self.parse_search_page(response_text)
         articles = soup.find_all("a", class_="artLink artLinkImg")
         if not articles:
             return None
@@ -40,66 +44,48 @@ class BisnisScraper(BaseScraper):
 
     async def get_article(self, link, keyword):
         # Use shorter timeout for article pages - 10 seconds
-        response_text = await self.fetch(link, timeout=30)
-        if not response_text:
+        response = await self.fetch_bytes(link, timeout=30)
+        if not response:
             logging.warning(f"No response for {link}")
             return
-        soup = BeautifulSoup(response_text, "html.parser")
-
         try:
-            breadcrumb = soup.select_one(".breadcrumb")
-            breadcrumb_items = (
-                breadcrumb.select(".breadcrumbItem") if breadcrumb else []
-            )
-
-            category_parts = []
-            for item in breadcrumb_items:
-                if "Home" not in item.get_text(strip=True):
-                    link_text = item.select_one(".breadcrumbLink")
-                    if link_text:
-                        category_parts.append(link_text.get_text(strip=True))
-
-            category = " - ".join(category_parts) if category_parts else ""
-
-            title = soup.select_one("h1.detailsTitleCaption").get_text()
-
-            publish_date_str = soup.select_one(".detailsAttributeDates").get_text(
-                strip=True
-            )
-            author = soup.select_one(".authorName").get_text(strip=True).split("-")[0]
-
-            content_div = soup.select_one("article.detailsContent.force-17.mt40")
-
-            # loop through paragraphs and remove those with class patterns like "read__others"
-            for tag in content_div.find_all(["div"]):
-                if tag and any(
-                    cls.startswith("baca-juga-box") for cls in tag.get("class", [])
-                ):
-                    tag.extract()
-
-            content = content_div.get_text(separator=" ", strip=True)
-            
-            # sentiment = classify_sentiment_id(title)
-
-            publish_date = self.parse_date(publish_date_str)
-            if not publish_date:
-                logging.error(f"Error parsing date for article {link}")
-                return
-            if self.start_date and publish_date < self.start_date:
-                self.continue_scraping = False
-                return
-
-            item = {
-                "title": title,
-                "publish_date": publish_date,
-                "author": author,
-                "content": content,
-                "keyword": keyword,
-                "category": category,
-                "source": self.base_url,
-                "link": link,
-                # "sentiment": sentiment
-            }
-            await self.queue_.put(item)
+            article = await self.extract_article(response, link)
+            await self.queue_article(article, keyword, link, self.base_url)
         except Exception as e:
             logging.error(f"Error parsing article {link}: {e}")
+
+    @classmethod
+    def parse_article(cls, soup, link):
+        breadcrumb = soup.select_one(".breadcrumb")
+        breadcrumb_items = (
+            breadcrumb.select(".breadcrumbItem") if breadcrumb else []
+        )
+
+        category_parts = []
+        for item in breadcrumb_items:
+            if "Home" not in item.get_text(strip=True):
+                link_text = item.select_one(".breadcrumbLink")
+                if link_text:
+                    category_parts.append(link_text.get_text(strip=True))
+
+        category = " - ".join(category_parts) if category_parts else ""
+
+        title = soup.select_one("h1.detailsTitleCaption").get_text()
+
+        publish_date_str = soup.select_one(".detailsAttributeDates").get_text(
+            strip=True
+        )
+        author = soup.select_one(".authorName").get_text(strip=True).split("-")[0]
+
+        content_div = soup.select_one("article.detailsContent.force-17.mt40")
+        content = cls.content_cleaner.text(content_div)
+        
+        # sentiment = classify_sentiment_id(title)
+
+        return {
+            "title": title,
+            "publish_date": cls.parse_date(publish_date_str),
+            "author": author,
+            "content": content,
+            "category": category,
+        }
@@ -1,19 +1,23 @@
 import logging
 from urllib.parse import urlencode
 
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 
-from .basescraper import BaseScraper
+from ..extract import Cleaner, class_prefix
+from .basescraper import BaseScraper, class_pattern
 
 # from .sentiment import classify_sentiment_id
 
 
 class BloombergTechnozScraper(BaseScraper):
+    content_cleaner = Cleaner(remove=[class_prefix("smallbox-pilihan", "div, span")], separator=" ")
+
     def __init__(self, keywords, concurrency=12, start_date=None, queue_=None):
         super().__init__(keywords, concurrency, queue_)
         self.base_url = "https://www.bloombergtechnoz.com"
         self.start_date = start_date
         self.continue_scraping = True
+        self.search_strainer = SoupStrainer("div", class_=class_pattern("card-box"))
 
     async def build_search_url(self, keyword, page):
         # https://www.bloombergtechnoz.com/search?query=ekonomi+indonesia&type=berita&pagenum=1
@@ -25,7 +29,7 @@ class BloombergTechnozScraper(BaseScraper):
         return await self.fetch(url)
 
     def parse_article_links(self, response_text):
-        soup = BeautifulSoup(response_text, "html.parser")
+        soup = self.parse_search_page(response_text)
         articles = soup.select("div.card-box.ft150.margin-bottom-xl a[href]")
 
         if not articles:
@@ -35,61 +39,52 @@ class BloombergTechnozScraper(BaseScraper):
         return filtered_hrefs
 
     async def get_article(self, link, keyword):
-        response_text = await self.fetch(link)
-        if not response_text:
+        response = await self.fetch_bytes(link)
+        if not response:
             logging.warning(f"No response for {link}")
             return
-        soup = BeautifulSoup(response_text, "html.parser")
         try:
-            category = soup.select_one("ul.sitemap").get_text(" ", strip=True)
-            title = soup.select_one(".title.margin-bottom-sm").get_text()
+            article = await self.extract_article(response, link)
 
-            author = soup.select_one("h5.title.margin-bottom-ss a").get_text(strip=True)
-            publish_date_str = soup.select("h5.title.fw4.cl-gray")[0].get_text(
-                strip=True
-            )
+            next_page_link = article.pop("next_page_link")
+            if next_page_link:
+                # long articles continue on a second page
+                response2 = await self.fetch_bytes(next_page_link)
+                if response2:
+                    page2 = await self.extract_article(response2, link, "parse_next_page")
+                    article["content"] += page2["content"]
 
-            content_div = soup.select_one(".detail-in")
+            await self.queue_article(article, keyword, link, self.base_url.split("www.")[1])
+        except Exception as e:
+            logging.error(f"Error parsing article {link}: {e}")
 
-            next_page_link = soup.select_one(".pager__next")
+    @classmethod
+    def parse_article(cls, soup, link):
+        category = soup.select_one("ul.sitemap").get_text(" ", strip=True)
+        title = soup.select_one(".title.margin-bottom-sm").get_text()
 
-            # loop through paragraphs and remove those with class patterns like "track-*"
-            for tag in content_div.find_all(["div", "span"]):
-                if tag and any(
-                    cls.startswith("smallbox-pilihan") for cls in tag.get("class", [])
-                ):
-                    tag.extract()
+        author = soup.select_one("h5.title.margin-bottom-ss a").get_text(strip=True)
+        publish_date_str = soup.select("h5.title.fw4.cl-gray")[0].get_text(
+            strip=True
+        )
 
-            if next_page_link:
-                # build URL for the next page
-                response_text2 = await self.fetch(next_page_link.get("href"))
-                if response_text2:
-                    soup2 = BeautifulSoup(response_text2, "html.parser")
-                    content_div2 = soup2.select_one(".detail-in")
-                    content = content_div.get_text(
-                        separator=" ", strip=True
-                    ) + content_div2.get_text(separator=" ", strip=True)
-
-            # sentiment = classify_sentiment_id(title)
-            publish_date = self.parse_date(publish_date_str)
-            if not publish_date:
-                logging.error(f"Error parsing date for article {link}")
-                return
-            if self.start_date and publish_date < self.start_date:
-                self.continue_scraping = False
-                return
-
-            item = {
-                "title": title,
-                "publish_date": publish_date,
-                "author": author,
-                "content": content,
-                "keyword": keyword,
-                "category": category,
-                "source": self.base_url.split("www.")[1],
-                "link": link,
-              #   "sentiment": sentiment
-            }
-            await self.queue_.put(item)
-        except Exception as e:
-            logging.error(f"Error parsing article {link}: {e}")
+        content_div = soup.select_one(".detail-in")
+
+        next_page_link = soup.select_one(".pager__next")
+        content = cls.content_cleaner.text(content_div)
+
+        # sentiment = classify_sentiment_id(title)
+
+        return {
+            "title": title,
+            "publish_date": cls.parse_date(publish_date_str),
+            "author": author,
+            "content": content,
+            "category": category,
+            "next_page_link": next_page_link.get("href") if next_page_link else None,
+        }
+
+    @classmethod
+    def parse_next_page(cls, soup, link):
+        content_div2 = soup.select_one(".detail-in")
+        return {"content": content_div2.get_text(separator=" ", strip=True)}
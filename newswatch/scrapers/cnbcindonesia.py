@@ -1,18 +1,39 @@
 import logging
 from urllib.parse import urlencode
 
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 
-from .basescraper import BaseScraper
+from ..extract import Extractor, class_prefix
+from ..listings import add_listing
+from .basescraper import BaseScraper, class_pattern
 
 # from .sentiment import classify_sentiment_id
 
 
 class CNBCScraper(BaseScraper):
+    # fields read from the metadata (checked with benchmarks/bench_metadata.py)
+    metadata_fields = ("title", "publish_date", "author", "category")
+
+    extractor = Extractor({
+        "title": "h1.mb-4.text-32.font-extrabold",
+        "author": {"select": "div.mb-1.text-base.font-semibold", "index": 1},
+        "publish_date": "div.text-cm.text-gray",
+        "category": "a.text-xs.font-semibold[href='#']",
+        # dd/mm/yyyy: without a locale dateparser would only read it day-first
+        # because of the Indonesian day name in front
+        "date_locales": ["id"],
+        "content": {
+            "select": "div.detail-text",
+            "remove": [class_prefix("sisip_", "table, div"), class_prefix("link_sisip", "table, div")],
+            "separator": "\n",
+        },
+    })
+
     def __init__(self, keywords, concurrency=12, start_date=None, queue_=None):
         super().__init__(keywords, concurrency, queue_)
         self.base_url = "https://www.cnbcindonesia.com"
         self.start_date = start_date
+        self.search_strainer = SoupStrainer(class_=class_pattern("nhl-list"))
 
     async def build_search_url(self, keyword, page):
         # https://www.cnbcindonesia.com/search?query=&fromdate=&page=
@@ -25,68 +46,32 @@ class CNBCScraper(BaseScraper):
         return await self.fetch(url)
 
     def parse_article_links(self, response_text):
-        soup = BeautifulSoup(response_text, "html.parser")
+        soup = self.parse_search_page(response_text)
         articles = soup.select(".nhl-list a.group[href]")
         if not articles:
             return None
 
-        filtered_hrefs = {a.get("href") for a in articles if a.get("href")}
+        filtered_hrefs = {}
+        for a in articles:
+            if not a.get("href"):
+                continue
+            # "Senin, 12/08/2024 14:30 WIB", as on the article page
+            date_tag = a.select_one(".text-cm.text-gray")
+            listed_at = (
+                self.parse_listing_date(date_tag.get_text(strip=True), **self.extractor.date_kwargs)
+                if date_tag
+                else None
+            )
+            add_listing(filtered_hrefs, a.get("href"), listed_at)
         return filtered_hrefs
 
     async def get_article(self, link, keyword):
-        response_text = await self.fetch(link)
-        if not response_text:
+        response = await self.fetch_bytes(link)
+        if not response:
             logging.warning(f"No response for {link}")
             return
-        soup = BeautifulSoup(response_text, "html.parser")
         try:
-            category = soup.select_one("a.text-xs.font-semibold[href='#']").get_text(
-                strip=True
-            )
-            title = soup.select_one("h1.mb-4.text-32.font-extrabold").get_text(
-                strip=True
-            )
-            author = soup.select("div.mb-1.text-base.font-semibold")[1].get_text(
-                strip=True
-            )
-            publish_date_str = soup.select_one("div.text-cm.text-gray").get_text(
-                strip=True
-            )
-
-            content_div = soup.find("div", {"class": "detail-text"})
-
-            # loop through paragraphs and remove those with class patterns like "sisip-*"
-            for tag in content_div.find_all(["table", "div"]):
-                class_list = tag.get("class", [])
-                if any(
-                    cls.startswith("sisip_") or cls.startswith("link_sisip")
-                    for cls in class_list
-                ):
-                    tag.extract()
-
-            content = content_div.get_text(separator="\n", strip=True)
-            
-          #   sentiment = classify_sentiment_id(title)
-
-            publish_date = self.parse_date(publish_date_str)
-            if not publish_date:
-                logging.error(f"Error parsing date for article {link}")
-                return
-            if self.start_date and publish_date < self.start_date:
-                self.continue_scraping = False
-                return
-
-            item = {
-                "title": title,
-                "publish_date": publish_date,
-                "author": author,
-                "content": content,
-                "keyword": keyword,
-                "category": category,
-                "source": self.base_url.split("www.")[1],
-                "link": link,
-           #      "sentiment": sentiment
-            }
-            await self.queue_.put(item)
+            article = await self.extract_article(response, link)
+            await self.queue_article(article, keyword, link, self.base_url.split("www.")[1])
         except Exception as e:
             logging.error(f"Error parsing article {link}: {e}")
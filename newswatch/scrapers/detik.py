@@ -1,22 +1,44 @@
 import logging
 import re
-from datetime import date
+from datetime import date, datetime, timedelta, timezone
 from urllib.parse import urlencode
 
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 
-from .basescraper import BaseScraper
+from ..extract import Extractor
+from ..listings import add_listing
+from .basescraper import BaseScraper, class_pattern
 
 # from .sentiment import classify_sentiment_id
 
+# search results carry their publish time as a Unix timestamp
+WIB = timezone(timedelta(hours=7))
+
 
 class DetikScraper(BaseScraper):
+    # fields read from the metadata (checked with benchmarks/bench_metadata.py)
+    # the page's author line ends in " - detikNews", the metadata's does not
+    metadata_fields = ("title", "publish_date", "category")
+
+    extractor = Extractor({
+        "title": ".detail__title",
+        "author": ".detail__author",
+        "publish_date": ".detail__date",
+        "category": "div.page__breadcrumb a",
+        "content": {
+            "select": "div.detail__body-text",
+            "remove": ["table.linksisip"],
+            "separator": "\n",
+        },
+    })
+
     def __init__(self, keywords, concurrency=12, start_date=None, queue_=None):
         super().__init__(keywords, concurrency, queue_)
         self.base_url = "https://www.detik.com"
         self.start_date = start_date
         self.continue_scraping = True
         self.href_pattern = re.compile(r".*\.detik\.com/.*/d-\d+")
+        self.search_strainer = SoupStrainer(class_=class_pattern("list-content__item"))
 
     async def build_search_url(self, keyword, page):
         # https://www.detik.com/search/searchall?query=&page=&result_type=latest&fromdatex=&todatex=
@@ -32,63 +54,39 @@ class DetikScraper(BaseScraper):
         return await self.fetch(url)
 
     def parse_article_links(self, response_text):
-        soup = BeautifulSoup(response_text, "html.parser")
+        soup = self.parse_search_page(response_text)
         articles = soup.select(".list-content__item .media__link")
         if not articles:
             return None
 
-        filtered_hrefs = {
-            a.get("href")
-            for a in articles
-            if a.get("href")
-            and self.href_pattern.match(a.get("href"))
-            and "wolipop.detik.com" not in a.get("href")
-            and "/detiktv/" not in a.get("href")
-            and "/pop/" not in a.get("href")
-        }
+        filtered_hrefs = {}
+        for a in articles:
+            href = a.get("href")
+            if (
+                href
+                and self.href_pattern.match(href)
+                and "wolipop.detik.com" not in href
+                and "/detiktv/" not in href
+                and "/pop/" not in href
+            ):
+                add_listing(filtered_hrefs, href, self.listing_date(a))
         return filtered_hrefs
 
+    @staticmethod
+    def listing_date(link):
+        item = link.find_parent(class_="list-content__item")
+        stamp = item.select_one(".media__date [d-time]") if item else None
+        if stamp is None or not stamp["d-time"].isdigit():
+            return None
+        return datetime.fromtimestamp(int(stamp["d-time"]), WIB).replace(tzinfo=None)
+
     async def get_article(self, link, keyword):
-        response_text = await self.fetch(f"{link}?single=1")
-        if not response_text:
+        response = await self.fetch_bytes(f"{link}?single=1")
+        if not response:
             logging.warning(f"No response for {link}")
             return
-        soup = BeautifulSoup(response_text, "html.parser")
         try:
-            category = soup.find("div", class_="page__breadcrumb").find("a").get_text()
-            title = soup.select_one(".detail__title").get_text(strip=True)
-            author = soup.select_one(".detail__author").get_text(strip=True)
-            publish_date_str = soup.select_one(".detail__date").get_text(strip=True)
-
-            content_div = soup.find("div", {"class": "detail__body-text"})
-
-            # loop through paragraphs and remove those with class patterns like "track-*"
-            for tag in content_div.find_all(["table"]):
-                if "linksisip" in tag.get("class", []):
-                    tag.extract()
-
-            content = content_div.get_text(separator="\n", strip=True)
-           #  sentiment = classify_sentiment_id(title)
-
-            publish_date = self.parse_date(publish_date_str)
-            if not publish_date:
-                logging.error(f"Error parsing date for article {link}")
-                return
-            if self.start_date and publish_date < self.start_date:
-                self.continue_scraping = False
-                return
-
-            item = {
-                "title": title,
-                "publish_date": publish_date,
-                "author": author,
-                "content": content,
-                "keyword": keyword,
-                "category": category,
-                "source": self.base_url.split("www.")[1],
-                "link": link,
-           #      "sentiment": sentiment
-            }
-            await self.queue_.put(item)
+            article = await self.extract_article(response, link)
+            await self.queue_article(article, keyword, link, self.base_url.split("www.")[1])
         except Exception as e:
             logging.error(f"Error parsing article {link}: {e}")
@@ -2,14 +2,66 @@ import logging
 import re
 from urllib.parse import urlencode
 
-from bs4 import BeautifulSoup
-
+from ..extract import Extractor
 from .basescraper import BaseScraper
 
 # from .sentiment import classify_sentiment_id
 
 
 class KepriAntaranewsScraper(BaseScraper):
+    # the search and its tag-page fallback list loosely related articles
+    any_keyword_word = True
+    # several page layouts, tried in order
+    extractor = Extractor({
+        "title": [".wrap__article-detail-title", ".post-title", ".article-title", "h1"],
+        "author": {
+            "select": [".text-muted.mt-2.small", ".author", ".post-author", ".by-author"],
+            "default": "ANTARA Kepri",
+        },
+        "publish_date": {
+            "select": [
+                ".list-inline-item.mr-2", ".post-date", ".publish-date", ".date",
+                "meta[property='article:published_time']", "meta[name=date]", "time",
+            ],
+            "index": -1,
+            "attr": "content",
+            "default": "",
+        },
+        "category": {
+            "select": [".breadcrumbs__item", ".breadcrumb-item", ".category", ".post-category"],
+            "index": 1,
+            "default": "Kepri",
+        },
+        "content": {
+            "select": [
+                ".wrap__article-detail-content.post-content", ".post-content",
+                ".article-content", ".content",
+            ],
+            "remove": [":is(span, p):is(.baca-juga, .text-muted, .track-, .related)"],
+            "drop_phrases": ["baca juga", "iklan", "advertisement", "related"],
+            "separator": "\n",
+        },
+        "date_locales": ["id"],
+    })
+
+    # Multiple selectors to try for different page layouts
+    link_selectors = [
+        # Main Antara News style selectors
+        ".card__post.card__post-list.card__post__transition.mt-30 a",
+        ".card__post a",
+        ".post-item a",
+        ".article-item a",
+
+        # Homepage/category page selectors
+        ".card a",
+        ".post a",
+        ".news-item a",
+
+        # Generic article link patterns
+        "a[href*='/berita/']",
+        "a[href*='/news/']",
+    ]
+
     def __init__(self, keywords, concurrency=12, start_date=None, queue_=None):
         super().__init__(keywords, concurrency, queue_)
         self.base_url = "https://kepri.antaranews.com"
@@ -68,28 +120,10 @@ class KepriAntaranewsScraper(BaseScraper):
         if not response_text:
             return None
             
-        soup = BeautifulSoup(response_text, "html.parser")
-        found_links = []
-        
-        # Multiple selectors to try for different page layouts
-        selectors_to_try = [
-            # Main Antara News style selectors
-            ".card__post.card__post-list.card__post__transition.mt-30 a",
-            ".card__post a",
-            ".post-item a",
-            ".article-item a",
-            
-            # Homepage/category page selectors
-            ".card a",
-            ".post a", 
-            ".news-item a",
-            
-            # Generic article link patterns
-            "a[href*='/berita/']",
-            "a[href*='/news/']",
-        ]
-        
-        for selector in selectors_to_try:
+        soup = self.parse_html(response_text)
+
+        def links_for(selector):
+            found = []
             articles = soup.select(selector)
             if articles:
                 logging.info(f"Found {len(articles)} potential links with selector: {selector}")
@@ -99,13 +133,14 @@ class KepriAntaranewsScraper(BaseScraper):
                         # Handle relative URLs
                         if href.startswith('/'):
                             href = self.base_url + href
-                        
+
                         # Check if it matches our pattern
                         if self.href_pattern.match(href):
-                            found_links.append(href)
-                
-                if found_links:
-                    break
+                            found.append(href)
+            return found
+
+        # the selector that found links most often is tried first
+        found_links = self.first_match("links", self.link_selectors, links_for) or []
         
         # If still no links found, try finding ANY links that look like article URLs
         if not found_links:
@@ -139,182 +174,19 @@ class KepriAntaranewsScraper(BaseScraper):
     async def get_article(self, link, keyword):
         """
         Extract article content from individual article page
-        WITH KEYWORD RELEVANCE FILTERING
+        (queue_article drops it unless it mentions the keyword)
         """
-        response_text = await self.fetch(f"{link}")
-        if not response_text:
+        response = await self.fetch_bytes(f"{link}")
+        if not response:
             logging.warning(f"No response for {link}")
             return
             
-        soup = BeautifulSoup(response_text, "html.parser")
-        
         try:
-            # Extract category - try multiple selectors
-            category = ""
-            category_selectors = [
-                ".breadcrumbs__item",
-                ".breadcrumb-item",
-                ".category",
-                ".post-category"
-            ]
-            
-            for selector in category_selectors:
-                category_elements = soup.select(selector)
-                if len(category_elements) > 1:
-                    category = category_elements[1].get_text(strip=True)
-                    break
-                elif len(category_elements) == 1:
-                    category = category_elements[0].get_text(strip=True)
-                    break
-            
-            if not category:
-                category = "Kepri"  # Default category for regional news
+            article = await self.extract_article(response, link)
+            title = article["title"]
 
-            # Extract title - try multiple selectors
-            title = ""
-            title_selectors = [
-                ".wrap__article-detail-title",
-                ".post-title",
-                ".article-title",
-                "h1"
-            ]
-            
-            for selector in title_selectors:
-                title_element = soup.select_one(selector)
-                if title_element:
-                    title = title_element.get_text(strip=True)
-                    break
-            
-            if not title:
-                logging.warning(f"Could not extract title from {link}")
-                return
-
-            # Extract author - try multiple selectors
-            author = ""
-            author_selectors = [
-                ".text-muted.mt-2.small",
-                ".author",
-                ".post-author",
-                ".by-author"
-            ]
-            
-            for selector in author_selectors:
-                author_element = soup.select_one(selector)
-                if author_element:
-                    author = author_element.get_text(strip=True)
-                    break
-            
-            if not author:
-                author = "ANTARA Kepri"  # Default author
-
-            # Extract publish date - try multiple selectors
-            publish_date_str = ""
-            date_selectors = [
-                ".list-inline-item.mr-2",
-                ".post-date",
-                ".publish-date",
-                ".date"
-            ]
-            
-            for selector in date_selectors:
-                date_elements = soup.select(selector)
-                if date_elements:
-                    publish_date_str = date_elements[-1].get_text(strip=True)
-                    break
-            
-            # Try alternative date extraction from meta tags
-            if not publish_date_str:
-                date_meta = soup.find("meta", {"property": "article:published_time"}) or \
-                           soup.find("meta", {"name": "date"}) or \
-                           soup.find("time")
-                if date_meta:
-                    publish_date_str = date_meta.get("content") or date_meta.get_text(strip=True)
-
-            # Extract content - try multiple selectors
-            content = ""
-            content_selectors = [
-                ".wrap__article-detail-content.post-content",
-                ".post-content",
-                ".article-content",
-                ".content"
-            ]
-            
-            
-
-            content_div = None
-            for selector in content_selectors:
-                content_div = soup.select_one(selector)
-                if content_div:
-                    break
-            
-            if content_div:
-                # Remove unwanted elements
-                for tag in content_div.find_all(["span", "p"]):
-                    classes = tag.get("class", [])
-                    if any(cls in ["baca-juga", "text-muted", "track-", "related"] 
-                           for cls in classes):
-                        tag.extract()
-                
-                # Remove advertisements and related content
-                for tag in content_div.find_all(text=lambda text: 
-                    text and any(word in text.lower() 
-                    for word in ["baca juga", "iklan", "advertisement", "related"])):
-                    if tag.parent:
-                        tag.parent.extract()
-                
-                content = content_div.get_text(separator="\n", strip=True)
-            
-            if not content:
-                logging.warning(f"Could not extract content from {link}")
-                return
-            
-         #    sentiment = classify_sentiment_id(title)
-
-            # *** KEYWORD RELEVANCE CHECK ***
-            # Check if the article is actually related to our search keyword
-            search_text = f"{title} {content}".lower()
-            keyword_lower = keyword.lower()
-            
-            # Split keyword by common separators
-            keywords_to_check = [kw.strip() for kw in keyword_lower.replace(',', ' ').split()]
-            
-            # Check if any keyword appears in title or content
-            keyword_found = False
-            for kw in keywords_to_check:
-                if kw in search_text:
-                    keyword_found = True
-                    break
-            
-            if not keyword_found:
-                logging.info(f"Article '{title[:50]}...' doesn't contain keyword '{keyword}' - skipping")
-                return
-
-            # Parse and validate date
-            publish_date = self.parse_date(publish_date_str, locales=["id"])
-            if not publish_date:
-                logging.error(f"Error parsing date '{publish_date_str}' for article {link}")
-                return
-                
-            # Check date filter
-            if self.start_date and publish_date < self.start_date:
-                self.continue_scraping = False
-                return
-
-            # Create article item
-            item = {
-                "title": title,
-                "publish_date": publish_date,
-                "author": author,
-                "content": content,
-                "keyword": keyword,
-                "category": category,
-                "source": "kepri.antaranews.com",
-                "link": link,
-             #    "sentiment": sentiment
-            }
-            
-            await self.queue_.put(item)
-            logging.info(f"✅ Successfully scraped relevant article: {title[:50]}...")
+            if await self.queue_article(article, keyword, link, "kepri.antaranews.com"):
+                logging.info(f"✅ Successfully scraped relevant article: {title[:50]}...")
             
         except Exception as e:
             logging.error(f"Error parsing article {link}: {e}")
@@ -327,4 +199,4 @@ class KepriAntaranewsScraper(BaseScraper):
             await super().scrape()
         except Exception as e:
             logging.error(f"Error in KepriAntaranewsScraper: {e}")
-            raise
\ No newline at end of file
+            raise
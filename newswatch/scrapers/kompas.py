@@ -1,18 +1,55 @@
 import logging
-import re
 
-from bs4 import BeautifulSoup
-from .basescraper import BaseScraper
+from bs4 import SoupStrainer
+
+from ..extract import Extractor, class_prefix
+from ..listings import add_listing
+from .basescraper import BaseScraper, class_pattern
 
 # from .sentiment import classify_sentiment_id
 
 
 class KompasScraper(BaseScraper):
+    # fields read from the metadata (checked with benchmarks/bench_metadata.py)
+    # the page's category is the breadcrumb path, the metadata's one section
+    metadata_fields = ("title", "publish_date", "author")
+    # the search lists the first publish time, the article's date is its last
+    # update, which can come any time later: fetch every result
+    listing_date_slack = None
+
+    extractor = Extractor({
+        "title": ".read__title",
+        "author": ".credit-title-name",
+        "publish_date": {
+            "select": ".read__time",
+            # "Kompas.com - 12/08/2024, 14:30 WIB", maybe followed by
+            # "Diperbarui <date>"; the update time wins
+            "pattern": r"- (?:.*Diperbarui)?\s*(.+)",
+        },
+        "category": {"select": ".breadcrumb__wrap", "separator": "/"},
+        "content": {
+            "select": ".read__content",
+            "remove": [
+                class_prefix("inject-baca-juga", "div, span"),
+                class_prefix("kompasidRec", "div, span"),
+            ],
+            "drop_phrases": [
+                r"Simak.*WhatsApp Channel",
+                r"https://www\.whatsapp\.com/channel/",
+                r"Baca juga: ",
+            ],
+            "phrase_tags": ["i", "p"],
+            "separator": " ",
+        },
+        "date_locales": ["id"],
+    })
+
     def __init__(self, keywords, concurrency=12, start_date=None, queue_=None):
         super().__init__(keywords, concurrency, queue_)
         self.base_url = "https://www.kompas.com"
         self.start_date = start_date
         self.continue_scraping = True
+        self.search_strainer = SoupStrainer(class_=class_pattern("article-link"))
 
     async def build_search_url(self, keyword, page):
         return await self.fetch(
@@ -21,83 +58,31 @@ class KompasScraper(BaseScraper):
         )
 
     def parse_article_links(self, response_text):
-        soup = BeautifulSoup(response_text, "html.parser")
+        soup = self.parse_search_page(response_text)
         articles = soup.select(".article-link[href]")
         if not articles:
             return None
 
-        filtered_hrefs = {
-            a.get("href")
-            for a in articles
-            if a.get("href") and "video.kompas.com" not in a.get("href")
-        }
+        filtered_hrefs = {}
+        for a in articles:
+            href = a.get("href")
+            if not href or "video.kompas.com" in href:
+                continue
+            # the link wraps the result, dated "12/08/2024, 14:30 WIB"
+            date_tag = a.select_one(".articlePost-date")
+            listed_at = None
+            if date_tag:
+                listed_at = self.parse_listing_date(date_tag.get_text(strip=True), locales=["id"])
+            add_listing(filtered_hrefs, href, listed_at)
         return filtered_hrefs
 
     async def get_article(self, link, keyword):
-        response_text = await self.fetch(f"{link}?page=all")
-        if not response_text:
+        response = await self.fetch_bytes(f"{link}?page=all")
+        if not response:
             logging.warning(f"No response for {link}")
             return
-        soup = BeautifulSoup(response_text, "html.parser")
         try:
-            category = soup.select_one(".breadcrumb__wrap").get_text(
-                separator="/", strip=True
-            )
-            title = soup.select_one(".read__title").get_text(strip=True)
-            publish_date_str = (
-                soup.select_one(".read__time").get_text(strip=True).split("- ")[1]
-            )
-            if "Diperbarui" in publish_date_str:
-                publish_date_str = publish_date_str.split("Diperbarui")[1].strip()
-            author = soup.select_one(".credit-title-name").get_text(strip=True)
-
-            content_div = soup.select_one(".read__content")
-
-            # loop through paragraphs and remove those with class patterns like "track-*"
-            for tag in content_div.find_all(["div", "span"]):
-                # a_tag = tag.find("a", class_=True)
-                if tag and any(
-                    cls.startswith("inject-baca-juga") or cls.startswith("kompasidRec")
-                    for cls in tag.get("class", [])
-                ):
-                    tag.extract()
-            # remove unwanted elements
-            unwanted_phrases = [
-                r"Simak.*WhatsApp Channel",
-                r"https://www\.whatsapp\.com/channel/",
-                r"Baca juga: ",
-            ]
-            unwanted_pattern = re.compile("|".join(unwanted_phrases), re.IGNORECASE)
-
-            for tag in content_div.find_all(["i", "p"]):
-                tag_text = tag.get_text()
-                if unwanted_pattern.search(tag_text):
-                    tag.extract()
-
-            content = content_div.get_text(separator=" ", strip=True)
-            
-         #    sentiment = classify_sentiment_id(title)
-            
-
-            publish_date = self.parse_date(publish_date_str, locales=["id"])
-            if not publish_date:
-                logging.error(f"Error parsing date for article {link}")
-                return
-            if self.start_date and publish_date < self.start_date:
-                self.continue_scraping = False
-                return
-
-            item = {
-                "title": title,
-                "publish_date": publish_date,
-                "author": author,
-                "content": content,
-                "keyword": keyword,
-                "category": category,
-                "source": self.base_url.split("www.")[1],
-                "link": link,
-              #   "sentiment": sentiment
-            }
-            await self.queue_.put(item)
+            article = await self.extract_article(response, link)
+            await self.queue_article(article, keyword, link, self.base_url.split("www.")[1])
         except Exception as e:
             logging.error(f"Error parsing article {link}: {e}")
@@ -2,9 +2,9 @@ import logging
 import re
 from urllib.parse import urlencode
 
-from bs4 import BeautifulSoup, Comment
+from bs4 import Comment, SoupStrainer
 
-from .basescraper import BaseScraper
+from .basescraper import BaseScraper, class_pattern, parse_markup
 
 # from .sentiment import classify_sentiment_id
 
@@ -16,6 +16,7 @@ class KontanScraper(BaseScraper):
         self.start_date = start_date
         self.continue_scraping = True
         self.href_pattern = re.compile(r".*\.kontan\.co\.id/news/.*")
+        self.search_strainer = SoupStrainer(class_=class_pattern("list-berita"))
 
     async def build_search_url(self, keyword, page):
         # https://www.kontan.co.id/search/?search=&per_page=20
@@ -27,7 +28,7 @@ class KontanScraper(BaseScraper):
         return await self.fetch(url)
 
     def parse_article_links(self, response_text):
-        soup = BeautifulSoup(response_text, "html.parser")
+        soup = self.parse_search_page(response_text)
         articles = soup.select(".list-berita ul li a")
         if not articles:
             return None
@@ -43,70 +44,61 @@ class KontanScraper(BaseScraper):
         return filtered_hrefs
 
     async def get_article(self, link, keyword):
-        response_text = await self.fetch(link)
-        if not response_text:
+        response = await self.fetch_bytes(link)
+        if not response:
             logging.warning(f"No response for {link}")
             return
-        soup = BeautifulSoup(response_text, "html.parser")
         try:
-            # FIX ME: change to select_one
-            category = soup.find("div", {"class": "breadcumb fs18"}).get_text(
-                strip=True
-            )
-            title = soup.find("h1", {"class": "detail-desk"}).get_text(strip=True)
-            publish_date_str = soup.find(
-                "div", {"class": "fs14 ff-opensans font-gray"}
-            ).get_text(strip=True)
-
-            content_div = soup.find(
-                "div", {"class": "tmpt-desk-kon", "itemprop": "articleBody"}
-            )
-
-            author = content_div.find("p").get_text(strip=True)
-            content_div.find("p").extract()
-
-            # loop through paragraphs and remove those with class patterns like "track-*"
-            for tag in content_div.find_all(["p", "h2"]):
-                a_tag = tag.find("a", class_=True)
-                if a_tag and any(
-                    cls.startswith("track-") for cls in a_tag.get("class", [])
-                ):
-                    tag.extract()
-
-            # filter before the comment <!-- pagination end -->
-            filtered_content = []
-            for element in content_div.children:
-                if isinstance(element, Comment) and "pagination end" in element:
-                    break
-                # append text of all elements except pagination end comments
-                if not isinstance(element, Comment):
-                    filtered_content.append(str(element))
-
-            # join the accumulated elements and parse again to get cleaned text
-            content_part = BeautifulSoup("".join(filtered_content), "html.parser")
-            content = content_part.get_text(separator="\n", strip=True)
-            
-          #   sentiment = classify_sentiment_id(title)
-
-            publish_date = self.parse_date(publish_date_str)
-            if not publish_date:
-                logging.error(f"Error parsing date for article {link}")
-                return
-            if self.start_date and publish_date < self.start_date:
-                self.continue_scraping = False
-                return
-
-            item = {
-                "title": title,
-                "publish_date": publish_date,
-                "author": author,
-                "content": content,
-                "keyword": keyword,
-                "category": category,
-                "source": self.base_url.split("www.")[1],
-                "link": link,
-             #    "sentiment": sentiment
-            }
-            await self.queue_.put(item)
+            article = await self.extract_article(response, link)
+            await self.queue_article(article, keyword, link, self.base_url.split("www.")[1])
         except Exception as e:
             logging.error(f"Error parsing article {link}: {e}")
+
+    @classmethod
+    def parse_article(cls, soup, link):
+        # FIX ME: change to select_one
+        category = soup.find("div", {"class": "breadcumb fs18"}).get_text(
+            strip=True
+        )
+        title = soup.find("h1", {"class": "detail-desk"}).get_text(strip=True)
+        publish_date_str = soup.find(
+            "div", {"class": "fs14 ff-opensans font-gray"}
+        ).get_text(strip=True)
+
+        content_div = soup.find(
+            "div", {"class": "tmpt-desk-kon", "itemprop": "articleBody"}
+        )
+
+        author = content_div.find("p").get_text(strip=True)
+        content_div.find("p").extract()
+
+        # loop through paragraphs and remove those with class patterns like "track-*"
+        for tag in content_div.find_all(["p", "h2"]):
+            a_tag = tag.find("a", class_=True)
+            if a_tag and any(
+                class_name.startswith("track-") for class_name in a_tag.get("class", [])
+            ):
+                tag.extract()
+
+        # filter before the comment <!-- pagination end -->
+        filtered_content = []
+        for element in content_div.children:
+            if isinstance(element, Comment) and "pagination end" in element:
+                break
+            # append text of all elements except pagination end comments
+            if not isinstance(element, Comment):
+                filtered_content.append(str(element))
+
+        # join the accumulated elements and parse again to get cleaned text
+        content_part = parse_markup("".join(filtered_content), html_parser=soup.builder.NAME)
+        content = content_part.get_text(separator="\n", strip=True)
+        
+      #   sentiment = classify_sentiment_id(title)
+
+        return {
+            "title": title,
+            "publish_date": cls.parse_date(publish_date_str),
+            "author": author,
+            "content": content,
+            "category": category,
+        }
@@ -1,28 +1,47 @@
 import logging
-import re
 
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 
-from .basescraper import BaseScraper
+from ..extract import Extractor
+from .basescraper import BaseScraper, class_pattern
 
 # from .sentiment import classify_sentiment_id
 
 
 class MetrotvnewsScraper(BaseScraper):
+    extractor = Extractor({
+        "title": "h1, h2",
+        # "<author> • <date>"
+        "author": {"select": "p.pt-20.date", "pattern": r"^([^•]*)", "default": ""},
+        "publish_date": {"select": "p.pt-20.date", "pattern": r"([^•]*)$"},
+        "category": ".breadcrumb-content p",
+        "content": {
+            "select": ".news-text",
+            "drop_phrases": [r"Baca juga: "],
+            "phrase_tags": ["td"],
+            "separator": " ",
+        },
+    })
+
     def __init__(self, keywords, concurrency=5, start_date=None, queue_=None):
         super().__init__(keywords, concurrency, queue_)
         self.base_url = "https://www.metrotvnews.com"
         self.start_date = start_date
         self.continue_scraping = True
+        self.search_strainer = SoupStrainer(class_=class_pattern("item"))
 
     async def build_search_url(self, keyword, page):
         # https://www.metrotvnews.com/search?query=ekonomi
+        if page > 1:
+            # the search has a single page; fetching it again would list the
+            # same links forever
+            return None
         return await self.fetch(
             f"https://www.metrotvnews.com/search?query={keyword.replace(' ', '%20')}"
         )
 
     def parse_article_links(self, response_text):
-        soup = BeautifulSoup(response_text, "html.parser")
+        soup = self.parse_search_page(response_text)
         articles = soup.select(".item .text h3 a[href]")
 
         if not articles:
@@ -32,54 +51,12 @@ class MetrotvnewsScraper(BaseScraper):
         return filtered_hrefs
 
     async def get_article(self, link, keyword):
-        response_text = await self.fetch(link)
-        if not response_text:
+        response = await self.fetch_bytes(link)
+        if not response:
             logging.warning(f"No response for {link}")
             return
-        soup = BeautifulSoup(response_text, "html.parser")
         try:
-            category = soup.select_one(".breadcrumb-content p").get_text(strip=True)
-            title = soup.select_one("h1, h2").get_text()
-
-            author_date_str = soup.select_one("p.pt-20.date").get_text(strip=True)
-            publish_date_str = author_date_str.split("•")[-1].strip()
-            author = author_date_str.split("•")[0].strip()
-
-            content_div = soup.select_one(".news-text")
-
-            unwanted_phrases = [
-                r"Baca juga: ",
-            ]
-            unwanted_pattern = re.compile("|".join(unwanted_phrases), re.IGNORECASE)
-
-            # Remove unwanted elements from paragraphs, italics, and table cells.
-            for tag in content_div.find_all(["td"]):
-                tag_text = tag.get_text()
-                if unwanted_pattern.search(tag_text):
-                    tag.extract()
-
-            content = content_div.get_text(separator=" ", strip=True)
-           #  sentiment = classify_sentiment_id(title)
-
-            publish_date = self.parse_date(publish_date_str)
-            if not publish_date:
-                logging.error(f"Error parsing date for article {link}")
-                return
-            if self.start_date and publish_date < self.start_date:
-                self.continue_scraping = False
-                return
-
-            item = {
-                "title": title,
-                "publish_date": publish_date,
-                "author": author,
-                "content": content,
-                "keyword": keyword,
-                "category": category,
-                "source": self.base_url.split("https://")[1],
-                "link": link,
-               #  "sentiment": sentiment
-            }
-            await self.queue_.put(item)
+            article = await self.extract_article(response, link)
+            await self.queue_article(article, keyword, link, self.base_url.split("https://")[1])
         except Exception as e:
             logging.error(f"Error parsing article {link}: {e}", exc_info=True)
@@ -1,19 +1,43 @@
 import logging
-import re
 
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 
+from ..extract import Extractor, class_prefix
 from .basescraper import BaseScraper
 
 # from .sentiment import classify_sentiment_id
 
 
 class OkezoneScraper(BaseScraper):
+    extractor = Extractor({
+        "title": ".title-article h1",
+        "author": {"select": ".journalist a[title]", "attr": "title"},
+        "publish_date": {
+            "select": ".journalist span",
+            "pattern": r"Jurnalis-(.*)",
+            "scrub": r"[|']",
+        },
+        "category": {"select": ".breadcrumb a", "index": -1, "default": "Unknown"},
+        "content": {
+            "select": ".c-detail.read",
+            "remove": [class_prefix("inject-", "div, span"), class_prefix("banner", "div, span")],
+            "drop_phrases": [
+                r"Baca juga:",
+                r"Follow.*WhatsApp Channel",
+                r"Telusuri berita.*lainnya",
+            ],
+            "phrase_tags": ["p", "div"],
+            "separator": " ",
+        },
+        "date_locales": ["id"],
+    })
+
     def __init__(self, keywords, concurrency=12, start_date=None, queue_=None):
         super().__init__(keywords, concurrency, queue_)
         self.base_url = "https://www.okezone.com"
         self.start_date = start_date
         self.continue_scraping = True
+        self.search_strainer = SoupStrainer("a", href=True)
 
     async def build_search_url(self, keyword, page):
         # https://search.okezone.com/loaddata/article/ekonomi/1
@@ -25,7 +49,7 @@ class OkezoneScraper(BaseScraper):
         )
 
     def parse_article_links(self, response_text):
-        soup = BeautifulSoup(response_text, "html.parser")
+        soup = self.parse_search_page(response_text)
         articles = soup.select("a[href*='/read/']")
         if not articles:
             return None
@@ -38,75 +62,12 @@ class OkezoneScraper(BaseScraper):
         return filtered_hrefs
 
     async def get_article(self, link, keyword):
-        response_text = await self.fetch(link)
-        if not response_text:
+        response = await self.fetch_bytes(link)
+        if not response:
             logging.warning(f"No response for {link}")
             return
-        soup = BeautifulSoup(response_text, "html.parser")
         try:
-            breadcrumb = soup.select(".breadcrumb a")
-            category = breadcrumb[-1].get_text(strip=True) if breadcrumb else "Unknown"
-
-            title = soup.select_one(".title-article h1").get_text(strip=True)
-            author = soup.select_one(".journalist a[title]").get("title")
-            publish_date_str = (
-                soup.select_one(".journalist span")
-                .get_text(strip=True)
-                .split("Jurnalis-")[1]
-                .strip()
-                .replace("|", "")
-                .replace("'", "")
-            )
-
-            content_div = soup.select_one(".c-detail.read")
-
-            # remove unwanted elements
-            for tag in content_div.find_all(["div", "span"]):
-                if tag and any(
-                    cls.startswith("inject-") or cls.startswith("banner")
-                    for cls in tag.get("class", [])
-                ):
-                    tag.extract()
-
-            # remove unwanted text patterns
-            unwanted_phrases = [
-                r"Baca juga:",
-                r"Follow.*WhatsApp Channel",
-                r"Telusuri berita.*lainnya",
-            ]
-            unwanted_pattern = re.compile("|".join(unwanted_phrases), re.IGNORECASE)
-
-            for tag in content_div.find_all(["p", "div"]):
-                tag_text = tag.get_text()
-                if unwanted_pattern.search(tag_text):
-                    tag.extract()
-
-            content = content_div.get_text(separator=" ", strip=True)
-            
-           #  sentiment = classify_sentiment_id(title)
-
-            publish_date = self.parse_date(publish_date_str, locales=["id"])
-            if not publish_date:
-                logging.error(
-                    f"Error parsing date for article {link}: {publish_date_str}"
-                )
-                return
-
-            if self.start_date and publish_date < self.start_date:
-                self.continue_scraping = False
-                return
-
-            item = {
-                "title": title,
-                "publish_date": publish_date,
-                "author": author,
-                "content": content,
-                "keyword": keyword,
-                "category": category,
-                "source": "okezone.com",
-                "link": link,
-                # "sentiment": sentiment
-            }
-            await self.queue_.put(item)
+            article = await self.extract_article(response, link)
+            await self.queue_article(article, keyword, link, "okezone.com")
         except Exception as e:
             logging.error(f"Error parsing article {link}: {e}")
@@ -2,14 +2,19 @@ import json
 import logging
 from urllib.parse import urlencode
 
-from bs4 import BeautifulSoup
-
+from ..exceptions import ParseError
+from ..extract import FIELDS
+from ..listings import add_listing
 from .basescraper import BaseScraper
 
 # from .sentiment import classify_sentiment_id
 
 
 class TempoScraper(BaseScraper):
+    # parse_article reads the page's JSON-LD too, so the fast path takes the
+    # same fields from the same object without parsing the page
+    metadata_fields = FIELDS
+
     def __init__(self, keywords, concurrency=1, start_date=None, queue_=None):
         super().__init__(keywords, concurrency, queue_)
         self.base_url = "https://www.tempo.co"
@@ -38,64 +43,63 @@ class TempoScraper(BaseScraper):
             logging.error(f"Error decoding JSON response: {e}")
             return None
         articles = response_json.get("data", [])
-        filtered_hrefs = {
-            f"{self.base_url}/{a['canonical_url']}"
-            for a in articles
-            if a["canonical_url"]
-        }
+        filtered_hrefs = {}
+        for a in articles:
+            if a["canonical_url"]:
+                add_listing(
+                    filtered_hrefs,
+                    f"{self.base_url}/{a['canonical_url']}",
+                    self.parse_listing_date(a.get("published_at")),
+                )
         return filtered_hrefs
 
     async def get_article(self, link, keyword):
-        response_text = await self.fetch(
+        response = await self.fetch_bytes(
             link, headers={"User-Agent": "Mozilla/5.0"}, timeout=45
         )
-        if not response_text:
+        if not response:
             logging.warning(f"No response fetched for {link}")
             return
-        soup = BeautifulSoup(response_text, "html.parser")
         try:
-            ld_json_script = soup.find("script", type="application/ld+json")
-            if not ld_json_script:
-                logging.error("No application/ld+json script found in article page")
-                return
-
-            ld_json = json.loads(ld_json_script.string)
-
-            title = ld_json.get("headline", "")
-            publish_date_str = ld_json.get("datePublished", "")
-            content = ld_json.get("articleBody", "")
-            
-          #   sentiment = classify_sentiment_id(title)
-
-            author_field = ld_json.get("author", "")
-            if isinstance(author_field, list):
-                author = ", ".join([a.get("name", "") for a in author_field])
-            else:
-                author = ""
-
-            main_entity = ld_json.get("mainEntityOfPage", {})
-            category_url = main_entity.get("@id", "")
-            category = category_url.split("/")[3] if category_url else ""
-
-            publish_date = self.parse_date(publish_date_str)
-            if not publish_date:
-                logging.error(f"Error parsing date for article {link}")
-                return
-            if self.start_date and publish_date < self.start_date:
-                self.continue_scraping = False
-                return
-
-            item = {
-                "title": title,
-                "publish_date": publish_date,
-                "author": author,
-                "content": content,
-                "keyword": keyword,
-                "category": category,
-                "source": self.base_url.split("www.")[1],
-                "link": link,
-               #  "sentiment": sentiment
-            }
-            await self.queue_.put(item)
+            article = await self.extract_article(response, link)
+            await self.queue_article(article, keyword, link, self.base_url.split("www.")[1])
         except Exception as e:
             logging.error(f"Error parsing article {link}: {e}", exc_info=True)
+
+    @classmethod
+    def parse_metadata(cls, metadata, link):
+        return cls.ld_json_fields(metadata["ld_json"])
+
+    @staticmethod
+    def ld_json_fields(ld_json):
+        author_field = ld_json.get("author", "")
+        if isinstance(author_field, list):
+            author = ", ".join([a.get("name", "") for a in author_field])
+        else:
+            author = ""
+
+        main_entity = ld_json.get("mainEntityOfPage", {})
+        category_url = main_entity.get("@id", "") if isinstance(main_entity, dict) else ""
+        category = category_url.split("/")[3] if category_url else ""
+
+        return {
+            "title": ld_json.get("headline", ""),
+            "publish_date": ld_json.get("datePublished", ""),
+            "author": author,
+            "content": ld_json.get("articleBody", ""),
+            "category": category,
+        }
+
+    @classmethod
+    def parse_article(cls, soup, link):
+        ld_json_script = soup.find("script", type="application/ld+json")
+        if not ld_json_script:
+            raise ParseError("No application/ld+json script found in article page")
+
+        ld_json = json.loads(ld_json_script.string)
+
+      #   sentiment = classify_sentiment_id(title)
+
+        article = cls.ld_json_fields(ld_json)
+        article["publish_date"] = cls.parse_date(article["publish_date"])
+        return article
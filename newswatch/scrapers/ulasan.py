@@ -1,18 +1,32 @@
 import logging
 from urllib.parse import urlencode
 
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 
+from ..extract import Extractor
+from ..listings import add_listing
 from .basescraper import BaseScraper
 
 # from .sentiment import classify_sentiment_id
 
 
 class UlasanScraper(BaseScraper):
+    # fields read from the metadata (checked with benchmarks/bench_metadata.py)
+    metadata_fields = ("title", "publish_date", "author", "category")
+
+    extractor = Extractor({
+        "title": ["h1.entry-title", "h1"],
+        "author": {"select": ".author.vcard a, .posted-by .author a", "default": "Admin"},
+        "publish_date": {"select": "time.entry-date", "attr": "datetime", "default": ""},
+        "category": {"select": ".cat-links a, .cat-links-content a", "default": ""},
+        "content": {"select": ".entry-content", "paragraphs": "p", "default": ""},
+    })
+
     def __init__(self, keywords, concurrency=12, start_date=None, queue_=None):
         super().__init__(keywords, concurrency, queue_)
         self.base_url = "ulasan.co"
         self.start_date = start_date
+        self.search_strainer = SoupStrainer("article")
 
     async def build_search_url(self, keyword, page):
         # Ulasan.co menggunakan format: /page/{page}/?s=keyword&post_type=post
@@ -33,7 +47,7 @@ class UlasanScraper(BaseScraper):
         if not response_text:
             return None
 
-        soup = BeautifulSoup(response_text, "html.parser")
+        soup = self.parse_search_page(response_text)
         
         # Cari semua artikel dengan tag <article>
         articles = soup.find_all("article")
@@ -41,7 +55,7 @@ class UlasanScraper(BaseScraper):
         if not articles:
             return None
 
-        filtered_hrefs = set()
+        filtered_hrefs = {}
         for article in articles:
             # Cari link di dalam h2.entry-title > a
             title_link = article.select_one("h2.entry-title a")
@@ -49,87 +63,20 @@ class UlasanScraper(BaseScraper):
                 href = title_link["href"]
                 # Filter hanya artikel ulasan.co
                 if "ulasan.co" in href:
-                    filtered_hrefs.add(href)
+                    # Tanggal terbit di hasil pencarian (lihat newswatch.listings)
+                    time_tag = article.select_one("time[datetime]")
+                    listed_at = self.parse_listing_date(time_tag["datetime"]) if time_tag else None
+                    add_listing(filtered_hrefs, href, listed_at)
         
         return filtered_hrefs if filtered_hrefs else None
 
     async def get_article(self, link, keyword):
-        response_text = await self.fetch(link, timeout=30)
-        if not response_text:
+        response = await self.fetch_bytes(link, timeout=30)
+        if not response:
             logging.warning(f"No response for {link}")
             return
-        soup = BeautifulSoup(response_text, "html.parser")
-
         try:
-            # Title - dalam h1.entry-title
-            title_elem = soup.select_one("h1.entry-title")
-            if not title_elem:
-                title_elem = soup.find("h1")
-            title = title_elem.get_text(strip=True) if title_elem else ""
-            
-            if not title:
-                logging.error(f"Title not found for article {link}")
-                return
-
-            # Publish date - dalam time.entry-date
-            publish_date_str = ""
-            date_elem = soup.select_one("time.entry-date")
-            if date_elem:
-                # Coba ambil dari datetime attribute dulu
-                publish_date_str = date_elem.get("datetime", "")
-                if not publish_date_str:
-                    publish_date_str = date_elem.get_text(strip=True)
-            
-            # Author - dalam span.author.vcard > a
-            author = "Admin"  # Default
-            author_elem = soup.select_one(".author.vcard a, .posted-by .author a")
-            if author_elem:
-                author = author_elem.get_text(strip=True)
-
-            # Category - dalam span.cat-links atau span.cat-links-content > a (ambil yang pertama)
-            category = ""
-            category_elem = soup.select_one(".cat-links a, .cat-links-content a")
-            if category_elem:
-                category = category_elem.get_text(strip=True)
-
-            # Content - ambil semua tag <p> dari .entry-content
-            content_div = soup.select_one(".entry-content")
-            
-            if content_div:
-                # Ambil semua tag <p> langsung tanpa hapus apapun dulu
-                paragraphs = content_div.find_all("p")
-                content_parts = []
-                
-                for p in paragraphs:
-                    p_text = p.get_text(strip=True)
-                    if p_text:  # Hanya skip yang kosong
-                        content_parts.append(p_text)
-                
-                content = " ".join(content_parts)
-            else:
-                content = ""
-            
-            # sentiment = classify_sentiment_id(title)
-
-            publish_date = self.parse_date(publish_date_str)
-            if not publish_date:
-                logging.error(f"Error parsing date for article {link}: {publish_date_str}")
-                return
-            if self.start_date and publish_date < self.start_date:
-                self.continue_scraping = False
-                return
-
-            item = {
-                "title": title,
-                "publish_date": publish_date,
-                "author": author,
-                "content": content,
-                "keyword": keyword,
-                "category": category,
-                "source": self.base_url,
-                "link": link,
-                # "sentiment": sentiment
-            }
-            await self.queue_.put(item)
+            article = await self.extract_article(response, link)
+            await self.queue_article(article, keyword, link, self.base_url)
         except Exception as e:
-            logging.error(f"Error parsing article {link}: {e}")
\ No newline at end of file
+            logging.error(f"Error parsing article {link}: {e}")
@@ -1,19 +1,33 @@
 import logging
 import re
 
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 
-from .basescraper import BaseScraper
+from ..extract import Extractor
+from .basescraper import BaseScraper, class_pattern
 
 # from .sentiment import classify_sentiment_id
 
 class VivaScraper(BaseScraper):
+    extractor = Extractor({
+        "title": "h1.main-content-title",
+        "author": "div.main-content-author",
+        "publish_date": "div.main-content-date",
+        "category": "a.breadcrumb-step.content_center",
+        "content": {
+            "select": "div.main-content-detail",
+            "remove": ["div.recommended-article", "div.widget-other-article"],
+            "separator": " ",
+        },
+    })
+
     def __init__(self, keywords, concurrency=12, start_date=None, queue_=None):
         super().__init__(keywords, concurrency, queue_)
         self.base_url = "https://www.viva.co.id"
         self.start_date = start_date
         self.continue_scraping = True
         self.href_pattern = re.compile(r"https://www\.viva\.co\.id/.*/\d+-")
+        self.search_strainer = SoupStrainer(class_=class_pattern("article-list-row"))
 
     async def build_search_url(self, keyword, page):
         # https://www.viva.co.id/request/load-more-search
@@ -24,7 +38,7 @@ class VivaScraper(BaseScraper):
         return await self.fetch(url, method="POST", data=payload)
 
     def parse_article_links(self, response_text):
-        soup = BeautifulSoup(response_text, "html.parser")
+        soup = self.parse_search_page(response_text)
         articles = soup.select(".article-list-row a")
         if not articles:
             return None
@@ -37,53 +51,12 @@ class VivaScraper(BaseScraper):
         return filtered_hrefs
 
     async def get_article(self, link, keyword):
-        response_text = await self.fetch(f"{link}?page=all")
-        if not response_text:
+        response = await self.fetch_bytes(f"{link}?page=all")
+        if not response:
             logging.warning(f"No response for {link}")
             return
-        soup = BeautifulSoup(response_text, "html.parser")
         try:
-            # FIX ME: change to select_one
-            category = soup.find(
-                "a", {"class": "breadcrumb-step content_center"}
-            ).get_text(strip=True)
-            title = soup.find("h1", {"class": "main-content-title"}).get_text(
-                strip=True
-            )
-            publish_date_str = soup.find(
-                "div", {"class": "main-content-date"}
-            ).get_text(strip=True)
-            author = soup.find("div", {"class": "main-content-author"}).get_text(
-                strip=True
-            )
-
-            publish_date = self.parse_date(publish_date_str)
-            if not publish_date:
-                logging.error(f"Error parsing date for article {link}")
-                return
-            if self.start_date and publish_date < self.start_date:
-                self.continue_scraping = False
-                return
-
-            content_div = soup.find("div", {"class": "main-content-detail"})
-            for elem in content_div.select(
-                "div.recommended-article, div.widget-other-article"
-            ):
-                elem.decompose()
-            content = content_div.get_text(separator=" ", strip=True)
-           #  sentiment = classify_sentiment_id(title)
-            
-            item = {
-                "title": title,
-                "publish_date": publish_date,
-                "author": author,
-                "content": content,
-                "keyword": keyword,
-                "category": category,
-                "source": self.base_url.split("www.")[1],
-                "link": link,
-             #    "sentiment": sentiment
-            }
-            await self.queue_.put(item)
+            article = await self.extract_article(response, link)
+            await self.queue_article(article, keyword, link, self.base_url.split("www.")[1])
         except Exception as e:
             logging.error(f"Error parsing article {link}: {e}")
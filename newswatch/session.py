@@ -0,0 +1,289 @@
+"""
+Run-scoped HTTP session management for newswatch.
+
+A single SessionManager is created for each scraping run and handed to every
+scraper, so all sources share one tuned connection pool, DNS cache and set of
+keep-alive connections instead of each scraper opening its own. Sources that
+select the "http2" backend share one HTTP/2-capable httpx client instead;
+its requests and connections count towards the session's totals too.
+"""
+
+import logging
+
+import aiohttp
+
+from .circuit import CircuitBreakerRegistry
+from .concurrency import ConcurrencyStore
+from .ratelimit import HostRateLimiter
+from .singleflight import SingleFlight
+from .timing import RequestTimings, add_trace_hooks
+from .transport import (
+    HTTP2_AVAILABLE,
+    AiohttpTransport,
+    BaseURLOverrideTransport,
+    Cassette,
+    HttpxTransport,
+    RecordingTransport,
+    ReplayTransport,
+)
+
+# HTTP client backends a source can select; "aiohttp" is the default
+HTTP_BACKENDS = ("aiohttp", "http2")
+DEFAULT_HTTP_BACKEND = "aiohttp"
+
+
+def preferred_http_backend(backend):
+    """
+    Get the backend a source uses on this install.
+
+    Args:
+        backend (str, optional): Backend the source prefers, e.g. "http2"
+            for hosts that serve HTTP/2
+
+    Returns:
+        str or None: `backend`, or None (the default) when it is "http2" and
+        the optional httpx[http2] extra is not installed
+    """
+    if backend == "http2" and not HTTP2_AVAILABLE:
+        return None
+    return backend
+
+
+# largest response body read per page type; the rest of the page is dropped
+DEFAULT_MAX_BODY_BYTES = {
+    "search": 2 * 1024 * 1024,
+    "article": 4 * 1024 * 1024,
+}
+
+
+class SessionManager:
+    """Owns the aiohttp session shared by all scrapers in a run."""
+
+    def __init__(
+        self,
+        limit=100,
+        limit_per_host=32,
+        keepalive_timeout=30,
+        ttl_dns_cache=300,
+        cache=None,
+        max_body_bytes=None,
+        record_to=None,
+        replay_from=None,
+        replay_latency=False,
+        base_url_override=None,
+    ):
+        """
+        Initialize SessionManager.
+
+        Args:
+            limit (int): Maximum number of simultaneous connections in the pool
+            limit_per_host (int): Maximum simultaneous connections to one host
+            keepalive_timeout (float): Seconds an idle connection is kept open
+            ttl_dns_cache (int): Seconds resolved DNS entries are cached
+            cache (ResponseCache, optional): On-disk response cache shared by
+                all scrapers; disabled when None
+            max_body_bytes (dict, optional): page type -> byte cap for response
+                bodies (None for no cap); merged over DEFAULT_MAX_BODY_BYTES
+            record_to (str, optional): Cassette file every response of the run
+                is recorded to
+            replay_from (str, optional): Cassette file the run is served from
+                instead of the network
+            replay_latency (bool): When replaying, wait as long as each
+                recorded request took
+            base_url_override (str, optional): Server every request is sent to
+                instead of the real sites, e.g. a local newswatch.stubserver
+        """
+        if record_to and replay_from:
+            raise ValueError("record_to and replay_from cannot be used together")
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+        self.session = None
+        self.transport = None
+        self.transports = {}
+        self.cassette = None
+        self.record_to = record_to
+        self.replay_from = replay_from
+        self.replay_latency = replay_latency
+        self.base_url_override = base_url_override
+        self.connections_opened = 0
+        self.connections_reused = 0
+        self.requests_served = 0
+        self.rate_limiter = HostRateLimiter()
+        self.concurrency_store = ConcurrencyStore()
+        self.circuit_breakers = CircuitBreakerRegistry()
+        self.cache = cache
+        self.singleflight = SingleFlight()
+        self.max_body_bytes = {**DEFAULT_MAX_BODY_BYTES, **(max_body_bytes or {})}
+        self.bytes_received = 0
+        self.truncated_bodies = 0
+        self.rejected_bodies = 0
+        self.timings = RequestTimings()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def start(self):
+        """Create the shared session. Safe to call more than once."""
+        if self.session is not None and not self.session.closed:
+            return self.session
+
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.ttl_dns_cache,
+            use_dns_cache=True,
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=60, connect=10, sock_connect=10, sock_read=30
+        )
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(self._on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reuseconn)
+        trace_config.on_request_start.append(self._on_request_start)
+        add_trace_hooks(trace_config)
+
+        self.session = aiohttp.ClientSession(
+            connector=connector, timeout=timeout, trace_configs=[trace_config]
+        )
+
+        if self.replay_from:
+            self.cassette = Cassette.load(self.replay_from)
+        elif self.record_to:
+            self.cassette = Cassette(self.record_to)
+        self.transports = {}
+        self.transport = self.transport_for(DEFAULT_HTTP_BACKEND)
+        return self.session
+
+    def transport_for(self, backend=None):
+        """
+        Get the transport for an HTTP client backend, creating it on first use.
+
+        Args:
+            backend (str, optional): One of HTTP_BACKENDS; defaults to aiohttp
+
+        Returns:
+            Transport shared by every scraper using that backend
+        """
+        backend = backend or DEFAULT_HTTP_BACKEND
+        transport = self.transports.get(backend)
+        if transport is None:
+            transport = self._create_transport(backend)
+            self.transports[backend] = transport
+        return transport
+
+    def _create_transport(self, backend):
+        if backend not in HTTP_BACKENDS:
+            raise ValueError(f"Unknown HTTP backend {backend!r}, expected one of {HTTP_BACKENDS}")
+        if self.replay_from:
+            return ReplayTransport(self.cassette, self.replay_latency)
+
+        if backend == "http2":
+            try:
+                transport = HttpxTransport(
+                    http2=True,
+                    max_connections=self.limit,
+                    keepalive_expiry=self.keepalive_timeout,
+                    on_request=self._on_httpx_request,
+                )
+            except ImportError as e:
+                logging.warning(f"{e}; falling back to aiohttp")
+                return self.transport_for(DEFAULT_HTTP_BACKEND)
+        else:
+            transport = AiohttpTransport(self.session)
+
+        if self.base_url_override:
+            transport = BaseURLOverrideTransport(transport, self.base_url_override)
+        if self.cassette is not None:
+            transport = RecordingTransport(transport, self.cassette)
+        return transport
+
+    @property
+    def offline(self):
+        """True when responses come from a cassette or stub server, not the real sites."""
+        return self.transport is not None and self.transport.offline
+
+    async def close(self):
+        # requests nobody awaits any more must not outlive their transport
+        await self.singleflight.cancel()
+        for transport in dict.fromkeys(self.transports.values()):
+            await transport.close()
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+        if self.record_to and self.cassette is not None:
+            self.cassette.save()
+        self.concurrency_store.save()
+
+    async def _on_connection_create_end(self, session, context, params):
+        self.connections_opened += 1
+
+    async def _on_connection_reuseconn(self, session, context, params):
+        self.connections_reused += 1
+
+    async def _on_request_start(self, session, context, params):
+        self.requests_served += 1
+
+    def _on_httpx_request(self, new_connection):
+        self.requests_served += 1
+        if new_connection:
+            self.connections_opened += 1
+        else:
+            self.connections_reused += 1
+
+    def stats(self):
+        """
+        Get HTTP statistics for the run.
+
+        Returns:
+            dict: Connections opened/reused, requests served, per-host rate
+            limiting and circuit breaker state, per-host request timings
+        """
+        return {
+            "connections_opened": self.connections_opened,
+            "connections_reused": self.connections_reused,
+            "requests_served": self.requests_served,
+            "rate_limits": self.rate_limiter.stats(),
+            "circuits": self.circuit_breakers.stats(),
+            "cache": self.cache.stats() if self.cache is not None else None,
+            "coalesced": self.singleflight.stats(),
+            "transports": {
+                backend: transport.stats() for backend, transport in self.transports.items()
+            },
+            "bodies": {
+                "bytes_received": self.bytes_received,
+                "truncated": self.truncated_bodies,
+                "rejected_content_type": self.rejected_bodies,
+            },
+            "timings": self.timings.stats(),
+        }
+
+    def log_summary(self):
+        stats = self.stats()
+        if stats["requests_served"]:
+            ratio = stats["requests_served"] / max(stats["connections_opened"], 1)
+        else:
+            ratio = 0.0
+        logging.info(
+            f"HTTP session: {stats['requests_served']} requests served over "
+            f"{stats['connections_opened']} connections "
+            f"({stats['connections_reused']} reused, {ratio:.1f} requests/connection), "
+            f"{stats['bodies']['bytes_received'] / 1e6:.1f} MB read, "
+            f"{stats['bodies']['truncated']} truncated, "
+            f"{stats['bodies']['rejected_content_type']} rejected by content type"
+        )
+        self.rate_limiter.log_summary()
+        self.circuit_breakers.log_summary()
+        self.singleflight.log_summary()
+        self.timings.log_summary()
+        for transport in dict.fromkeys(self.transports.values()):
+            transport.log_summary()
+        if self.cache is not None:
+            self.cache.log_summary()
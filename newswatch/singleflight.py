@@ -0,0 +1,87 @@
+"""
+In-flight request coalescing for newswatch.
+
+Keywords searched concurrently often surface the same article at the same
+moment. SingleFlight makes concurrent identical requests share one call:
+the first caller runs it, everyone else arriving before it finishes awaits
+the same result. The call runs as the first caller made it, so the key must
+cover whatever else the call depends on (see AsyncScraper.fetch_bytes).
+
+The call runs as its own task, so one caller being cancelled does not cancel
+it for the others; once every caller has left, it is cancelled too. cancel
+ends the calls still in flight when the session closes.
+"""
+
+import asyncio
+import logging
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls that share a key."""
+
+    def __init__(self):
+        # key -> task of the call in flight
+        self.in_flight = {}
+        # task -> callers awaiting it
+        self.waiters = {}
+        self.calls = 0
+        self.deduplicated = 0
+
+    async def do(self, key, call):
+        """
+        Run `call()` unless an identical call is already in flight.
+
+        Args:
+            key (hashable): Identity of the call
+            call (callable): Zero-argument coroutine function
+
+        Returns:
+            The result of the shared call
+        """
+        task = self.in_flight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(call())
+            self.in_flight[key] = task
+            task.add_done_callback(lambda _: self._forget(key, task))
+        else:
+            self.deduplicated += 1
+        self.waiters[task] = self.waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self.waiters[task] -= 1
+            if not self.waiters[task]:
+                del self.waiters[task]
+                if not task.done():
+                    # every caller was cancelled: nobody wants the result
+                    self._forget(key, task)
+                    task.cancel()
+
+    def _forget(self, key, task):
+        if self.in_flight.get(key) is task:
+            del self.in_flight[key]
+
+    async def cancel(self):
+        """Cancel the calls still in flight and wait for them to end."""
+        tasks = list(self.in_flight.values())
+        self.in_flight.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self):
+        """
+        Get coalescing statistics for the run.
+
+        Returns:
+            dict: Calls made and duplicate requests served by them
+        """
+        return {"calls": self.calls, "deduplicated": self.deduplicated}
+
+    def log_summary(self):
+        if self.deduplicated:
+            logging.info(
+                f"Coalesced {self.deduplicated} duplicate in-flight requests "
+                f"into {self.calls} calls"
+            )
@@ -0,0 +1,140 @@
+"""
+Run-scoped statistics for newswatch.
+
+Several parts of a run count, per source, what they did: dates parsed with
+a learned format (newswatch.dates), pages the metadata fast path covered
+(newswatch.metadata), fallback chains resolved on the first try
+(newswatch.fallbacks), search results dropped by their listing date
+(newswatch.listings), articles dropped by the keyword check
+(newswatch.keywords) and pages the article registry reused
+(newswatch.registry). Each kind of count is a SourceCounts subclass, kept
+in its module; RunStats holds one of each for a run.
+
+The run creates its RunStats with stats_scope, which, like deadline_scope,
+sets it in a context variable for the tasks created inside the block, and
+logs and reports it with one call each. Every component records into
+current_stats(), so concurrent runs count apart. Parse pool jobs count into
+a RunStats of their own in the worker, and their counts are added to the
+run's with the result.
+"""
+
+import contextvars
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+
+class SourceCounts:
+    """Counts of one kind, per source; subclasses report them."""
+
+    def __init__(self):
+        # source -> Counter of the kind's counts
+        self.counts = defaultdict(Counter)
+
+    def record(self, source, **counts):
+        self.counts[source].update(counts)
+
+    def sources(self):
+        """(source, counts) pairs, ordered by source."""
+        return sorted(self.counts.items(), key=lambda item: str(item[0]))
+
+    def take_counts(self):
+        """Return the counts so far and start new ones (used by parse pool workers)."""
+        counts, self.counts = self.counts, defaultdict(Counter)
+        return {source: dict(source_counts) for source, source_counts in counts.items()}
+
+    def add_counts(self, counts):
+        """Add counts taken in another process."""
+        for source, source_counts in counts.items():
+            self.counts[source].update(source_counts)
+
+    def stats(self):
+        raise NotImplementedError
+
+    def log_summary(self):
+        raise NotImplementedError
+
+
+class RunStats:
+    """The per-source counts of one run, one SourceCounts of each kind."""
+
+    def __init__(self):
+        # imported here: those modules record into the current RunStats
+        from .dates import DateStats
+        from .fallbacks import SelectorStats
+        from .keywords import KeywordStats
+        from .listings import ListingStats
+        from .metadata import MetadataStats
+        from .registry import RegistryStats
+
+        # attribute names are the keys of stats(), in summary order
+        self.dates = DateStats()
+        self.metadata = MetadataStats()
+        self.selectors = SelectorStats()
+        self.listings = ListingStats()
+        self.keywords = KeywordStats()
+        self.registry = RegistryStats()
+
+    def counters(self):
+        return dict(vars(self))
+
+    def take_counts(self):
+        """Return the counts so far, of the kinds that have any, and start new ones."""
+        counts = {name: counter.take_counts() for name, counter in self.counters().items()}
+        return {name: kind_counts for name, kind_counts in counts.items() if kind_counts}
+
+    def add_counts(self, counts):
+        """Add counts taken with take_counts, e.g. in a parse pool worker."""
+        for name, kind_counts in counts.items():
+            getattr(self, name).add_counts(kind_counts)
+
+    def stats(self):
+        """
+        Get the run's statistics.
+
+        Returns:
+            dict: "dates", "metadata", "selectors", "listings", "keywords"
+            and "registry", each the per-source stats of that kind
+        """
+        return {name: counter.stats() for name, counter in self.counters().items()}
+
+    def log_summary(self):
+        for counter in self.counters().values():
+            counter.log_summary()
+
+
+current_run_stats = contextvars.ContextVar("run_stats", default=None)
+
+# counts made outside any run (a benchmark calling an extractor directly)
+_unscoped_stats = None
+
+
+def current_stats():
+    """
+    Get the RunStats to record into.
+
+    Returns:
+        RunStats: The current run's, or one for counts made outside a run
+    """
+    run_stats = current_run_stats.get()
+    if run_stats is None:
+        global _unscoped_stats
+        if _unscoped_stats is None:
+            _unscoped_stats = RunStats()
+        run_stats = _unscoped_stats
+    return run_stats
+
+
+@contextmanager
+def stats_scope():
+    """
+    Count into a new RunStats in the block and the tasks created inside it.
+
+    Yields:
+        RunStats: The run's statistics
+    """
+    run_stats = RunStats()
+    token = current_run_stats.set(run_stats)
+    try:
+        yield run_stats
+    finally:
+        current_run_stats.reset(token)
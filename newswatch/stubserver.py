@@ -0,0 +1,1069 @@
+"""
+Local stand-in for the news sites, for load and scaling tests.
+
+StubNewsServer generates search result and article pages with the markup
+each scraper expects, so a full run can be pointed at it instead of the real
+sites (SessionManager(base_url_override=...) or `--base_url`). Requests
+arrive as /<original host>/<original path>; every keyword has a fixed number
+of articles, one every `interval` minutes going back from server start, and
+latency and error rate are configurable. With `metadata`, article pages
+also carry a JSON-LD NewsArticle and OpenGraph tags in their head, as many
+real sites do (tempo's always has JSON-LD). Search results print their
+publish date where the real listings do and a scraper reads it (detik,
+kompas, tempo, cnbcindonesia and the WordPress sources). With `shared_keywords`, a fraction (`overlap`) of the
+articles is listed under each of those keywords at the same URL and
+mentions them all, as a story several searches find.
+
+Run it with:
+
+    python -m newswatch.stubserver --port 8765 --articles 1000 --latency 0.05
+    newswatch -k ekonomi -sd 2020-01-01 -s detik,kompas --base_url http://127.0.0.1:8765
+
+With the optional h2 package, --http2_port also serves the same sites over
+cleartext HTTP/2 (prior knowledge), for comparing HTTP client backends.
+
+Sites served: every scraper's, i.e. detik, kompas, tempo, cnbcindonesia,
+antaranews, kepriantaranews, mediaindonesia, bisnis, okezone, viva,
+metrotvnews, bloombergtechnoz, jawapos, katadata, kontan and the
+WordPress-based sources (keprinews, batampos, hariankepri, alurnews,
+ulasan). Metrotvnews' search has one page only, as on the real site.
+Other hosts answer 404.
+"""
+
+import argparse
+import asyncio
+import html
+import json
+import logging
+import random
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import List
+from urllib.parse import parse_qsl, quote, urlsplit
+
+from aiohttp import web
+
+try:
+    import h2.config
+    import h2.connection
+    import h2.events
+    import h2.exceptions
+except ImportError:  # optional: only needed for start_http2
+    h2 = None
+
+# every generated article URL ends in /<index>/<keyword slug>, optionally with
+# a "d-" prefix (detik) and a trailing slash (WordPress), or in
+# /<index>-<keyword slug> (viva)
+ARTICLE_PATH_PATTERN = re.compile(r"/(?:d-)?(\d+)[/-]([a-z0-9-]+)/?$")
+
+WP_SEARCH_PATH_PATTERN = re.compile(r"^(?:page/(\d+)/?)?$")
+
+INDONESIAN_DAYS = ["Senin", "Selasa", "Rabu", "Kamis", "Jumat", "Sabtu", "Minggu"]
+INDONESIAN_MONTHS = [
+    "Januari", "Februari", "Maret", "April", "Mei", "Juni",
+    "Juli", "Agustus", "September", "Oktober", "November", "Desember",
+]
+
+WORDS = (
+    "pemerintah pasar saham bank rupiah investor ekonomi nasional kebijakan "
+    "harga pertumbuhan industri sektor daerah masyarakat program anggaran "
+    "menteri presiden laporan data kuartal tahun analis target kenaikan "
+    "penurunan inflasi ekspor impor energi digital pembangunan infrastruktur"
+).split()
+
+# publish times are naive Western Indonesia Time, as the sites print them
+WIB = timezone(timedelta(hours=7))
+
+# keyword of the articles listed under every shared keyword
+SHARED_KEYWORD = "berita"
+
+AUTHORS = ["Andi Pratama", "Siti Rahma", "Budi Santoso", "Dewi Lestari", "Rizky Hidayat"]
+CATEGORIES = ["Ekonomi", "Bisnis", "Nasional", "Finansial", "Teknologi"]
+
+
+@dataclass
+class StubArticle:
+    """One generated article; the same (keyword, index) always yields the same text."""
+
+    keyword: str
+    index: int
+    published: datetime
+    title: str = ""
+    author: str = ""
+    category: str = ""
+    paragraphs: List[str] = field(default_factory=list)
+
+    @property
+    def slug(self):
+        return slugify(self.keyword)
+
+
+def slugify(keyword):
+    return re.sub(r"[^a-z0-9]+", "-", keyword.lower()).strip("-") or "berita"
+
+
+def indonesian_date(moment, with_day=True, short_month=False):
+    month = INDONESIAN_MONTHS[moment.month - 1]
+    if short_month:
+        month = month[:3].replace("Agu", "Agt")
+    text = f"{moment.day} {month} {moment.year} {moment:%H:%M} WIB"
+    if with_day:
+        text = f"{INDONESIAN_DAYS[moment.weekday()]}, {text}"
+    return text
+
+
+class StubSite:
+    """Markup of one news site: how its searches look and how its pages render."""
+
+    hosts = ()
+
+    def search_query(self, path, query, form):
+        """
+        Recognise a search request.
+
+        Returns:
+            tuple or None: (keyword, page) for search requests, else None
+        """
+        raise NotImplementedError
+
+    def article_url(self, article):
+        raise NotImplementedError
+
+    def search_page(self, articles):
+        """Render a search result page; returns (body, content type)."""
+        raise NotImplementedError
+
+    def article_page(self, article):
+        raise NotImplementedError
+
+    @staticmethod
+    def body_html(article):
+        return "".join(f"<p>{html.escape(p)}</p>" for p in article.paragraphs)
+
+    def metadata_head(self, article):
+        """Head with the article's JSON-LD NewsArticle and OpenGraph tags."""
+        published = f"{article.published:%Y-%m-%dT%H:%M:%S}+07:00"
+        ld_json = {
+            "@context": "https://schema.org",
+            "@graph": [
+                {"@type": "WebPage", "@id": self.article_url(article)},
+                {
+                    "@type": "NewsArticle",
+                    "headline": article.title,
+                    "datePublished": published,
+                    "author": {"@type": "Person", "name": article.author},
+                    "articleSection": article.category,
+                    "articleBody": " ".join(article.paragraphs),
+                },
+            ],
+        }
+        return (
+            f'<head><meta property="og:title" content="{html.escape(article.title)} - Stub">'
+            f'<meta property="article:published_time" content="{published}">'
+            f'<meta property="article:section" content="{article.category}">'
+            f'<script type="application/ld+json">{json.dumps(ld_json)}</script></head>'
+        )
+
+
+class DetikSite(StubSite):
+    hosts = ("www.detik.com", "news.detik.com")
+
+    def search_query(self, path, query, form):
+        if path == "search/searchnews" and "query" in query:
+            return query["query"], int(query.get("page", 1))
+
+    def article_url(self, article):
+        return f"https://news.detik.com/berita/d-{article.index}/{article.slug}"
+
+    def search_page(self, articles):
+        items = "".join(
+            f'<article class="list-content__item"><div class="media">'
+            f'<a class="media__link" href="{self.article_url(a)}">{html.escape(a.title)}</a>'
+            f'<div class="media__date"><span d-time="{a.published.replace(tzinfo=WIB).timestamp():.0f}" '
+            f'title="{indonesian_date(a.published, short_month=True)}">'
+            f"{indonesian_date(a.published, short_month=True)}</span></div>"
+            f"</div></article>"
+            for a in articles
+        )
+        return f'<html><body><div class="list-content">{items}</div></body></html>', "text/html"
+
+    def article_page(self, article):
+        return (
+            f'<html><body><div class="page__breadcrumb"><a href="#">{article.category}</a></div>'
+            f'<h1 class="detail__title">{html.escape(article.title)}</h1>'
+            f'<div class="detail__author">{article.author} - detikNews</div>'
+            f'<div class="detail__date">{indonesian_date(article.published, short_month=True)}</div>'
+            f'<div class="detail__body-text">{self.body_html(article)}'
+            f'<table class="linksisip"><tr><td>Baca juga</td></tr></table></div>'
+            f"</body></html>"
+        )
+
+
+class KompasSite(StubSite):
+    hosts = ("search.kompas.com", "www.kompas.com")
+
+    def search_query(self, path, query, form):
+        if path == "search" and "q" in query:
+            return query["q"], int(query.get("page", 1))
+
+    def article_url(self, article):
+        return (
+            f"https://www.kompas.com/read/{article.published:%Y/%m/%d}/"
+            f"{article.index}/{article.slug}"
+        )
+
+    def search_page(self, articles):
+        items = "".join(
+            f'<div class="articleItem"><a class="article-link" href="{self.article_url(a)}">'
+            f'<h2 class="articleTitle">{html.escape(a.title)}</h2>'
+            f'<div class="articlePost-date">{a.published:%d/%m/%Y, %H:%M} WIB</div></a></div>'
+            for a in articles
+        )
+        return f'<html><body><div class="articleList">{items}</div></body></html>', "text/html"
+
+    def article_page(self, article):
+        return (
+            f'<html><body><div class="breadcrumb__wrap"><a href="#">Home</a>'
+            f'<a href="#">{article.category}</a></div>'
+            f'<h1 class="read__title">{html.escape(article.title)}</h1>'
+            f'<div class="read__time">Kompas.com - {article.published:%d/%m/%Y, %H:%M} WIB</div>'
+            f'<div class="credit-title-name">{article.author}</div>'
+            f'<div class="read__content">{self.body_html(article)}'
+            f"<p>Baca juga: Berita lainnya</p></div></body></html>"
+        )
+
+
+class TempoSite(StubSite):
+    hosts = ("www.tempo.co",)
+
+    def search_query(self, path, query, form):
+        if path == "api/gateway/articles" and "tags[]" in query:
+            return query["tags[]"].replace("-", " "), int(query.get("page", 1))
+
+    def article_url(self, article):
+        return f"https://www.tempo.co/{self._canonical_url(article)}"
+
+    @staticmethod
+    def _canonical_url(article):
+        return f"{article.category.lower()}/{article.index}/{article.slug}"
+
+    def search_page(self, articles):
+        data = [
+            {
+                "canonical_url": self._canonical_url(a),
+                "title": a.title,
+                "published_at": f"{a.published:%Y-%m-%dT%H:%M:%S}+07:00",
+            }
+            for a in articles
+        ]
+        return json.dumps({"data": data}), "application/json"
+
+    def article_page(self, article):
+        ld_json = {
+            "@context": "https://schema.org",
+            "@type": "NewsArticle",
+            "headline": article.title,
+            "datePublished": article.published.strftime("%Y-%m-%dT%H:%M:%S+07:00"),
+            "articleBody": "\n".join(article.paragraphs),
+            "author": [{"@type": "Person", "name": article.author}],
+            "mainEntityOfPage": {"@id": self.article_url(article)},
+        }
+        return (
+            f'<html><head><script type="application/ld+json">{json.dumps(ld_json)}</script>'
+            f"</head><body><h1>{html.escape(article.title)}</h1>{self.body_html(article)}"
+            f"</body></html>"
+        )
+
+
+class CnbcIndonesiaSite(StubSite):
+    hosts = ("www.cnbcindonesia.com",)
+
+    def search_query(self, path, query, form):
+        if path == "search" and "query" in query:
+            return query["query"], int(query.get("page", 1))
+
+    def article_url(self, article):
+        return f"https://www.cnbcindonesia.com/market/{article.index}/{article.slug}"
+
+    def search_page(self, articles):
+        items = "".join(
+            f'<article><a class="group flex" href="{self.article_url(a)}">'
+            f"<h2>{html.escape(a.title)}</h2>"
+            f'<span class="text-cm text-gray">{INDONESIAN_DAYS[a.published.weekday()]}, '
+            f"{a.published:%d/%m/%Y %H:%M} WIB</span></a></article>"
+            for a in articles
+        )
+        return f'<html><body><div class="nhl-list">{items}</div></body></html>', "text/html"
+
+    def article_page(self, article):
+        published = article.published
+        return (
+            f'<html><body><a class="text-xs font-semibold" href="#">{article.category}</a>'
+            f'<h1 class="mb-4 text-32 font-extrabold">{html.escape(article.title)}</h1>'
+            f'<div class="mb-1 text-base font-semibold">CNBC Indonesia</div>'
+            f'<div class="mb-1 text-base font-semibold">{article.author}</div>'
+            f'<div class="text-cm text-gray">{INDONESIAN_DAYS[published.weekday()]}, '
+            f"{published:%d/%m/%Y %H:%M} WIB</div>"
+            f'<div class="detail-text">{self.body_html(article)}'
+            f'<table class="sisip_artikel"><tr><td>Baca juga</td></tr></table></div>'
+            f"</body></html>"
+        )
+
+
+class AntaranewsSite(StubSite):
+    hosts = ("www.antaranews.com",)
+
+    def search_query(self, path, query, form):
+        if path == "search" and "q" in query:
+            return query["q"], int(query.get("page", 1))
+
+    def article_url(self, article):
+        return f"https://www.antaranews.com/berita/{article.index}/{article.slug}"
+
+    def search_page(self, articles):
+        items = "".join(
+            f'<div class="card__post card__post-list card__post__transition mt-30">'
+            f'<a href="{self.article_url(a)}">{html.escape(a.title)}</a></div>'
+            for a in articles
+        )
+        return f"<html><body>{items}</body></html>", "text/html"
+
+    def article_page(self, article):
+        return (
+            f'<html><body><ul><li class="breadcrumbs__item">Beranda</li>'
+            f'<li class="breadcrumbs__item">{article.category}</li></ul>'
+            f'<h1 class="wrap__article-detail-title">{html.escape(article.title)}</h1>'
+            f'<ul><li class="list-inline-item mr-2">{article.category}</li>'
+            f'<li class="list-inline-item mr-2">{indonesian_date(article.published)}</li></ul>'
+            f'<div class="wrap__article-detail-content post-content">{self.body_html(article)}'
+            f'<p class="text-muted mt-2 small">Pewarta: {article.author}</p></div>'
+            f"</body></html>"
+        )
+
+
+class MediaIndonesiaSite(StubSite):
+    hosts = ("mediaindonesia.com",)
+
+    def search_query(self, path, query, form):
+        if path == "search" and "q" in form:
+            return form["q"], int(form.get("next", 0)) + 1
+
+    def article_url(self, article):
+        return f"https://mediaindonesia.com/ekonomi/{article.index}/{article.slug}"
+
+    def search_page(self, articles):
+        items = "".join(
+            f'<li><div class="text"><a href="{self.article_url(a)}">{html.escape(a.title)}</a>'
+            f"</div></li>"
+            for a in articles
+        )
+        return f'<html><body><ul class="list-3">{items}</ul></body></html>', "text/html"
+
+    def article_page(self, article):
+        return (
+            f'<html><body><div class="mi-breadcrumb">{article.category}</div>'
+            f"<h1>{html.escape(article.title)}</h1>"
+            f'<div class="author-2">{article.author}</div>'
+            f'<div class="datetime">{article.published:%d/%m/%Y, %H:%M}</div>'
+            f'<div class="article">{self.body_html(article)}'
+            f'<p class="related-news">Baca juga</p><div class="dfp-ad"></div></div>'
+            f"</body></html>"
+        )
+
+
+class KepriAntaranewsSite(AntaranewsSite):
+    """Antara's regional edition: the same article layout on its own host."""
+
+    hosts = ("kepri.antaranews.com",)
+
+    def article_url(self, article):
+        return f"https://kepri.antaranews.com/berita/{article.index}/{article.slug}"
+
+    def search_page(self, articles):
+        body, content_type = super().search_page(articles)
+        # the scraper takes short pages without "search" in them for errors
+        form = '<form action="/search"><input name="q"></form>'
+        return body.replace("<body>", f"<body>{form}", 1), content_type
+
+
+class BisnisSite(StubSite):
+    hosts = ("search.bisnis.com", "ekonomi.bisnis.com")
+
+    def search_query(self, path, query, form):
+        if path == "" and "q" in query:
+            return query["q"], int(query.get("page", 1))
+
+    def article_url(self, article):
+        return (
+            f"https://ekonomi.bisnis.com/read/{article.published:%Y%m%d}/9/"
+            f"{article.index}/{article.slug}"
+        )
+
+    def search_page(self, articles):
+        # results link through the search's click tracker
+        items = "".join(
+            f'<div class="artItem"><a class="artLink artLinkImg" '
+            f'href="https://search.bisnis.com/link?url={quote(self.article_url(a), safe="")}">'
+            f"{html.escape(a.title)}</a></div>"
+            for a in articles
+        )
+        return f'<html><body><div class="artList">{items}</div></body></html>', "text/html"
+
+    def article_page(self, article):
+        published = article.published
+        return (
+            f'<html><body><ul class="breadcrumb">'
+            f'<li class="breadcrumbItem"><a class="breadcrumbLink" href="#">Home</a></li>'
+            f'<li class="breadcrumbItem"><a class="breadcrumbLink" href="#">{article.category}</a></li></ul>'
+            f'<h1 class="detailsTitleCaption">{html.escape(article.title)}</h1>'
+            f'<div class="detailsAttributeDates">{INDONESIAN_DAYS[published.weekday()]}, '
+            f"{published.day} {INDONESIAN_MONTHS[published.month - 1]} {published.year} | "
+            f"{published:%H:%M}</div>"
+            f'<span class="authorName">{article.author} - Bisnis.com</span>'
+            f'<article class="detailsContent force-17 mt40">{self.body_html(article)}'
+            f'<div class="baca-juga-box">Baca juga</div></article></body></html>'
+        )
+
+
+class OkezoneSite(StubSite):
+    hosts = ("search.okezone.com", "economy.okezone.com")
+
+    def search_query(self, path, query, form):
+        parts = path.split("/")
+        if len(parts) == 4 and parts[:2] == ["loaddata", "article"]:
+            return parts[2], int(parts[3])
+
+    def article_url(self, article):
+        return (
+            f"https://economy.okezone.com/read/{article.published:%Y/%m/%d}/320/"
+            f"{article.index}/{article.slug}"
+        )
+
+    def search_page(self, articles):
+        items = "".join(
+            f'<li><h4><a href="{self.article_url(a)}">{html.escape(a.title)}</a></h4></li>'
+            for a in articles
+        )
+        return f"<ul>{items}</ul>", "text/html"
+
+    def article_page(self, article):
+        return (
+            f'<html><body><div class="breadcrumb"><a href="#">Home</a>'
+            f'<a href="#">{article.category}</a></div>'
+            f'<div class="title-article"><h1>{html.escape(article.title)}</h1></div>'
+            f'<div class="journalist"><a href="#" title="{article.author}">{article.author}</a>'
+            f"<span>Jurnalis-{indonesian_date(article.published).replace(' WIB', ' | WIB')}</span></div>"
+            f'<div class="c-detail read">{self.body_html(article)}'
+            f'<div class="inject-baca">Baca juga: lainnya</div></div></body></html>'
+        )
+
+
+class VivaSite(StubSite):
+    hosts = ("www.viva.co.id",)
+
+    def search_query(self, path, query, form):
+        if path == "request/load-more-search" and "keyword" in form:
+            return form["keyword"], int(form.get("page", 1))
+
+    def article_url(self, article):
+        return f"https://www.viva.co.id/berita/bisnis/{article.index}-{article.slug}"
+
+    def search_page(self, articles):
+        items = "".join(
+            f'<div class="article-list-row"><a href="{self.article_url(a)}">'
+            f"{html.escape(a.title)}</a></div>"
+            for a in articles
+        )
+        return items, "text/html"
+
+    def article_page(self, article):
+        return (
+            f'<html><body><a class="breadcrumb-step content_center" href="#">{article.category}</a>'
+            f'<h1 class="main-content-title">{html.escape(article.title)}</h1>'
+            f'<div class="main-content-author">{article.author}</div>'
+            f'<div class="main-content-date">{indonesian_date(article.published)}</div>'
+            f'<div class="main-content-detail">{self.body_html(article)}'
+            f'<div class="recommended-article">Baca juga</div></div></body></html>'
+        )
+
+
+class MetrotvnewsSite(StubSite):
+    hosts = ("www.metrotvnews.com",)
+
+    def search_query(self, path, query, form):
+        # the search has a single page
+        if path == "search" and "query" in query:
+            return query["query"], 1
+
+    def article_url(self, article):
+        return f"https://www.metrotvnews.com/read/{article.index}/{article.slug}"
+
+    def search_page(self, articles):
+        items = "".join(
+            f'<div class="item"><div class="text"><h3>'
+            f'<a href="{self.article_url(a)}">{html.escape(a.title)}</a></h3></div></div>'
+            for a in articles
+        )
+        return f"<html><body>{items}</body></html>", "text/html"
+
+    def article_page(self, article):
+        return (
+            f'<html><body><div class="breadcrumb-content"><p>{article.category}</p></div>'
+            f"<h1>{html.escape(article.title)}</h1>"
+            f'<p class="pt-20 date">{article.author} • {indonesian_date(article.published)}</p>'
+            f'<div class="news-text">{self.body_html(article)}'
+            f"<table><tr><td>Baca juga: lainnya</td></tr></table></div></body></html>"
+        )
+
+
+class BloombergTechnozSite(StubSite):
+    hosts = ("www.bloombergtechnoz.com",)
+
+    def search_query(self, path, query, form):
+        if path == "search" and "query" in query:
+            return query["query"], int(query.get("pagenum", 1))
+
+    def article_url(self, article):
+        return f"https://www.bloombergtechnoz.com/detail-news/{article.index}/{article.slug}"
+
+    def search_page(self, articles):
+        items = "".join(
+            f'<div class="card-box ft150 margin-bottom-xl"><a href="{self.article_url(a)}">'
+            f"{html.escape(a.title)}</a></div>"
+            for a in articles
+        )
+        return f"<html><body>{items}</body></html>", "text/html"
+
+    def article_page(self, article):
+        return (
+            f'<html><body><ul class="sitemap"><li>{article.category}</li></ul>'
+            f'<h1 class="title margin-bottom-sm">{html.escape(article.title)}</h1>'
+            f'<h5 class="title margin-bottom-ss"><a href="#">{article.author}</a></h5>'
+            f'<h5 class="title fw4 cl-gray">{indonesian_date(article.published, with_day=False)}</h5>'
+            f'<div class="detail-in">{self.body_html(article)}'
+            f'<div class="smallbox-pilihan">Pilihan</div></div></body></html>'
+        )
+
+
+class JawaposSite(StubSite):
+    hosts = ("www.jawapos.com",)
+
+    def search_query(self, path, query, form):
+        if path == "search" and "q" in query:
+            return query["q"], int(query.get("page", 1))
+
+    def article_url(self, article):
+        return f"https://www.jawapos.com/ekonomi/{article.index}/{article.slug}"
+
+    def search_page(self, articles):
+        items = "".join(
+            f'<div class="latest__item"><a class="latest__link" href="{self.article_url(a)}">'
+            f"{html.escape(a.title)}</a></div>"
+            for a in articles
+        )
+        return f"<html><body>{items}</body></html>", "text/html"
+
+    def article_page(self, article):
+        published = article.published
+        return (
+            f'<html><body><div class="breadcrumb__wrap">{article.category}</div>'
+            f'<h1 class="read__title">{html.escape(article.title)}</h1>'
+            f'<div class="read__info__author">{article.author}</div>'
+            f'<div class="read__info__date">- {INDONESIAN_DAYS[published.weekday()]}, '
+            f"{published.day} {INDONESIAN_MONTHS[published.month - 1]} {published.year} | "
+            f"{published:%H.%M} WIB</div>"
+            f'<div class="read__content clearfix">{self.body_html(article)}'
+            f'<strong class="read__others">Baca juga</strong></div></body></html>'
+        )
+
+
+class KatadataSite(StubSite):
+    hosts = ("search.katadata.co.id", "katadata.co.id")
+
+    def search_query(self, path, query, form):
+        if path == "api/search" and "prompt" in form:
+            # ten results per request
+            return form["prompt"], int(form.get("offset", 0)) // 10 + 1
+
+    def article_url(self, article):
+        return f"https://katadata.co.id/finansial/{article.index}/{article.slug}"
+
+    def search_page(self, articles):
+        results = [{"url": self.article_url(a), "title": a.title} for a in articles]
+        return json.dumps({"results": results}), "application/json"
+
+    def article_page(self, article):
+        return (
+            f'<html><body><div class="section-breadcrumb">{article.category}</div>'
+            f'<h1 class="detail-title mb-4">{html.escape(article.title)}</h1>'
+            f'<div class="detail-author-name">Oleh {article.author}</div>'
+            f'<div class="detail-date text-gray">{indonesian_date(article.published)}</div>'
+            f'<div class="detail-main">{self.body_html(article)}'
+            f'<div class="widget-baca-juga">Baca juga</div></div></body></html>'
+        )
+
+
+class KontanSite(StubSite):
+    hosts = ("www.kontan.co.id", "nasional.kontan.co.id")
+
+    def search_query(self, path, query, form):
+        if path == "search" and "search" in query:
+            # per_page is the offset of the page's first result, 20 per page
+            return query["search"], int(query.get("per_page", 0)) // 20 + 1
+
+    def article_url(self, article):
+        return f"https://nasional.kontan.co.id/news/{article.index}/{article.slug}"
+
+    def search_page(self, articles):
+        # links are protocol-relative
+        items = "".join(
+            f'<li><a href="{self.article_url(a)[len("https:"):]}">{html.escape(a.title)}</a></li>'
+            for a in articles
+        )
+        return f'<html><body><div class="list-berita"><ul>{items}</ul></div></body></html>', "text/html"
+
+    def article_page(self, article):
+        published = article.published
+        return (
+            f'<html><body><div class="breadcumb fs18">{article.category}</div>'
+            f'<h1 class="detail-desk">{html.escape(article.title)}</h1>'
+            f'<div class="fs14 ff-opensans font-gray">{INDONESIAN_DAYS[published.weekday()]}, '
+            f"{published.day} {INDONESIAN_MONTHS[published.month - 1]} {published.year} / "
+            f"{published:%H:%M} WIB</div>"
+            f'<div class="tmpt-desk-kon" itemprop="articleBody"><p>Reporter: {article.author}</p>'
+            f"{self.body_html(article)}<!-- pagination end --><p>Halaman lainnya</p></div>"
+            f"</body></html>"
+        )
+
+
+class WordPressSite(StubSite):
+    """Search and single-post markup of the WordPress themes the Kepri sources use."""
+
+    def __init__(self, host, theme):
+        """
+        Initialize WordPressSite.
+
+        Args:
+            host (str): Host name the site is served under
+            theme (str): "jnews" (jeg_post), "newspaper" (tdb_module_loop),
+                "newspaper-classic" (td_module_16) or "default" (<article>)
+        """
+        self.hosts = (host,)
+        self.host = host
+        self.theme = theme
+
+    def search_query(self, path, query, form):
+        match = WP_SEARCH_PATH_PATTERN.match(path)
+        if match and "s" in query:
+            page = match.group(1) or query.get("paged", 1)
+            return query["s"], int(page)
+
+    def article_url(self, article):
+        return (
+            f"https://{self.host}/{article.published:%Y/%m/%d}/"
+            f"{article.index}/{article.slug}/"
+        )
+
+    def search_page(self, articles):
+        items = []
+        for a in articles:
+            link = f'<a href="{self.article_url(a)}">{html.escape(a.title)}</a>'
+            day = f"{a.published.day} {INDONESIAN_MONTHS[a.published.month - 1]} {a.published.year}"
+            time_tag = f'<time class="entry-date" datetime="{a.published:%Y-%m-%dT%H:%M:%S}+07:00">{day}</time>'
+            if self.theme == "jnews":
+                items.append(
+                    f'<article class="jeg_post"><h3 class="jeg_post_title">{link}</h3>'
+                    f'<div class="jeg_meta_date"><a href="#">{day}</a></div></article>'
+                )
+            elif self.theme == "newspaper":
+                items.append(f'<div class="tdb_module_loop"><h3 class="entry-title">{link}</h3>{time_tag}</div>')
+            elif self.theme == "newspaper-classic":
+                items.append(f'<div class="td_module_16"><h3 class="entry-title">{link}</h3>{time_tag}</div>')
+            else:
+                items.append(f'<article class="post"><h2 class="entry-title">{link}</h2>{time_tag}</article>')
+        return (
+            f'<html><body><div class="jeg_main_content">{"".join(items)}</div></body></html>',
+            "text/html",
+        )
+
+    def article_page(self, article):
+        title = html.escape(article.title)
+        published = article.published
+        body = self.body_html(article)
+        if self.theme == "jnews":
+            return (
+                f'<html><body><h1 class="jeg_post_title">{title}</h1>'
+                f'<div class="jeg_meta_author"><a href="#">{article.author}</a></div>'
+                f'<div class="jeg_meta_date"><a href="#">{published.day} '
+                f"{INDONESIAN_MONTHS[published.month - 1]} {published.year}</a></div>"
+                f'<div class="jeg_meta_category"><span><a href="#">{article.category}</a></span></div>'
+                f'<div class="entry-content"><div class="content-inner">{body}'
+                f'<div class="jeg_share_button">Bagikan</div></div></div></body></html>'
+            )
+
+        time_tag = (
+            f'<time class="entry-date" datetime="{published:%Y-%m-%dT%H:%M:%S}+07:00">'
+            f"{published.day} {INDONESIAN_MONTHS[published.month - 1]} {published.year}</time>"
+        )
+        if self.theme == "default":
+            return (
+                f'<html><body><article><h1 class="entry-title">{title}</h1>{time_tag}'
+                f'<span class="author vcard"><a href="#">{article.author}</a></span>'
+                f'<span class="cat-links"><a href="#">{article.category}</a></span>'
+                f'<div class="entry-content">{body}</div></article></body></html>'
+            )
+        return (
+            f'<html><body><h1 class="entry-title tdb-title-text">{title}</h1>{time_tag}'
+            f'<div class="td-post-author-name"><a href="#">{article.author}</a></div>'
+            f'<div class="tdb-author-name-wrap"><a class="tdb-author-name" href="#">{article.author}</a></div>'
+            f'<a class="td-post-category" href="#">{article.category}</a>'
+            f'<div class="tdb_single_content td-post-content">{body}<p>Baca Juga: lainnya</p></div>'
+            f"</body></html>"
+        )
+
+
+def default_sites():
+    return [
+        DetikSite(),
+        KompasSite(),
+        TempoSite(),
+        CnbcIndonesiaSite(),
+        AntaranewsSite(),
+        MediaIndonesiaSite(),
+        WordPressSite("keprinews.co", "jnews"),
+        WordPressSite("batampos.co.id", "newspaper"),
+        WordPressSite("www.hariankepri.com", "newspaper"),
+        WordPressSite("alurnews.com", "newspaper-classic"),
+        WordPressSite("ulasan.co", "default"),
+        KepriAntaranewsSite(),
+        BisnisSite(),
+        OkezoneSite(),
+        VivaSite(),
+        MetrotvnewsSite(),
+        BloombergTechnozSite(),
+        JawaposSite(),
+        KatadataSite(),
+        KontanSite(),
+    ]
+
+
+def request_form(body, content_type):
+    """Parameters of a POST body, form-encoded or JSON (katadata's search API)."""
+    if content_type.startswith("application/json"):
+        return json.loads(body or "{}")
+    return dict(parse_qsl(body, keep_blank_values=True))
+
+
+class StubNewsServer:
+    """aiohttp application serving generated pages for every stub site."""
+
+    def __init__(
+        self,
+        articles=100,
+        page_size=20,
+        interval=60,
+        latency=0.0,
+        error_rate=0.0,
+        seed=0,
+        sites=None,
+        metadata=False,
+        shared_keywords=(),
+        overlap=0.5,
+    ):
+        """
+        Initialize StubNewsServer.
+
+        Args:
+            articles (int): Articles available per keyword and site
+            page_size (int): Links per search result page
+            interval (float): Minutes between consecutive articles' publish times
+            latency (float): Mean response delay in seconds (uniformly jittered
+                between half and one and a half times the mean)
+            error_rate (float): Fraction of requests answered with a 503
+            seed (int): Seed for latency and error draws
+            sites (list, optional): StubSite instances; defaults to default_sites()
+            metadata (bool): Add JSON-LD and OpenGraph metadata to article
+                pages that have no head
+            shared_keywords (iterable): Keywords whose searches share articles
+            overlap (float): Fraction of the article indices at which each
+                shared keyword lists the same article
+        """
+        self.articles = articles
+        self.page_size = page_size
+        self.interval = timedelta(minutes=interval)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.sites = {host: site for site in sites or default_sites() for host in site.hosts}
+        self.metadata = metadata
+        self.shared_keywords = tuple(keyword.strip().lower() for keyword in shared_keywords)
+        self.overlap = overlap
+        self.started_at = datetime.now().replace(second=0, microsecond=0)
+        self.runner = None
+        self.http2_server = None
+        self.requests = 0
+        self.errors = 0
+
+    def article(self, keyword, index):
+        mentions = (keyword,)
+        if self.shared_keywords and keyword.lower() in self.shared_keywords + (SHARED_KEYWORD,):
+            if random.Random(f"shared:{index}").random() < self.overlap:
+                keyword, mentions = SHARED_KEYWORD, self.shared_keywords
+        rng = random.Random(f"{keyword}:{index}")
+        paragraphs = []
+        for _ in range(rng.randint(4, 8)):
+            words = rng.choices(WORDS, k=rng.randint(25, 60))
+            for mention in mentions:
+                words.insert(rng.randrange(len(words)), mention)
+            paragraphs.append(" ".join(words).capitalize() + ".")
+        return StubArticle(
+            keyword=keyword,
+            index=index,
+            published=self.started_at - index * self.interval,
+            title=f"{keyword.title()}: {' '.join(rng.choices(WORDS, k=6))} ({index})",
+            author=rng.choice(AUTHORS),
+            category=rng.choice(CATEGORIES),
+            paragraphs=paragraphs,
+        )
+
+    def application(self):
+        app = web.Application()
+        app.router.add_route("*", "/{host}/{path:.*}", self.handle)
+        return app
+
+    async def respond(self, host, path, query, form):
+        """
+        Build the response for a request to `host`/`path`.
+
+        Returns:
+            tuple: (status, body, content type)
+        """
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency * self.random.uniform(0.5, 1.5))
+        if self.error_rate and self.random.random() < self.error_rate:
+            self.errors += 1
+            return 503, "Service Unavailable", "text/plain"
+
+        site = self.sites.get(host)
+        if site is None:
+            return 404, "Not Found", "text/plain"
+
+        search = site.search_query(path, query, form)
+        if search is not None:
+            keyword, page = search
+            start = (page - 1) * self.page_size
+            indices = range(start, min(start + self.page_size, self.articles))
+            body, content_type = site.search_page([self.article(keyword, i) for i in indices])
+            return 200, body, content_type
+
+        match = ARTICLE_PATH_PATTERN.search(path)
+        if match and int(match.group(1)) < self.articles:
+            article = self.article(match.group(2).replace("-", " "), int(match.group(1)))
+            page = site.article_page(article)
+            if self.metadata and "<head>" not in page:
+                page = page.replace("<html>", f"<html>{site.metadata_head(article)}", 1)
+            return 200, page, "text/html"
+        return 404, "Not Found", "text/plain"
+
+    async def handle(self, request):
+        form = {}
+        if request.method == "POST":
+            form = request_form(await request.text(), request.content_type)
+        status, body, content_type = await self.respond(
+            request.match_info["host"], request.match_info["path"], request.query, form
+        )
+        return web.Response(status=status, text=body, content_type=content_type, charset="utf-8")
+
+    async def start(self, host="127.0.0.1", port=0):
+        """
+        Start serving HTTP/1.1.
+
+        Returns:
+            str: Base URL to use as the base-URL override
+        """
+        self.runner = web.AppRunner(self.application(), access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return f"http://{host}:{port}"
+
+    async def start_http2(self, host="127.0.0.1", port=0):
+        """
+        Start serving cleartext HTTP/2 with prior knowledge (h2c).
+
+        Clients must speak HTTP/2 from the first byte, e.g.
+        HttpxTransport(http1=False, http2=True).
+
+        Returns:
+            str: Base URL to use as the base-URL override
+
+        Raises:
+            ImportError: the h2 package is not installed
+        """
+        if h2 is None:
+            raise ImportError("Serving HTTP/2 needs h2: pip install h2")
+        loop = asyncio.get_running_loop()
+        self.http2_server = await loop.create_server(lambda: H2StubProtocol(self), host, port)
+        port = self.http2_server.sockets[0].getsockname()[1]
+        return f"http://{host}:{port}"
+
+    async def stop(self):
+        if self.runner is not None:
+            await self.runner.cleanup()
+            self.runner = None
+        if self.http2_server is not None:
+            self.http2_server.close()
+            await self.http2_server.wait_closed()
+            self.http2_server = None
+
+
+class H2StubProtocol(asyncio.Protocol):
+    """Minimal h2c server connection answering requests with StubNewsServer.respond."""
+
+    def __init__(self, server):
+        self.server = server
+        self.conn = h2.connection.H2Connection(
+            config=h2.config.H2Configuration(client_side=False, header_encoding="utf-8")
+        )
+        self.transport = None
+        self.streams = {}
+        self.window_waiters = []
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.conn.initiate_connection()
+        self.transport.write(self.conn.data_to_send())
+
+    def connection_lost(self, exc):
+        self._wake_senders()
+
+    def data_received(self, data):
+        try:
+            events = self.conn.receive_data(data)
+        except h2.exceptions.ProtocolError:
+            self.transport.write(self.conn.data_to_send())
+            self.transport.close()
+            return
+
+        for event in events:
+            if isinstance(event, h2.events.RequestReceived):
+                self.streams[event.stream_id] = (dict(event.headers), bytearray())
+            elif isinstance(event, h2.events.DataReceived):
+                self.streams[event.stream_id][1].extend(event.data)
+                self.conn.acknowledge_received_data(
+                    event.flow_controlled_length, event.stream_id
+                )
+            elif isinstance(event, h2.events.StreamEnded):
+                headers, body = self.streams.pop(event.stream_id)
+                asyncio.ensure_future(self._respond(event.stream_id, headers, bytes(body)))
+            elif isinstance(event, h2.events.WindowUpdated):
+                self._wake_senders()
+            elif isinstance(event, h2.events.ConnectionTerminated):
+                self.transport.close()
+        self.transport.write(self.conn.data_to_send())
+
+    def _wake_senders(self):
+        for waiter in self.window_waiters:
+            waiter.set()
+        self.window_waiters.clear()
+
+    async def _respond(self, stream_id, headers, body):
+        url = urlsplit(headers[":path"])
+        host, _, path = url.path.lstrip("/").partition("/")
+        query = dict(parse_qsl(url.query, keep_blank_values=True))
+        form = {}
+        if headers[":method"] == "POST":
+            form = request_form(body.decode("utf-8"), headers.get("content-type", ""))
+        status, text, content_type = await self.server.respond(host, path, query, form)
+        data = text.encode("utf-8")
+
+        try:
+            self.conn.send_headers(
+                stream_id,
+                [
+                    (":status", str(status)),
+                    ("content-type", f"{content_type}; charset=utf-8"),
+                    ("content-length", str(len(data))),
+                ],
+            )
+            while data:
+                window = min(
+                    self.conn.local_flow_control_window(stream_id),
+                    self.conn.max_outbound_frame_size,
+                )
+                if window <= 0:
+                    # wait for the client to open the flow-control window
+                    waiter = asyncio.Event()
+                    self.window_waiters.append(waiter)
+                    await waiter.wait()
+                    if self.transport.is_closing():
+                        return
+                    continue
+                chunk, data = data[:window], data[window:]
+                self.conn.send_data(stream_id, chunk)
+                self.transport.write(self.conn.data_to_send())
+            self.conn.end_stream(stream_id)
+            self.transport.write(self.conn.data_to_send())
+        except h2.exceptions.StreamClosedError:
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve synthetic news sites for load tests.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--articles", type=int, default=100, help="Articles per keyword and site")
+    parser.add_argument("--page_size", type=int, default=20, help="Links per search page")
+    parser.add_argument("--interval", type=float, default=60, help="Minutes between articles")
+    parser.add_argument("--latency", type=float, default=0.0, help="Mean response delay in seconds")
+    parser.add_argument("--error_rate", type=float, default=0.0, help="Fraction of 503 responses")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--metadata", action="store_true", help="Add JSON-LD and OpenGraph tags to article pages"
+    )
+    parser.add_argument(
+        "--shared_keywords", default="", help="Comma-separated keywords whose searches share articles"
+    )
+    parser.add_argument(
+        "--overlap", type=float, default=0.5, help="Fraction of articles the shared keywords share"
+    )
+    parser.add_argument(
+        "--http2_port", type=int, help="Also serve cleartext HTTP/2 (h2c) on this port"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    server = StubNewsServer(
+        articles=args.articles,
+        page_size=args.page_size,
+        interval=args.interval,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        seed=args.seed,
+        metadata=args.metadata,
+        shared_keywords=[keyword for keyword in args.shared_keywords.split(",") if keyword.strip()],
+        overlap=args.overlap,
+    )
+
+    async def serve():
+        base_url = await server.start(args.host, args.port)
+        logging.info(f"Serving stub news sites at {base_url}")
+        if args.http2_port is not None:
+            http2_url = await server.start_http2(args.host, args.http2_port)
+            logging.info(f"Serving stub news sites over h2c at {http2_url}")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await server.stop()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        logging.info(f"Stopped after {server.requests} requests ({server.errors} errors)")
+
+
+if __name__ == "__main__":
+    main()
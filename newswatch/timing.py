@@ -0,0 +1,185 @@
+"""
+Per-request network timing for newswatch.
+
+Transports mark the moments a request passes through (pool wait, DNS,
+connect, TLS, request sent, response headers, body read) on a RequestTiming;
+aiohttp reports them through TraceConfig hooks and httpx through its trace
+extension. AsyncScraper tags the resulting phase durations with the scraper,
+host and page type, and the run's RequestTimings turns them into per-host
+percentiles for the end-of-run summary.
+"""
+
+import asyncio
+import logging
+from collections import Counter, defaultdict
+
+# queued: waiting for a pooled connection; connect includes TLS for aiohttp,
+# which does not report the handshake separately; ttfb runs from the request
+# being sent to the response headers arriving
+PHASES = ("queued", "dns", "connect", "tls", "ttfb", "download", "total")
+
+PERCENTILES = (50, 90, 99)
+
+
+class RequestTiming:
+    """Timestamps of one request, filled in by the transport."""
+
+    __slots__ = ("marks",)
+
+    def __init__(self):
+        self.marks = {}
+
+    def mark(self, name):
+        self.marks[name] = asyncio.get_running_loop().time()
+
+    def _span(self, start, end):
+        if start in self.marks and end in self.marks:
+            return self.marks[end] - self.marks[start]
+        return None
+
+    def phases(self):
+        """
+        Get the duration of each phase the request went through.
+
+        Returns:
+            dict: phase -> seconds, for the phases that were observed
+        """
+        marks = self.marks
+        phases = {
+            "queued": self._span("queued_start", "queued_end"),
+            "dns": self._span("dns_start", "dns_end"),
+            "connect": self._span("connect_start", "connect_end"),
+            "tls": self._span("tls_start", "tls_end"),
+            "download": self._span("headers_received", "body_done"),
+        }
+        # aiohttp resolves DNS inside connection setup
+        if phases["connect"] is not None and phases["dns"] is not None:
+            phases["connect"] = max(0.0, phases["connect"] - phases["dns"])
+
+        if "headers_received" in marks:
+            for sent in ("headers_sent", "connect_end", "start"):
+                if sent in marks:
+                    phases["ttfb"] = marks["headers_received"] - marks[sent]
+                    break
+        end = marks.get("body_done", marks.get("headers_received"))
+        if end is not None and "start" in marks:
+            phases["total"] = end - marks["start"]
+        return {phase: value for phase, value in phases.items() if value is not None}
+
+
+def add_trace_hooks(trace_config):
+    """Mark request phases on the RequestTiming passed as trace_request_ctx."""
+
+    def hook(mark):
+        async def on_event(session, context, params):
+            timing = context.trace_request_ctx
+            if isinstance(timing, RequestTiming):
+                timing.mark(mark)
+
+        return on_event
+
+    trace_config.on_request_start.append(hook("start"))
+    trace_config.on_connection_queued_start.append(hook("queued_start"))
+    trace_config.on_connection_queued_end.append(hook("queued_end"))
+    trace_config.on_dns_resolvehost_start.append(hook("dns_start"))
+    trace_config.on_dns_resolvehost_end.append(hook("dns_end"))
+    trace_config.on_connection_create_start.append(hook("connect_start"))
+    trace_config.on_connection_create_end.append(hook("connect_end"))
+    trace_config.on_request_headers_sent.append(hook("headers_sent"))
+    trace_config.on_request_end.append(hook("headers_received"))
+    return trace_config
+
+
+# httpcore trace events -> RequestTiming marks
+HTTPCORE_EVENTS = {
+    "connection.connect_tcp.started": "connect_start",
+    "connection.connect_tcp.complete": "connect_end",
+    "connection.start_tls.started": "tls_start",
+    "connection.start_tls.complete": "tls_end",
+    "http11.send_request_headers.started": "headers_sent",
+    "http2.send_request_headers.started": "headers_sent",
+    "http11.receive_response_headers.complete": "headers_received",
+    "http2.receive_response_headers.complete": "headers_received",
+}
+
+
+def httpcore_trace(timing):
+    """Build an httpx `trace` extension that marks phases on `timing`."""
+
+    async def trace(event_name, info):
+        mark = HTTPCORE_EVENTS.get(event_name)
+        if mark is not None:
+            timing.mark(mark)
+
+    return trace
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list."""
+    index = max(0, min(len(sorted_values) - 1, round(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class RequestTimings:
+    """Phase durations of every request in a run, grouped by host."""
+
+    def __init__(self):
+        self.samples = defaultdict(lambda: defaultdict(list))
+        self.page_types = defaultdict(Counter)
+        self.scrapers = defaultdict(Counter)
+
+    def record(self, host, scraper, page_type, phases):
+        """
+        Add one request's phase durations.
+
+        Args:
+            host (str): Host the request went to
+            scraper (str): Name of the scraper that made it
+            page_type (str): "search" or "article"
+            phases (dict): phase -> seconds, from RequestTiming.phases()
+        """
+        if not phases:
+            return
+        for phase, seconds in phases.items():
+            self.samples[host][phase].append(seconds)
+        self.page_types[host][page_type] += 1
+        self.scrapers[host][scraper] += 1
+
+    def stats(self):
+        """
+        Get per-host timing percentiles.
+
+        Returns:
+            dict: host -> requests timed, counts by page type and scraper, and
+            phase -> {"p50", "p90", "p99", "max"} in milliseconds
+        """
+        stats = {}
+        for host, samples in self.samples.items():
+            phases = {}
+            for phase in PHASES:
+                values = sorted(samples.get(phase, ()))
+                if not values:
+                    continue
+                phases[phase] = {
+                    f"p{q}": round(percentile(values, q) * 1000, 1) for q in PERCENTILES
+                }
+                phases[phase]["max"] = round(values[-1] * 1000, 1)
+            stats[host] = {
+                "requests": sum(self.page_types[host].values()),
+                "page_types": dict(self.page_types[host]),
+                "scrapers": dict(self.scrapers[host]),
+                "phases": phases,
+            }
+        return stats
+
+    def log_summary(self):
+        for host, stats in sorted(self.stats().items()):
+            page_types = ", ".join(f"{n} {page_type}" for page_type, n in stats["page_types"].items())
+            phases = ", ".join(
+                f"{phase} {p['p50']:.0f}/{p['p90']:.0f}/{p['p99']:.0f}"
+                for phase, p in stats["phases"].items()
+            )
+            logging.info(
+                f"Timing {host} ({stats['requests']} requests: {page_types}), "
+                f"p50/p90/p99 ms: {phases}"
+            )
@@ -0,0 +1,560 @@
+"""
+HTTP transports for newswatch.
+
+A transport sends one request and returns an HttpResponse; the retry,
+rate-limit and circuit-breaker policy around it lives in AsyncScraper.
+AiohttpTransport talks to the network. RecordingTransport wraps it and writes
+every response into a cassette, and ReplayTransport serves a later run
+entirely from that cassette, so a run can be profiled or regression-tested
+offline and deterministically. BaseURLOverrideTransport sends every request
+to another server (such as newswatch.stubserver) instead of the real sites.
+HttpxTransport is an optional HTTP/2-capable backend (needs httpx[http2]).
+"""
+
+import asyncio
+import base64
+import codecs
+import gzip
+import importlib.util
+import json
+import logging
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+from multidict import CIMultiDict
+
+try:
+    import httpx
+except ImportError:  # optional: only needed for the "http2" backend
+    httpx = None
+
+# httpx only offers HTTP/2 with the h2 package (the httpx[http2] extra)
+HTTP2_AVAILABLE = httpx is not None and importlib.util.find_spec("h2") is not None
+
+from .cache import request_key
+from .exceptions import ContentRejectedError, NetworkError
+from .timing import RequestTiming, httpcore_trace
+
+META_CHARSET_PATTERN = re.compile(rb"""<meta[^>]+charset=["']?([\w-]+)""", re.IGNORECASE)
+
+CHUNK_SIZE = 64 * 1024
+
+
+def parse_content_type(value):
+    """
+    Split a Content-Type header into media type and charset.
+
+    Returns:
+        tuple: (media type in lower case, charset or None)
+    """
+    if not value:
+        return "", None
+    media_type, _, params = value.partition(";")
+    charset = None
+    for param in params.split(";"):
+        name, _, param_value = param.partition("=")
+        if name.strip().lower() == "charset":
+            charset = param_value.strip().strip("\"'") or None
+    return media_type.strip().lower(), charset
+
+
+@dataclass
+class HttpResponse:
+    """A response as seen by the fetch layer, with its body fully read."""
+
+    url: str
+    status: int
+    headers: CIMultiDict = field(default_factory=CIMultiDict)
+    body: Optional[bytes] = None
+    truncated: bool = False
+    elapsed: float = 0.0
+    # phase -> seconds (see timing.PHASES), for responses that came off the network
+    timings: dict = field(default_factory=dict)
+
+    @property
+    def content_type(self):
+        return parse_content_type(self.headers.get("Content-Type"))[0]
+
+    @property
+    def charset(self):
+        """Charset declared in the Content-Type header, if any."""
+        return parse_content_type(self.headers.get("Content-Type"))[1]
+
+    def encoding(self):
+        """Charset for decoding the body: declared in headers, then <meta>, then UTF-8."""
+        charset = self.charset
+        if not charset and self.body:
+            match = META_CHARSET_PATTERN.search(self.body[:4096])
+            if match:
+                charset = match.group(1).decode("ascii")
+        try:
+            return codecs.lookup(charset).name if charset else "utf-8"
+        except LookupError:
+            return "utf-8"
+
+    def text(self):
+        if self.body is None:
+            return None
+        return self.body.decode(self.encoding(), errors="replace")
+
+
+def check_content_type(url, headers, accept):
+    """Reject a response whose declared content type is not in `accept`."""
+    if accept is None or "Content-Type" not in headers:
+        return
+    content_type = parse_content_type(headers["Content-Type"])[0]
+    if not content_type.startswith(accept):
+        raise ContentRejectedError(f"Unsupported content type {content_type}")
+
+
+class AiohttpTransport:
+    """Sends requests over the run's shared aiohttp session."""
+
+    offline = False
+
+    def __init__(self, session):
+        self.session = session
+
+    async def request(
+        self,
+        method,
+        url,
+        data=None,
+        headers=None,
+        timeout=30,
+        max_bytes=None,
+        accept=None,
+    ):
+        """
+        Send a request and read the body of a successful response.
+
+        Args:
+            method (str): HTTP method
+            url (str): Request URL
+            data (dict or str, optional): Form fields or raw request body
+            headers (dict, optional): Request headers
+            timeout (float): Total timeout for the request in seconds
+            max_bytes (int, optional): Stop reading the body after this many bytes
+            accept (tuple, optional): Media type prefixes worth reading; other
+                2xx responses raise ContentRejectedError before the body is read
+
+        Returns:
+            HttpResponse: The body is only read for 2xx responses
+
+        Raises:
+            asyncio.TimeoutError: The request timed out
+            NetworkError: Connection or protocol failure
+        """
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
+        timing = RequestTiming()
+        try:
+            async with self.session.request(
+                method,
+                url,
+                data=data,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=timeout),
+                trace_request_ctx=timing,
+            ) as response:
+                result = HttpResponse(
+                    url=url, status=response.status, headers=CIMultiDict(response.headers)
+                )
+                if 200 <= response.status < 300:
+                    check_content_type(url, result.headers, accept)
+                    result.body, result.truncated = await self._read_body(
+                        url, response, max_bytes
+                    )
+                timing.mark("body_done")
+        except aiohttp.ClientError as e:
+            raise NetworkError(f"{type(e).__name__}: {e}") from e
+
+        result.elapsed = loop.time() - started_at
+        result.timings = timing.phases()
+        return result
+
+    @staticmethod
+    async def _read_body(url, response, max_bytes):
+        """Read the body in chunks, stopping at `max_bytes`."""
+        if max_bytes is None:
+            return await response.read(), False
+
+        if response.content_length and response.content_length > max_bytes:
+            logging.debug(f"{url} declares {response.content_length} bytes, reading {max_bytes}")
+
+        chunks = []
+        size = 0
+        async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+            if size + len(chunk) > max_bytes:
+                chunks.append(chunk[: max_bytes - size])
+                return b"".join(chunks), True
+            chunks.append(chunk)
+            size += len(chunk)
+        return b"".join(chunks), False
+
+    async def close(self):
+        # the session belongs to the SessionManager
+        pass
+
+    def stats(self):
+        return None
+
+    def log_summary(self):
+        pass
+
+
+class HttpxTransport:
+    """
+    Sends requests with an httpx client, which can multiplex HTTP/2.
+
+    Hosts that negotiate HTTP/2 (via ALPN) carry all of a source's
+    concurrent requests over one connection instead of one connection per
+    in-flight request.
+    """
+
+    offline = False
+
+    def __init__(
+        self,
+        http2=True,
+        http1=True,
+        max_connections=100,
+        max_keepalive_connections=32,
+        keepalive_expiry=30,
+        verify=True,
+        on_request=None,
+    ):
+        """
+        Initialize HttpxTransport.
+
+        Args:
+            http2 (bool): Offer HTTP/2 to hosts that support it
+            http1 (bool): Allow HTTP/1.1; with http1=False and http2=True
+                cleartext URLs use HTTP/2 with prior knowledge (h2c)
+            max_connections (int): Maximum number of simultaneous connections
+            max_keepalive_connections (int): Idle connections kept open
+            keepalive_expiry (float): Seconds an idle connection is kept open
+            verify (bool): Verify TLS certificates
+            on_request (callable, optional): Called with whether a new
+                connection was opened for each request sent, the way the
+                aiohttp session's TraceConfig counts them
+
+        Raises:
+            ImportError: httpx (or h2, for HTTP/2) is not installed
+        """
+        if httpx is None:
+            raise ImportError("The http2 backend needs httpx: pip install 'httpx[http2]'")
+        self.client = httpx.AsyncClient(
+            http1=http1,
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(60, connect=10, read=30),
+            follow_redirects=True,
+            verify=verify,
+        )
+        self.http_versions = Counter()
+        self.on_request = on_request
+        self.requests_sent = 0
+        self.connections_opened = 0
+        # httpx logs every request at INFO, which would drown verbose runs
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    async def request(
+        self,
+        method,
+        url,
+        data=None,
+        headers=None,
+        timeout=30,
+        max_bytes=None,
+        accept=None,
+    ):
+        """Send a request; see AiohttpTransport.request."""
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
+        timing = RequestTiming()
+        timing.mark("start")
+        try:
+            # httpx timeouts are per phase, fetch timeouts are for the whole request
+            result = await asyncio.wait_for(
+                self._request(method, url, data, headers, max_bytes, accept, timing), timeout
+            )
+        except httpx.TimeoutException as e:
+            raise asyncio.TimeoutError() from e
+        except httpx.HTTPError as e:
+            raise NetworkError(f"{type(e).__name__}: {e}") from e
+
+        result.elapsed = loop.time() - started_at
+        result.timings = timing.phases()
+        return result
+
+    async def _request(self, method, url, data, headers, max_bytes, accept, timing):
+        # form fields go in `data`, raw bodies (e.g. JSON strings) in `content`
+        body = {"data": data} if isinstance(data, dict) else {"content": data}
+        async with self.client.stream(
+            method, url, headers=headers, extensions={"trace": httpcore_trace(timing)}, **body
+        ) as response:
+            self.http_versions[response.http_version] += 1
+            # httpcore only connects when no pooled connection can carry the request
+            new_connection = "connect_end" in timing.marks
+            self.requests_sent += 1
+            self.connections_opened += new_connection
+            if self.on_request is not None:
+                self.on_request(new_connection)
+            result = HttpResponse(
+                url=url,
+                status=response.status_code,
+                headers=CIMultiDict(response.headers.multi_items()),
+            )
+            if 200 <= response.status_code < 300:
+                check_content_type(url, result.headers, accept)
+                chunks = []
+                size = 0
+                async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                    if max_bytes is not None and size + len(chunk) > max_bytes:
+                        chunks.append(chunk[: max_bytes - size])
+                        result.truncated = True
+                        break
+                    chunks.append(chunk)
+                    size += len(chunk)
+                result.body = b"".join(chunks)
+            timing.mark("body_done")
+        return result
+
+    async def close(self):
+        await self.client.aclose()
+
+    def stats(self):
+        return {
+            "http_versions": dict(self.http_versions),
+            "requests_sent": self.requests_sent,
+            "connections_opened": self.connections_opened,
+        }
+
+    def log_summary(self):
+        versions = ", ".join(f"{n} {version}" for version, n in self.http_versions.items())
+        if versions:
+            logging.info(f"httpx backend: {versions} requests")
+
+
+class BaseURLOverrideTransport:
+    """
+    Sends every request to `base_url` instead of the host in its URL.
+
+    https://www.detik.com/search?q=x becomes <base_url>/www.detik.com/search?q=x.
+    Everything above the transport (rate limits, circuit breakers, caches,
+    cassettes, the scrapers' link filters) still sees the original URL.
+    """
+
+    offline = True
+
+    def __init__(self, transport, base_url):
+        self.transport = transport
+        self.base_url = base_url.rstrip("/")
+        self.redirected = 0
+
+    def rewrite(self, url):
+        parts = urlsplit(url)
+        rewritten = f"{self.base_url}/{parts.netloc}{parts.path or '/'}"
+        if parts.query:
+            rewritten = f"{rewritten}?{parts.query}"
+        return rewritten
+
+    async def request(self, method, url, data=None, headers=None, **kwargs):
+        response = await self.transport.request(
+            method, self.rewrite(url), data, headers, **kwargs
+        )
+        self.redirected += 1
+        response.url = url
+        return response
+
+    async def close(self):
+        await self.transport.close()
+
+    def stats(self):
+        return {"mode": "override", "base_url": self.base_url, "redirected": self.redirected}
+
+    def log_summary(self):
+        logging.info(f"Sent {self.redirected} requests to {self.base_url}")
+
+
+class Cassette:
+    """
+    Recorded responses keyed by request (method + URL + body).
+
+    Stored as gzip-compressed JSON lines, one response per line. A request
+    made several times during recording is replayed in the same order; once
+    its recordings run out the last one is served again.
+    """
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        self.interactions = {}
+        self._positions = {}
+
+    @classmethod
+    def load(cls, path):
+        cassette = cls(path)
+        with gzip.open(cassette.path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    cassette.interactions.setdefault(entry["key"], []).append(entry)
+        return cassette
+
+    def __len__(self):
+        return sum(len(entries) for entries in self.interactions.values())
+
+    def record(self, method, url, data, response):
+        entry = {
+            "key": request_key(method, url, data),
+            "method": method,
+            "url": url,
+            "status": response.status,
+            "headers": list(response.headers.items()),
+            "body": (
+                base64.b64encode(response.body).decode("ascii")
+                if response.body is not None
+                else None
+            ),
+            "truncated": response.truncated,
+            "elapsed": round(response.elapsed, 4),
+        }
+        self.interactions.setdefault(entry["key"], []).append(entry)
+
+    def next(self, method, url, data):
+        """Get the next recorded response for a request, or None if it was never recorded."""
+        key = request_key(method, url, data)
+        entries = self.interactions.get(key)
+        if not entries:
+            return None
+        position = self._positions.get(key, 0)
+        self._positions[key] = position + 1
+        return self._response(entries[min(position, len(entries) - 1)])
+
+    def responses(self):
+        """Iterate over every recorded response, e.g. to benchmark parsing."""
+        for entries in self.interactions.values():
+            for entry in entries:
+                yield self._response(entry)
+
+    @staticmethod
+    def _response(entry):
+        return HttpResponse(
+            url=entry["url"],
+            status=entry["status"],
+            headers=CIMultiDict(entry["headers"]),
+            body=base64.b64decode(entry["body"]) if entry["body"] is not None else None,
+            truncated=entry["truncated"],
+            elapsed=entry["elapsed"],
+        )
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            for entries in self.interactions.values():
+                for entry in entries:
+                    f.write(json.dumps(entry) + "\n")
+        os.replace(tmp_path, self.path)
+
+
+class RecordingTransport:
+    """Passes requests to another transport and records every response."""
+
+    def __init__(self, transport, cassette):
+        self.transport = transport
+        self.cassette = cassette
+        self.offline = transport.offline
+        self.recorded = 0
+
+    async def request(self, method, url, data=None, headers=None, **kwargs):
+        response = await self.transport.request(method, url, data, headers, **kwargs)
+        self.cassette.record(method, url, data, response)
+        self.recorded += 1
+        return response
+
+    async def close(self):
+        await self.transport.close()
+
+    def stats(self):
+        return {"mode": "record", "path": self.cassette.path, "recorded": self.recorded}
+
+    def log_summary(self):
+        logging.info(f"Recorded {self.recorded} responses to {self.cassette.path}")
+
+
+class ReplayTransport:
+    """Serves responses from a cassette without touching the network."""
+
+    offline = True
+
+    def __init__(self, cassette, replay_latency=False):
+        """
+        Initialize ReplayTransport.
+
+        Args:
+            cassette (Cassette): Responses recorded by RecordingTransport
+            replay_latency (bool): Wait as long as each recorded request took
+        """
+        self.cassette = cassette
+        self.replay_latency = replay_latency
+        self.replayed = 0
+        self.missing = 0
+
+    async def request(
+        self,
+        method,
+        url,
+        data=None,
+        headers=None,
+        timeout=30,
+        max_bytes=None,
+        accept=None,
+    ):
+        response = self.cassette.next(method, url, data)
+        if response is None:
+            # requests the live run never made behave like a missing page
+            self.missing += 1
+            logging.debug(f"No recorded response for {method} {url}")
+            return HttpResponse(url=url, status=404)
+
+        self.replayed += 1
+        if self.replay_latency and response.elapsed:
+            if response.elapsed > timeout:
+                await asyncio.sleep(timeout)
+                raise asyncio.TimeoutError()
+            await asyncio.sleep(response.elapsed)
+
+        if 200 <= response.status < 300:
+            check_content_type(url, response.headers, accept)
+            if max_bytes is not None and response.body and len(response.body) > max_bytes:
+                response.body = response.body[:max_bytes]
+                response.truncated = True
+        return response
+
+    async def close(self):
+        pass
+
+    def stats(self):
+        return {
+            "mode": "replay",
+            "path": self.cassette.path,
+            "replayed": self.replayed,
+            "missing": self.missing,
+        }
+
+    def log_summary(self):
+        logging.info(
+            f"Replayed {self.replayed} responses from {self.cassette.path}, "
+            f"{self.missing} requests not in the cassette"
+        )
@@ -1,94 +1,380 @@
 import asyncio
+import contextvars
 import logging
+from contextlib import contextmanager
+from urllib.parse import urlparse
 
-import aiohttp
+from .cache import request_key
+from .circuit import CircuitState
+from .concurrency import AdaptiveLimiter
+from .deadline import current_deadline
+from .exceptions import (
+    CircuitOpenError,
+    ContentRejectedError,
+    DeadlineExceededError,
+    HTTPStatusError,
+    NetworkError,
+    RateLimitError,
+)
+from .retry import RetryPolicy, parse_retry_after
+from .session import SessionManager
+
+# Rate limit or server error
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# responses the scrapers can parse; anything else (video, PDF, images) is
+# rejected from its headers before the body is read
+ACCEPTED_CONTENT_TYPES = (
+    "text/html",
+    "application/xhtml+xml",
+    "application/json",
+    "application/ld+json",
+    "text/plain",
+)
+
+# kind of page being fetched ("search" or "article"); set by BaseScraper so the
+# fetch layer can apply per-page-type policies without changing every scraper
+current_page_type = contextvars.ContextVar("page_type", default="article")
+
+
+@contextmanager
+def page_type_scope(page_type):
+    token = current_page_type.set(page_type)
+    try:
+        yield
+    finally:
+        current_page_type.reset(token)
+
+
+def _frozen(mapping):
+    # hashable form of an optional dict of options or headers
+    return tuple(sorted(mapping.items())) if mapping else None
 
 
 class AsyncScraper:
     def __init__(self, concurrency=12, max_retries=3):
-        self.semaphore = asyncio.Semaphore(concurrency)
+        # in-flight limit starts at `concurrency` and adapts (AIMD) while running
+        self.limiter = AdaptiveLimiter(concurrency)
         self.session = None
         self.max_retries = max_retries
+        self.retry_policy = RetryPolicy()
+        # run-scoped manager shared by all scrapers; set by the caller before
+        # scraping, otherwise a private one is created in __aenter__
+        self.session_manager = None
+        self._owns_session_manager = False
+        # per-source request rate, e.g. {"rate": 2.0, "burst": 4}; applied to
+        # every host this scraper fetches from unless another scraper already
+        # configured that host
+        self.rate_limit = None
+        # HTTP client backend for this source ("aiohttp" or "http2"), see
+        # SessionManager.transport_for
+        self.http_backend = None
 
     async def __aenter__(self):
-        timeout = aiohttp.ClientTimeout(
-            total=60, connect=10, sock_connect=10, sock_read=30
-        )
-        self.session = aiohttp.ClientSession(timeout=timeout)
+        if self.session_manager is None:
+            self.session_manager = SessionManager()
+            self._owns_session_manager = True
+        self.session = await self.session_manager.start()
+
+        stored_limit = self.session_manager.concurrency_store.get(self.source_host())
+        if stored_limit:
+            self.limiter.set_limit(stored_limit)
+        self._initial_limit = self.limiter.limit
         return self
 
     async def __aexit__(self, exc_type, exc_value, traceback):
-        if self.session:
-            await self.session.close()
+        host = self.source_host()
+        # replayed runs say nothing about what the live host can take
+        if not self.session_manager.offline:
+            self.session_manager.concurrency_store.set(host, self.limiter.limit)
+        logging.info(
+            f"Concurrency for {host}: {self._initial_limit:.1f} -> {self.limiter.limit:.1f} "
+            f"({self.limiter.increases} increases, {self.limiter.decreases} decreases)"
+        )
+
+        if self._owns_session_manager:
+            await self.session_manager.close()
+            self.session_manager = None
+            self._owns_session_manager = False
+        self.session = None
+
+    def source_host(self):
+        """Host the persisted concurrency limit is keyed by."""
+        base_url = getattr(self, "base_url", None)
+        if not base_url:
+            return type(self).__name__
+        if "://" not in base_url:
+            base_url = f"https://{base_url}"
+        return urlparse(base_url).hostname
+
+    async def _request(self, url, method, data, headers, timeout, page_type):
+        """Make a single request attempt while holding an in-flight slot."""
+        breaker = self.session_manager.circuit_breakers.breaker_for(url)
+
+        # wait for the host's rate limit before taking a slot, so requests
+        # held back by a rate limit or Retry-After do not occupy one
+        if not self.session_manager.offline:
+            await self.session_manager.rate_limiter.acquire(url, self.rate_limit)
+
+        async with self.limiter:
+            # ask the breaker only once a slot is free, so requests queued
+            # before the circuit opened are short-circuited too
+            if not breaker.allow():
+                host = urlparse(url).hostname
+                raise CircuitOpenError(f"Circuit open for {host}", host=host)
+
+            try:
+                result = await self._send(url, method, data, headers, timeout, page_type)
+            except asyncio.TimeoutError:
+                breaker.record_failure("timeout")
+                raise
+            except (HTTPStatusError, RateLimitError) as e:
+                # 4xx responses (429 included) say nothing about how healthy
+                # the host is; a 5xx is a failure with or without Retry-After
+                if e.status is not None and e.status >= 500:
+                    breaker.record_failure(f"HTTP {e.status}")
+                else:
+                    breaker.release_probe()
+                raise
+            except NetworkError as e:
+                breaker.record_failure(type(e.__cause__ or e).__name__)
+                raise
+            except BaseException:
+                # cancelled: no verdict on the host
+                breaker.release_probe()
+                raise
+
+            breaker.record_success()
+            return result
+
+    async def _send(self, url, method, data, headers, timeout, page_type):
+        """
+        Send the request through the transport of this source's HTTP backend.
+
+        Returns:
+            tuple: (status, body bytes, charset, response headers, whether
+            the body was truncated at the page type's size cap); the body and
+            charset are None for a 304 Not Modified
+        """
+        manager = self.session_manager
+        # checked once a slot is free, since waiting for it uses up the budget
+        deadline = current_deadline.get()
+        shortened = False
+        if deadline is not None:
+            if deadline.expired():
+                raise DeadlineExceededError(f"Run deadline reached before {url}")
+            timeout, shortened = deadline.timeout_for(timeout)
+        try:
+            response = await manager.transport_for(self.http_backend).request(
+                method,
+                url,
+                data=data,
+                headers=headers,
+                timeout=timeout,
+                max_bytes=manager.max_body_bytes.get(page_type),
+                accept=ACCEPTED_CONTENT_TYPES,
+            )
+        except asyncio.TimeoutError:
+            if shortened:
+                # cut short by the deadline, not a sign the host is overloaded
+                raise DeadlineExceededError(f"Run deadline reached while fetching {url}")
+            self.limiter.record_overload()
+            raise
+        except ContentRejectedError:
+            manager.rejected_bodies += 1
+            raise
+        except NetworkError:
+            self.limiter.record_error()
+            raise
+
+        manager.timings.record(
+            urlparse(url).hostname, self.__class__.__name__, page_type, response.timings
+        )
+
+        if response.status in RETRY_STATUSES:
+            self.limiter.record_overload()
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if response.status == 429 or retry_after is not None:
+                raise RateLimitError(
+                    f"Received status {response.status}",
+                    retry_after=retry_after,
+                    status=response.status,
+                )
+        if response.status >= 400:
+            # plain 4xx is not an overload signal; 5xx was recorded above
+            raise HTTPStatusError(
+                f"Received status {response.status}", status=response.status
+            )
+
+        if response.body is not None:
+            manager.bytes_received += len(response.body)
+        if response.truncated:
+            manager.truncated_bodies += 1
+            logging.info(f"Truncated {url} at {len(response.body)} bytes")
+
+        self.limiter.record_success(response.elapsed, page_type)
+        charset = response.encoding() if response.body is not None else None
+        return response.status, response.body, charset, response.headers, response.truncated
 
     async def fetch(
-        self, url, method="GET", data=None, headers=None, retries=0, timeout=30
+        self,
+        url,
+        method="GET",
+        data=None,
+        headers=None,
+        retries=0,
+        timeout=30,
+        page_type=None,
     ):
-        async with self.semaphore:
+        result = await self.fetch_bytes(
+            url, method, data, headers, retries, timeout, page_type
+        )
+        if result is None:
+            return None
+        body, charset = result
+        return body.decode(charset, errors="replace")
+
+    async def fetch_bytes(
+        self,
+        url,
+        method="GET",
+        data=None,
+        headers=None,
+        retries=0,
+        timeout=30,
+        page_type=None,
+    ):
+        """
+        Fetch a page without decoding it.
+
+        Takes the same arguments as `fetch`.
+
+        Returns:
+            tuple or None: (body bytes, charset) where the charset comes from
+            the Content-Type header or <meta>, falling back to UTF-8; None if
+            the request failed
+        """
+        if method not in ("GET", "POST"):
+            return None
+        page_type = page_type or current_page_type.get()
+
+        # identical requests already in flight share one call. It runs with
+        # the first caller's limiter, rate limit, HTTP backend and deadline,
+        # so those are part of the key: only requests made the same way share
+        key = request_key(method, url, data)
+        flight = (
+            key,
+            self.limiter,
+            _frozen(self.rate_limit),
+            self.http_backend,
+            current_deadline.get(),
+            _frozen(headers),
+            timeout,
+            retries,
+            page_type,
+        )
+        return await self.session_manager.singleflight.do(
+            flight,
+            lambda: self._fetch(
+                key, url, method, data, headers, retries, timeout, page_type
+            ),
+        )
+
+    async def _fetch(self, key, url, method, data, headers, retries, timeout, page_type):
+        cache = self.session_manager.cache
+        cache_entry = None
+        if cache is not None:
+            cache_entry = await cache.get(key)
+            if cache_entry is not None:
+                if cache.is_fresh(cache_entry, page_type):
+                    cache.hits += 1
+                    return cache_entry["body"], cache_entry["charset"]
+                headers = cache.conditional_headers(cache_entry, headers)
+
+        # each failed attempt releases its slot before backing off, then
+        # queues for a slot again like any new request
+        while True:
             try:
-                # Create request-specific timeout
-                request_timeout = aiohttp.ClientTimeout(total=timeout)
-
-                if method == "GET":
-                    async with self.session.get(
-                        url, headers=headers, timeout=request_timeout
-                    ) as response:
-                        response.raise_for_status()
-                        return await response.text()
-                elif method == "POST":
-                    async with self.session.post(
-                        url, data=data, headers=headers, timeout=request_timeout
-                    ) as response:
-                        response.raise_for_status()
-                        return await response.text()
-            except aiohttp.ClientResponseError as e:
-                status = getattr(e, "status", None)
-                if status == 429 or status in (
-                    500,
-                    502,
-                    503,
-                    504,
-                ):  # Rate limit or server error
-                    if retries < self.max_retries:
-                        wait_time = 2**retries  # Exponential backoff
-                        logging.warning(
-                            f"Received status {status}, retry {retries+1}/{self.max_retries} for {url} in {wait_time}s"
-                        )
-                        await asyncio.sleep(wait_time)
-                        return await self.fetch(
-                            url, method, data, headers, retries + 1, timeout
-                        )
-                logging.error(f"Error {status} fetching {url}: {e}")
+                status, body, charset, response_headers, truncated = await self._request(
+                    url, method, data, headers, timeout, page_type
+                )
+                if status == 304 and cache_entry is not None:
+                    cache.revalidated += 1
+                    await cache.refresh(key, cache_entry)
+                    return cache_entry["body"], cache_entry["charset"]
+                if body is None:
+                    return None
+                if cache is not None:
+                    cache.misses += 1
+                    # a body cut at the size cap would be revalidated and
+                    # served, still cut, on every later run
+                    if not truncated:
+                        await cache.store(key, url, body, charset, response_headers)
+                return body, charset
+            except CircuitOpenError as e:
+                logging.debug(f"{e}, skipping {url}")
                 return None
-            except aiohttp.ClientError as e:
-                if retries < self.max_retries:
-                    wait_time = 1 * (retries + 1)
-                    logging.warning(
-                        f"Retry {retries+1}/{self.max_retries} for {url} in {wait_time}s"
-                    )
-                    await asyncio.sleep(wait_time)
-                    return await self.fetch(
-                        url, method, data, headers, retries + 1, timeout
-                    )
-                else:
+            except DeadlineExceededError as e:
+                current_deadline.get().skipped += 1
+                logging.debug(f"{e}, skipping {url}")
+                return None
+            except ContentRejectedError as e:
+                logging.warning(f"{e}, skipping {url}")
+                return None
+            except RateLimitError as e:
+                wait_time = self.retry_policy.delay(retries, e.retry_after)
+                if retries >= self.max_retries or wait_time is None:
+                    logging.error(f"Rate limited fetching {url}: {e}")
+                    return None
+                if e.retry_after is not None:
+                    self.session_manager.rate_limiter.pause(url, e.retry_after)
+                logging.warning(
+                    f"{e}, retry {retries+1}/{self.max_retries} for {url} in {wait_time:.1f}s"
+                )
+            except HTTPStatusError as e:
+                status = e.status
+                if status not in RETRY_STATUSES or retries >= self.max_retries:
+                    logging.error(f"Error {status} fetching {url}: {e}")
+                    return None
+                wait_time = self.retry_policy.delay(retries)
+                logging.warning(
+                    f"Received status {status}, retry {retries+1}/{self.max_retries} for {url} in {wait_time:.1f}s"
+                )
+            except NetworkError as e:
+                if retries >= self.max_retries:
                     logging.error(f"Error fetching {url}: {e}")
                     return None
+                wait_time = self.retry_policy.delay(retries)
+                logging.warning(
+                    f"Retry {retries+1}/{self.max_retries} for {url} in {wait_time:.1f}s"
+                )
             except asyncio.TimeoutError:
-                if retries < self.max_retries:
-                    wait_time = 1 * (retries + 1)
-                    logging.warning(
-                        f"Timeout retry {retries+1}/{self.max_retries} for {url} in {wait_time}s"
-                    )
-                    await asyncio.sleep(wait_time)
-                    return await self.fetch(
-                        url, method, data, headers, retries + 1, timeout + 5
-                    )
-                logging.error(f"Timeout fetching {url}")
-                return None
+                if retries >= self.max_retries:
+                    logging.error(f"Timeout fetching {url}")
+                    return None
+                wait_time = self.retry_policy.delay(retries)
+                logging.warning(
+                    f"Timeout retry {retries+1}/{self.max_retries} for {url} in {wait_time:.1f}s"
+                )
+                timeout += 5
             except Exception as e:
                 logging.error(f"Unexpected error fetching {url}: {e}")
                 return None
 
+            breaker = self.session_manager.circuit_breakers.breaker_for(url)
+            if breaker.state is CircuitState.OPEN:
+                logging.error(f"Giving up on {url}: circuit open ({breaker.last_failure})")
+                return None
+
+            deadline = current_deadline.get()
+            if deadline is not None and not deadline.allows_retry(wait_time):
+                deadline.retries_dropped += 1
+                logging.warning(f"Giving up on {url}: a retry would not finish before the run deadline")
+                return None
+
+            retries += 1
+            await asyncio.sleep(wait_time)
+
     async def run(self, tasks):
         try:
             return await asyncio.gather(*tasks, return_exceptions=True)
@@ -22,6 +22,10 @@ setup(
         "requests==2.32.4",
         "playwright==1.42.0",
     ],
+    extras_require={
+        "http2": ["httpx[http2]>=0.27"],
+        "lxml": ["lxml>=5.0"],
+    },
     entry_points={
         "console_scripts": [
             "newswatch=newswatch.cli:cli",
@@ -0,0 +1,33 @@
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from newswatch.concurrency import ConcurrencyStore
+from newswatch.session import SessionManager
+
+
+@pytest.fixture
+async def session_manager(tmp_path):
+    """A started SessionManager that keeps its concurrency limits in tmp_path."""
+    manager = SessionManager()
+    manager.concurrency_store = ConcurrencyStore(tmp_path / "concurrency.json")
+    async with manager:
+        yield manager
+
+
+@pytest.fixture
+async def serve():
+    """Start a local server for an aiohttp handler; returns its base URL."""
+    servers = []
+
+    async def start(handler):
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", handler)
+        server = TestServer(app, host="127.0.0.1")
+        await server.start_server()
+        servers.append(server)
+        return str(server.make_url("/"))
+
+    yield start
+    for server in servers:
+        await server.close()
@@ -0,0 +1,104 @@
+from aiohttp import web
+
+from newswatch.circuit import CircuitBreaker, CircuitState
+from newswatch.retry import RetryPolicy
+from newswatch.utils import AsyncScraper
+
+
+async def test_503_with_retry_after_opens_the_breaker(session_manager, serve):
+    hits = 0
+
+    async def unavailable(request):
+        nonlocal hits
+        hits += 1
+        return web.Response(status=503, headers={"Retry-After": "0"})
+
+    url = await serve(unavailable)
+    scraper = AsyncScraper(max_retries=0)
+    scraper.retry_policy = RetryPolicy(base_delay=0.01)
+    scraper.session_manager = session_manager
+    breaker = session_manager.circuit_breakers.breaker_for(url)
+
+    async with scraper:
+        for _ in range(breaker.failure_threshold):
+            assert await scraper.fetch(url) is None
+        assert breaker.state is CircuitState.OPEN
+        assert breaker.last_failure == "HTTP 503"
+
+        # short-circuited: the server is not asked again
+        assert await scraper.fetch(url) is None
+        assert hits == breaker.failure_threshold
+
+
+async def test_429_leaves_the_breaker_closed(session_manager, serve):
+    async def rate_limited(request):
+        return web.Response(status=429, headers={"Retry-After": "0"})
+
+    url = await serve(rate_limited)
+    scraper = AsyncScraper(max_retries=0)
+    scraper.session_manager = session_manager
+    breaker = session_manager.circuit_breakers.breaker_for(url)
+
+    async with scraper:
+        for _ in range(breaker.failure_threshold + 1):
+            assert await scraper.fetch(url) is None
+        assert breaker.state is CircuitState.CLOSED
+        assert breaker.consecutive_failures == 0
+
+
+def open_breaker(reset_timeout=0.0):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=reset_timeout)
+    for _ in range(3):
+        breaker.record_failure("HTTP 503")
+    return breaker
+
+
+def test_consecutive_failures_open_the_breaker():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60.0)
+    breaker.record_failure("HTTP 503")
+    breaker.record_failure("HTTP 503")
+    breaker.record_success()
+    breaker.record_failure("HTTP 503")
+    breaker.record_failure("HTTP 503")
+    assert breaker.state is CircuitState.CLOSED
+
+    breaker.record_failure("HTTP 503")
+    assert breaker.state is CircuitState.OPEN
+    assert not breaker.allow()
+    assert breaker.short_circuited == 1
+
+
+def test_one_probe_at_a_time_after_the_reset_timeout():
+    breaker = open_breaker()
+    assert breaker.allow()
+    assert breaker.state is CircuitState.HALF_OPEN
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state is CircuitState.CLOSED
+    assert breaker.allow() and breaker.allow()
+
+
+def test_failed_probe_reopens_and_waits_longer():
+    breaker = open_breaker(reset_timeout=0.5)
+    breaker.opened_at -= 0.5
+    assert breaker.allow()
+
+    breaker.record_failure("timeout")
+    assert breaker.state is CircuitState.OPEN
+    assert breaker.reset_timeout == 1.0
+    assert breaker.times_opened == 2
+    assert not breaker.allow()
+
+    breaker.opened_at -= 1.0
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.reset_timeout == 0.5
+
+
+def test_probe_without_a_verdict_lets_the_next_one_through():
+    breaker = open_breaker()
+    assert breaker.allow()
+    breaker.release_probe()
+    assert breaker.state is CircuitState.HALF_OPEN
+    assert breaker.allow()
@@ -0,0 +1,75 @@
+import asyncio
+
+from newswatch.concurrency import AdaptiveLimiter
+
+
+def test_healthy_responses_grow_the_limit_additively():
+    limiter = AdaptiveLimiter(4)
+    for _ in range(4):
+        limiter.record_success(0.1, "article")
+    # about one slot per limit's worth of responses
+    assert 4.9 < limiter.limit < 5.1
+    assert limiter.increases == 4
+
+
+def test_overload_halves_the_limit_once_per_round_trip():
+    limiter = AdaptiveLimiter(8)
+    limiter.record_success(10.0, "article")
+    limit = limiter.limit
+    limiter.record_overload()
+    limiter.record_overload()
+    assert limiter.limit == limit * 0.5
+    assert limiter.decreases == 1
+
+
+def test_limit_stays_within_its_bounds():
+    limiter = AdaptiveLimiter(2, min_limit=1, max_limit=3)
+    for _ in range(50):
+        limiter.record_success(0.1)
+    assert limiter.limit == 3
+    for _ in range(5):
+        limiter._last_decrease = 0.0
+        limiter.record_overload()
+    assert limiter.limit == 1
+
+
+def test_errors_stop_the_increase():
+    limiter = AdaptiveLimiter(4, window=10)
+    for _ in range(5):
+        limiter.record_error()
+    limiter.record_success(0.1)
+    assert limiter.limit == 4
+
+
+def test_one_fast_response_only_sets_the_baseline_for_its_window():
+    limiter = AdaptiveLimiter(4, latency_window=5)
+    limiter.record_success(0.01, "article")
+    for _ in range(4):
+        limiter.record_success(0.5, "article")
+    assert limiter.increases == 1
+    # the fast response has left the window
+    limiter.record_success(0.5, "article")
+    assert limiter.increases == 2
+
+
+def test_page_types_have_their_own_baseline():
+    limiter = AdaptiveLimiter(4)
+    limiter.record_success(0.01, "search")
+    limiter.record_success(0.5, "article")
+    limiter.record_success(0.6, "article")
+    assert limiter.increases == 3
+
+
+async def test_limit_caps_requests_in_flight():
+    limiter = AdaptiveLimiter(2)
+    peak = 0
+
+    async def request():
+        nonlocal peak
+        async with limiter:
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(request() for _ in range(10)))
+    assert peak == 2
+    assert limiter.in_flight == 0
@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta
+
+import dateparser
+import pytest
+
+from newswatch.dates import DateParser
+from newswatch.stats import stats_scope
+
+DAYS = ["Senin", "Selasa", "Rabu", "Kamis", "Jumat", "Sabtu", "Minggu"]
+MONTHS = [
+    "Januari", "Februari", "Maret", "April", "Mei", "Juni",
+    "Juli", "Agustus", "September", "Oktober", "November", "Desember",
+]
+ID = {"locales": ["id"]}
+
+# a year of publish times, every day of the month and hour of the day
+MOMENTS = [datetime(2024, 1, 1, 6, 0) + timedelta(hours=97 * i, minutes=7 * i) for i in range(90)]
+
+FORMATS = {
+    "long": (lambda m: f"{DAYS[m.weekday()]}, {m.day} {MONTHS[m.month - 1]} {m.year} {m:%H:%M} WIB", ID),
+    "long, no locale": (lambda m: f"{m.day} {MONTHS[m.month - 1]} {m.year} | {m:%H:%M}", {}),
+    "iso": (lambda m: f"{m:%Y-%m-%dT%H:%M:%S}+07:00", {}),
+    "numeric": (lambda m: f"{m:%d/%m/%Y, %H:%M} WIB", ID),
+    "numeric, day first": (lambda m: f"{m:%d/%m/%Y %H:%M}", {"settings": {"DATE_ORDER": "DMY"}}),
+    "date only": (lambda m: f"{m.day} {MONTHS[m.month - 1]} {m.year}", {}),
+}
+
+
+@pytest.mark.parametrize("name", FORMATS)
+def test_learned_formats_agree_with_dateparser(name):
+    render, kwargs = FORMATS[name]
+    parser = DateParser()
+    with stats_scope() as stats:
+        for moment in MOMENTS:
+            date_string = render(moment)
+            expected = dateparser.parse(date_string, **kwargs).replace(tzinfo=None)
+            assert parser.parse(date_string, name, **kwargs) == expected, date_string
+    counts = stats.dates.stats()[name]
+    assert counts["learned"] >= 1
+    assert counts["fast"] > counts["slow"]
+
+
+def test_numeric_day_and_month_are_not_learned_without_a_locale():
+    parser = DateParser()
+    with stats_scope() as stats:
+        for moment in MOMENTS:
+            date_string = f"{moment:%d/%m/%Y %H:%M}"
+            expected = dateparser.parse(date_string).replace(tzinfo=None)
+            assert parser.parse(date_string, "numeric") == expected, date_string
+            # a day name makes dateparser read the same shape day-first
+            named = f"Senin, {moment:%d/%m/%Y %H:%M}"
+            assert parser.parse(named, "numeric") == dateparser.parse(named).replace(tzinfo=None)
+    counts = stats.dates.stats()["numeric"]
+    assert counts["fast"] == 0
+    assert counts["learned"] == 0
+
+
+def test_formats_are_learned_per_locale():
+    parser = DateParser()
+    with stats_scope() as stats:
+        parser.parse("13/08/2024 10:00", "source", locales=["id"])
+        # month-first under en-US: not read with the order learned for id
+        assert parser.parse("08/12/2024 10:00", "source", locales=["en"]) == dateparser.parse(
+            "08/12/2024 10:00", locales=["en"]
+        )
+    assert stats.dates.stats()["source"]["fast"] == 0
+
+
+def test_strings_that_are_not_dates():
+    parser = DateParser()
+    with stats_scope() as stats:
+        assert parser.parse("", "source") is None
+        assert parser.parse("bukan tanggal", "source") is None
+    assert stats.dates.stats()["source"]["failed"] == 2
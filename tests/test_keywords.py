@@ -0,0 +1,62 @@
+import random
+import re
+from collections import Counter
+
+import pytest
+
+from newswatch.keywords import KeywordMatcher
+
+KEYWORDS = ["bank", "Bank Indonesia", "indonesia", "ank", "nk i", "aa", "aaa", "rupiah", "suku bunga"]
+WORDS = ["bank", "indonesia", "rupiah", "suku", "bunga", "aaaa", "Bank", "BANK", "naik", "pasar"]
+SPACES = [" ", " ", " ", "  ", "\n", "\t "]
+
+
+def texts(count, seed=0):
+    rng = random.Random(seed)
+    for _ in range(count):
+        words = rng.choices(WORDS, k=rng.randint(0, 30))
+        yield "".join(word + rng.choice(SPACES) for word in words)
+
+
+def substring_loop(keywords, *texts):
+    """Overlapping hits of each keyword, tried at every position of the text."""
+    text = "\0".join(text for text in texts if text).lower()
+    hits = Counter()
+    for keyword in {" ".join(keyword.lower().split()) for keyword in keywords}:
+        pattern = re.compile(r"\s+".join(map(re.escape, keyword.split(" "))))
+        for start in range(len(text)):
+            if pattern.match(text, start):
+                hits[keyword] += 1
+    return hits
+
+
+@pytest.mark.parametrize("substring_search", [True, False])
+def test_matches_count_what_a_substring_loop_counts(substring_search):
+    matcher = KeywordMatcher(KEYWORDS)
+    matcher.substring_search = substring_search
+    for title, content in zip(texts(100, seed=1), texts(100, seed=2)):
+        assert matcher.matches(title, content) == substring_loop(KEYWORDS, title, content)
+
+
+@pytest.mark.parametrize("substring_search", [True, False])
+def test_relevance_matches_the_plain_substring_check(substring_search):
+    matcher = KeywordMatcher(KEYWORDS)
+    matcher.substring_search = substring_search
+    for text in texts(200, seed=3):
+        single_spaced = " ".join(text.split())
+        found = matcher.matches(single_spaced)
+        for keyword in KEYWORDS:
+            assert (keyword.lower() in single_spaced.lower()) == bool(found[keyword.lower()])
+
+
+def test_no_match_spans_two_texts():
+    matcher = KeywordMatcher(["bank indonesia"])
+    assert not matcher.matches("Bank", "Indonesia")
+    assert matcher.matches("Bank\nIndonesia") == {"bank indonesia": 1}
+
+
+def test_named_keeps_the_keywords_as_given():
+    matcher = KeywordMatcher(["Bank Indonesia", "bank  indonesia", " ", "IHSG"])
+    assert matcher.keywords == ["bank indonesia", "ihsg"]
+    hits = matcher.matches("Kata Bank Indonesia soal IHSG dan ihsg")
+    assert matcher.named(hits) == {"Bank Indonesia": 1, "IHSG": 2}
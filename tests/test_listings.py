@@ -0,0 +1,32 @@
+from datetime import datetime, timedelta
+
+from newswatch.listings import prefilter_links
+from newswatch.stats import stats_scope
+
+START = datetime(2025, 10, 1)
+LISTINGS = {
+    "https://example.com/new": START + timedelta(hours=1),
+    "https://example.com/day-before": START - timedelta(hours=12),
+    "https://example.com/old": START - timedelta(days=3),
+    "https://example.com/undated": None,
+}
+
+
+def test_results_listed_before_the_slack_are_dropped():
+    with stats_scope():
+        kept, dropped = prefilter_links(LISTINGS, START, "Source")
+    assert kept == [
+        "https://example.com/new",
+        "https://example.com/day-before",
+        "https://example.com/undated",
+    ]
+    assert dropped
+
+
+def test_no_slack_keeps_every_result():
+    with stats_scope() as stats:
+        kept, dropped = prefilter_links(LISTINGS, START, "Source", slack=None)
+    assert kept == list(LISTINGS)
+    assert not dropped
+    assert stats.listings.stats()["Source"] == {"dated": 3, "undated": 1, "skipped": 0}
+
@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+from newswatch.singleflight import SingleFlight
+
+
+def counted_call(release, result="page"):
+    """A call that waits for `release`, and the list of its starts."""
+    started = []
+
+    async def call():
+        started.append(1)
+        await release.wait()
+        return result
+
+    return call, started
+
+
+async def test_concurrent_calls_with_one_key_share_one_call():
+    flight, release = SingleFlight(), asyncio.Event()
+    call, started = counted_call(release)
+    callers = [asyncio.create_task(flight.do("a", call)) for _ in range(3)]
+    other = asyncio.create_task(flight.do("b", call))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*callers, other) == ["page"] * 4
+    assert len(started) == 2
+    assert flight.stats() == {"calls": 2, "deduplicated": 2}
+
+    # a finished call is not reused
+    assert await flight.do("a", call) == "page"
+    assert len(started) == 3
+    assert not flight.in_flight and not flight.waiters
+
+
+async def test_callers_share_the_exception():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0)
+        raise ValueError("HTTP 500")
+
+    results = await asyncio.gather(
+        flight.do("a", fail), flight.do("a", fail), return_exceptions=True
+    )
+    assert [type(result) for result in results] == [ValueError, ValueError]
+    assert flight.calls == 1
+
+
+async def test_cancelled_caller_leaves_the_call_to_the_others():
+    flight, release = SingleFlight(), asyncio.Event()
+    call, _ = counted_call(release)
+    first = asyncio.create_task(flight.do("a", call))
+    second = asyncio.create_task(flight.do("a", call))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    await asyncio.sleep(0)
+    assert "a" in flight.in_flight
+    release.set()
+    assert await second == "page"
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+async def test_call_is_cancelled_when_every_caller_is():
+    flight, release = SingleFlight(), asyncio.Event()
+    call, _ = counted_call(release)
+    callers = [asyncio.create_task(flight.do("a", call)) for _ in range(2)]
+    await asyncio.sleep(0)
+    task = flight.in_flight["a"]
+
+    for caller in callers:
+        caller.cancel()
+    await asyncio.gather(*callers, return_exceptions=True)
+    await asyncio.sleep(0)
+    assert task.cancelled()
+    assert not flight.in_flight and not flight.waiters
+
+
+async def test_cancel_ends_the_calls_in_flight():
+    flight, release = SingleFlight(), asyncio.Event()
+    call, _ = counted_call(release)
+    caller = asyncio.create_task(flight.do("a", call))
+    await asyncio.sleep(0)
+    task = flight.in_flight["a"]
+
+    await flight.cancel()
+    assert task.cancelled()
+    with pytest.raises(asyncio.CancelledError):
+        await caller